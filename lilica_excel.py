@@ -5,7 +5,13 @@
 Script principal do Lilica Excel
 """
 
+import multiprocessing
+
 from src.interface.app import main
 
 if __name__ == "__main__":
+    # No executável do PyInstaller, os processos da leitura paralela e da
+    # verificação em lote reexecutam este script; freeze_support os desvia
+    # para o trabalho do pool em vez de abrir a interface de novo
+    multiprocessing.freeze_support()
     main()
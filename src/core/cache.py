@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Cache de avaliação de critérios do DataFinder
+
+Este módulo contém um cache LRU com limite de memória para o resultado da
+avaliação de critérios (posições das linhas fonte que satisfazem um critério).
+Valores repetidos na planilha de consulta são avaliados uma única vez, e
+critérios inalterados são reaproveitados entre execuções da mesma fonte.
+"""
+
+import threading
+import numpy as np
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+from src.utils.logger import get_logger
+
+# Obtendo o logger para este módulo
+logger = get_logger("core.cache")
+
+# Limite padrão de memória do cache (256 MB)
+DEFAULT_CACHE_MAX_BYTES = 256 * 1024 * 1024
+
+
+class EvaluationCache:
+    """
+    Cache LRU de posições correspondentes por critério
+
+    As chaves seguem o formato (versão da fonte, coluna, operação,
+    case_sensitive, valor normalizado) e os valores são arrays NumPy com as
+    posições das linhas fonte que satisfazem o critério.
+    """
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_MAX_BYTES):
+        """
+        Inicializa o cache
+
+        Args:
+            max_bytes: Memória máxima ocupada pelos arrays armazenados
+        """
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable) -> Optional[np.ndarray]:
+        """
+        Busca uma entrada no cache, marcando-a como usada recentemente
+
+        Args:
+            key: Chave do critério
+
+        Returns:
+            Array de posições, ou None se a chave não estiver no cache
+        """
+        with self._lock:
+            positions = self._entries.get(key)
+            if positions is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return positions
+
+    def put(self, key: Hashable, positions: np.ndarray) -> None:
+        """
+        Armazena o resultado de um critério, removendo as entradas menos usadas
+        se o limite de memória for ultrapassado
+
+        Args:
+            key: Chave do critério
+            positions: Array de posições correspondentes
+        """
+        size = positions.nbytes
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.current_bytes -= previous.nbytes
+
+            self._entries[key] = positions
+            self.current_bytes += size
+
+            while self.current_bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.current_bytes -= evicted.nbytes
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Remove todas as entradas do cache"""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Retorna estatísticas de uso do cache
+
+        Returns:
+            Dicionário com entradas, memória ocupada, acertos, falhas e remoções
+        """
+        return {
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
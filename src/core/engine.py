@@ -9,15 +9,45 @@ de carregamento, consulta e exportação de dados.
 """
 
 import os
+import numpy as np
 import pandas as pd
 from typing import Dict, List, Optional, Union, Any, Tuple
 
+from src.core.cache import DEFAULT_CACHE_MAX_BYTES, EvaluationCache
+from src.core.explain import STRATEGIES, ExecutionStats
+from src.core.fuzzy import SymSpellIndex, normalize_texts, similarity
+from src.core.keys import canonicalize_keys
+from src.core.tokens import TokenIndex
+
 # Importando o novo sistema de logs
+from src.utils.file_handlers.column_builders import read_sheet_frame
+from src.utils.file_handlers.parallel_reader import read_sheet_parallel
+from src.utils.file_handlers.workbook_probe import find_sheet_part
 from src.utils.logger import get_logger
+from src.utils.planner import (
+    estimate_query,
+    format_bytes,
+    log_plan,
+    measure_sheet,
+    plan_load,
+)
 
 # Obtendo o logger para este módulo
 logger = get_logger("core.engine")
 
+# Operações de consulta suportadas por execute_query
+SUPPORTED_OPERATIONS = (
+    "equals",
+    "contains",
+    "startswith",
+    "similar",
+    "all_tokens",
+    "token_overlap",
+)
+
+# Coluna adicionada aos resultados quando há critérios 'similar'
+SIMILARITY_COLUMN = "Similaridade"
+
 
 class DataFinder:
     """
@@ -39,10 +69,110 @@ class DataFinder:
         self.query_data = (
             None  # DataFrame com os critérios de consulta (planilha pequena)
         )
-        self.results = None  # DataFrame com os resultados da consulta
+        self._results = None  # DataFrame com os resultados da consulta
+        self._result_positions = None  # Posições fonte ainda não materializadas
+        self._result_columns = None
+        self._result_source = None
+        self._result_scores = None
         self.criteria = []  # Lista de critérios de consulta
+        self.provenance = None  # Correspondências consulta -> fonte (opcional)
+
+        # Plano de memória da última leitura da fonte (ver src.utils.planner)
+        self.memory_plan = None
+        self._source_measure = None
+
+        # Cache de chaves canônicas e índices hash por coluna da planilha fonte
+        self._key_cache = {}
+        self._cached_source = None
+        self._source_version = 0
+
+        # Cache LRU de avaliação de critérios (reaproveitado entre execuções)
+        self.evaluation_cache = EvaluationCache(
+            max_bytes=self.config.get("cache_max_bytes", DEFAULT_CACHE_MAX_BYTES)
+        )
+
+        # Tempo, memória e contadores por etapa (ver src.core.explain)
+        self.stats = ExecutionStats(self.config.get("trace_memory", False))
+
         logger.info("DataFinder inicializado")
 
+    @property
+    def results(self) -> Optional[pd.DataFrame]:
+        """
+        DataFrame com os resultados da consulta
+
+        Os resultados de execute_query são guardados como posições das linhas
+        fonte e materializados com um único `take` no primeiro acesso.
+        """
+        if self._results is None and self._result_positions is not None:
+            results = self._result_source.take(self._result_positions)
+            if self._result_columns is not None:
+                results = results[self._result_columns]
+            if self._result_scores is not None:
+                results = results.assign(
+                    **{SIMILARITY_COLUMN: self._result_scores[self._result_positions]}
+                )
+            self._results = results.reset_index(drop=True)
+            self._result_positions = None
+        return self._results
+
+    @results.setter
+    def results(self, value: Optional[pd.DataFrame]) -> None:
+        self._results = value
+        self._result_positions = None
+        self._result_columns = None
+        self._result_scores = None
+
+    @property
+    def result_count(self) -> int:
+        """Número de linhas do resultado, sem materializá-lo"""
+        if self._result_positions is not None:
+            return len(self._result_positions)
+        return len(self._results) if self._results is not None else 0
+
+    def _set_lazy_results(
+        self,
+        positions: np.ndarray,
+        columns_to_include: Optional[List[str]] = None,
+        scores: Optional[np.ndarray] = None,
+    ) -> None:
+        """
+        Registra o resultado como posições da planilha fonte (visão preguiçosa)
+
+        Args:
+            positions: Posições das linhas fonte, na ordem do resultado
+            columns_to_include: Lista de colunas a incluir no resultado (todas se None)
+            scores: Similaridade por posição fonte, adicionada ao resultado
+                como a coluna SIMILARITY_COLUMN
+        """
+        self._results = None
+        self._result_positions = positions
+        self._result_source = self.source_data
+        self._result_scores = scores
+        self._result_columns = None
+        if columns_to_include is not None:
+            self._result_columns = [
+                col for col in columns_to_include if col in self.source_data.columns
+            ]
+
+    def _check_sheet(self, file_path: str, sheet_name: Optional[str]) -> bool:
+        """
+        Confere pelos metadados do XLSX se a planilha existe, antes da leitura completa
+
+        Args:
+            file_path: Caminho para o arquivo XLSX
+            sheet_name: Nome da planilha (None usa a primeira)
+
+        Returns:
+            True se a planilha existe, False caso contrário
+        """
+        try:
+            find_sheet_part(file_path, sheet_name)
+        except ValueError as e:
+            logger.error(f"{str(e)} ({file_path})")
+            return False
+        return True
+
     def load_source_data(
         self,
         file_path: str,
@@ -62,36 +192,67 @@ class DataFinder:
         """
         try:
             logger.info(f"Carregando dados fonte de {file_path}")
+            self.memory_plan = None
+            self.stats = ExecutionStats(self.config.get("trace_memory", False))
 
             if not os.path.exists(file_path):
                 logger.error(f"Arquivo não encontrado: {file_path}")
                 return False
 
-            if use_xml_extraction:
-                # TODO: Implementar método para extração via XML
-                logger.info("Usando extração via XML")
-                # self.source_data = self._extract_from_xml(file_path, sheet_name)
-                pass
-            else:
-                # Identificar o tipo de arquivo pela extensão
-                _, ext = os.path.splitext(file_path)
-                ext = ext.lower()
+            with self.stats.stage("load_source", file=file_path) as stage:
+                if use_xml_extraction:
+                    # TODO: Implementar método para extração via XML
+                    logger.info("Usando extração via XML")
+                    # self.source_data = self._extract_from_xml(file_path, sheet_name)
+                    pass
+                else:
+                    # Identificar o tipo de arquivo pela extensão
+                    _, ext = os.path.splitext(file_path)
+                    ext = ext.lower()
 
-                if ext == ".csv":
-                    self.source_data = pd.read_csv(file_path)
-                elif ext in [".xlsx", ".xls"]:
-                    # Verificar se sheet_name é None e tratar adequadamente
-                    if sheet_name is None:
-                        # Se sheet_name for None, ler apenas a primeira planilha
-                        result = pd.read_excel(file_path, sheet_name=0)
-                        self.source_data = result
+                    if ext == ".csv":
+                        self.source_data = pd.read_csv(file_path)
+                    elif ext in [".xlsx", ".xls"]:
+                        if ext == ".xlsx" and not self._check_sheet(
+                            file_path, sheet_name
+                        ):
+                            return False
+
+                        # Planilhas que não cabem no orçamento são lidas em fluxo
+                        self._plan_source(file_path, sheet_name)
+                        if (
+                            self.memory_plan
+                            and self.memory_plan["motor"] == "streaming"
+                        ):
+                            logger.warning(
+                                "A planilha fonte não cabe no orçamento de memória "
+                                "e será lida em fluxo: os tipos das colunas "
+                                "(categóricas, Int64, datas convertidas) e as "
+                                "linhas vazias diferem da leitura em memória"
+                            )
+                            self.source_data = self._read_streaming(
+                                file_path, sheet_name
+                            )
+                        # Verificar se sheet_name é None e tratar adequadamente
+                        elif sheet_name is None:
+                            # Se sheet_name for None, ler apenas a primeira planilha
+                            result = pd.read_excel(file_path, sheet_name=0)
+                            self.source_data = result
+                        else:
+                            # Se sheet_name for especificado, ler essa planilha específica
+                            result = pd.read_excel(file_path, sheet_name=sheet_name)
+                            self.source_data = result
                     else:
-                        # Se sheet_name for especificado, ler essa planilha específica
-                        result = pd.read_excel(file_path, sheet_name=sheet_name)
-                        self.source_data = result
-                else:
-                    logger.error(f"Formato de arquivo não suportado: {ext}")
-                    return False
+                        logger.error(f"Formato de arquivo não suportado: {ext}")
+                        return False
+
+                stage["rows"] = len(self.source_data)
+                stage["bytes_read"] = os.path.getsize(file_path)
+                stage["engine"] = (
+                    self.memory_plan["motor"] if self.memory_plan else "memoria"
+                )
+                if self.memory_plan:
+                    stage["memory_estimated"] = self.memory_plan["pico_estimado"]
 
             logger.info(
                 f"Dados fonte carregados: {len(self.source_data)} linhas, "
@@ -103,6 +264,120 @@ class DataFinder:
             logger.error(f"Erro ao carregar dados fonte: {str(e)}")
             return False
 
+    def _plan_source(self, file_path: str, sheet_name: Optional[str]) -> None:
+        """
+        Planeja a leitura da planilha fonte pelo orçamento de memória
+
+        O orçamento vem de config["memory_budget"] (bytes); sem ele, é usada
+        uma fração da memória disponível. A leitura em fluxo só é escolhida
+        quando a leitura em memória não cabe no orçamento, pois o DataFrame
+        resultante tem outros tipos de coluna. Falhas no planejamento não
+        impedem a leitura, que então segue em memória.
+
+        Args:
+            file_path: Caminho para o arquivo da planilha fonte
+            sheet_name: Nome da planilha (None usa a primeira)
+        """
+        self.memory_plan = None
+        self._source_measure = None
+        try:
+            self._source_measure = measure_sheet(file_path, sheet_name)
+            self.memory_plan = plan_load(
+                self._source_measure,
+                self.config.get("memory_budget"),
+                self.config.get("max_workers"),
+            )
+        except Exception as e:
+            logger.warning(f"Não foi possível planejar a leitura: {str(e)}")
+            return
+        log_plan(f"Leitura de {os.path.basename(file_path)}", self.memory_plan)
+
+    def _read_streaming(
+        self, file_path: str, sheet_name: Optional[str]
+    ) -> pd.DataFrame:
+        """
+        Lê a planilha fonte direto do XML, conforme o plano de memória
+
+        Args:
+            file_path: Caminho para o arquivo XLSX
+            sheet_name: Nome da planilha (None usa a primeira)
+
+        Returns:
+            DataFrame com uma série tipada por coluna
+        """
+        sheet_part = find_sheet_part(file_path, sheet_name)
+        if self.memory_plan["processos"] > 1:
+            return read_sheet_parallel(
+                file_path,
+                sheet_part,
+                self.memory_plan["processos"],
+                self.memory_plan["linhas_por_faixa"],
+            )
+        return read_sheet_frame(file_path, sheet_part)
+
+    def share_source(self) -> "DataFinder":
+        """
+        Cria um DataFinder que compartilha a planilha fonte, os índices e o cache
+
+        Cada DataFinder criado tem a própria planilha de consulta, critérios e
+        resultados, de modo que várias consultas independentes podem ser
+        executadas (inclusive em threads) sobre uma única fonte carregada. A
+        planilha fonte não deve ser substituída nos DataFinders compartilhados.
+
+        Returns:
+            Novo DataFinder ligado à mesma fonte
+        """
+        self._sync_source_caches()
+        finder = DataFinder(self.config)
+        finder.source_data = self.source_data
+        finder._cached_source = self._cached_source
+        finder._source_version = self._source_version
+        finder._key_cache = self._key_cache
+        finder.evaluation_cache = self.evaluation_cache
+        finder.memory_plan = self.memory_plan
+        finder._source_measure = self._source_measure
+        if "load_source" in self.stats.stages:
+            finder.stats.stages["load_source"] = dict(self.stats.stages["load_source"])
+        return finder
+
+    def build_indexes(self, criteria: Optional[List[Dict[str, Any]]] = None) -> bool:
+        """
+        Cria antecipadamente os índices da fonte usados pelos critérios
+
+        Args:
+            criteria: Critérios no formato de add_criteria (None usa os
+                critérios já adicionados)
+
+        Returns:
+            True se os índices foram criados, False caso contrário
+        """
+        if self.source_data is None:
+            logger.error("Dados fonte não carregados")
+            return False
+
+        criteria = self.criteria if criteria is None else criteria
+        missing = sorted(
+            {c["source_column"] for c in criteria} - set(self.source_data.columns)
+        )
+        if missing:
+            logger.error(f"Colunas não encontradas na planilha fonte: {missing}")
+            return False
+
+        with self.stats.stage("normalization", criteria=len(criteria)):
+            for criterion in criteria:
+                operation = criterion.get("operation", "equals")
+                source_column = criterion["source_column"]
+                if operation == "equals":
+                    self._source_key_index(
+                        source_column, criterion.get("case_sensitive", False)
+                    )
+                elif operation in ("all_tokens", "token_overlap"):
+                    self._token_index(source_column)
+                elif operation == "similar":
+                    self._similar_index(source_column, criterion.get("max_distance", 2))
+        logger.info(f"Índices da fonte criados para {len(criteria)} critérios")
+        return True
+
     def load_query_data(self, file_path: str, sheet_name: Optional[str] = None) -> bool:
         """
         Carrega os dados da planilha de consulta (pequena)
@@ -121,25 +396,32 @@ class DataFinder:
                 logger.error(f"Arquivo não encontrado: {file_path}")
                 return False
 
-            # Identificar o tipo de arquivo pela extensão
-            _, ext = os.path.splitext(file_path)
-            ext = ext.lower()
-
-            if ext == ".csv":
-                self.query_data = pd.read_csv(file_path)
-            elif ext in [".xlsx", ".xls"]:
-                # Verificar se sheet_name é None e tratar adequadamente
-                if sheet_name is None:
-                    # Se sheet_name for None, ler apenas a primeira planilha
-                    result = pd.read_excel(file_path, sheet_name=0)
-                    self.query_data = result
+            with self.stats.stage("load_query", file=file_path) as stage:
+                # Identificar o tipo de arquivo pela extensão
+                _, ext = os.path.splitext(file_path)
+                ext = ext.lower()
+
+                if ext == ".csv":
+                    self.query_data = pd.read_csv(file_path)
+                elif ext in [".xlsx", ".xls"]:
+                    if ext == ".xlsx" and not self._check_sheet(file_path, sheet_name):
+                        return False
+
+                    # Verificar se sheet_name é None e tratar adequadamente
+                    if sheet_name is None:
+                        # Se sheet_name for None, ler apenas a primeira planilha
+                        result = pd.read_excel(file_path, sheet_name=0)
+                        self.query_data = result
+                    else:
+                        # Se sheet_name for especificado, ler essa planilha específica
+                        result = pd.read_excel(file_path, sheet_name=sheet_name)
+                        self.query_data = result
                 else:
-                    # Se sheet_name for especificado, ler essa planilha específica
-                    result = pd.read_excel(file_path, sheet_name=sheet_name)
-                    self.query_data = result
-            else:
-                logger.error(f"Formato de arquivo não suportado: {ext}")
-                return False
+                    logger.error(f"Formato de arquivo não suportado: {ext}")
+                    return False
+
+                stage["rows"] = len(self.query_data)
+                stage["bytes_read"] = os.path.getsize(file_path)
 
             logger.info(
                 f"Dados de consulta carregados: {len(self.query_data)} linhas, "
@@ -157,6 +439,8 @@ class DataFinder:
         source_column: str,
         operation: str = "equals",
         case_sensitive: bool = False,
+        max_distance: int = 2,
+        min_overlap: int = 2,
     ) -> None:
         """
         Adiciona um critério de consulta
@@ -164,8 +448,13 @@ class DataFinder:
         Args:
             query_column: Nome da coluna na planilha de consulta
             source_column: Nome da coluna correspondente na planilha fonte
-            operation: Tipo de operação ('equals', 'contains', 'startswith', etc.)
+            operation: Tipo de operação ('equals', 'contains', 'startswith',
+                'similar', 'all_tokens', 'token_overlap', etc.)
             case_sensitive: Se a comparação deve considerar maiúsculas/minúsculas
+                (as operações 'similar' e de tokens ignoram maiúsculas e acentos)
+            max_distance: Distância de edição máxima da operação 'similar'
+            min_overlap: Número mínimo de tokens em comum da operação
+                'token_overlap'
         """
         self.criteria.append(
             {
@@ -173,16 +462,22 @@ class DataFinder:
                 "source_column": source_column,
                 "operation": operation,
                 "case_sensitive": case_sensitive,
+                "max_distance": max_distance,
+                "min_overlap": min_overlap,
             }
         )
         logger.info(f"Critério adicionado: {query_column} {operation} {source_column}")
 
-    def execute_query(self, columns_to_include: List[str] = None) -> bool:
+    def execute_query(
+        self, columns_to_include: List[str] = None, track_provenance: bool = False
+    ) -> bool:
         """
         Executa a consulta com base nos critérios definidos
 
         Args:
             columns_to_include: Lista de colunas a incluir no resultado (todas se None)
+            track_provenance: Se True, registra em `provenance` qual linha de
+                consulta encontrou quais linhas fonte
 
         Returns:
             True se a consulta foi bem-sucedida, False caso contrário
@@ -195,91 +490,633 @@ class DataFinder:
             logger.error("Nenhum critério de consulta definido")
             return False
 
+        peak = None
+        if self.memory_plan is not None:
+            peak = estimate_query(self._source_measure, len(self.criteria))
+            if peak > self.memory_plan["orcamento"]:
+                logger.warning(
+                    f"Consulta com pico estimado de {format_bytes(peak)}, acima do "
+                    f"orçamento de {format_bytes(self.memory_plan['orcamento'])}"
+                )
+
         try:
+            # Os índices são criados antes do laço, para medir cada etapa separadamente
+            self.stats.discard("export")
+            if not self.build_indexes():
+                return False
+
             logger.info("Executando consulta...")
+            self.stats.criteria = [
+                self._explain_criterion(criterion) for criterion in self.criteria
+            ]
+            with self.stats.stage(
+                "query", query_rows=len(self.query_data), memory_estimated=peak
+            ) as stage:
+                self._run_query_loop(columns_to_include, track_provenance)
+                explains = self.stats.criteria
+                stage["rows_scanned"] = sum(e["rows_scanned"] for e in explains)
+                stage["cache_hits"] = sum(e["cache_hits"] for e in explains)
+                stage["cache_misses"] = (
+                    sum(e["evaluations"] for e in explains) - stage["cache_hits"]
+                )
+                stage["results"] = self.result_count
 
-            # Criar um DataFrame vazio para os resultados
-            self.results = pd.DataFrame()
-
-            # Para cada valor na planilha de consulta, buscar correspondências
-            for _, query_row in self.query_data.iterrows():
-                # Criar uma máscara vazia (todos False) para a planilha fonte
-                mask = pd.Series(True, index=self.source_data.index)
-
-                # Aplicar cada critério de consulta
-                for criterion in self.criteria:
-                    query_value = query_row[criterion["query_column"]]
-                    operation = criterion["operation"]
-                    source_column = criterion["source_column"]
-                    case_sensitive = criterion["case_sensitive"]
-
-                    # Pular critérios com valores vazios
-                    if pd.isna(query_value):
-                        continue
-
-                    # Converter para string para operações de texto
-                    if isinstance(query_value, (int, float)):
-                        query_value = str(query_value)
-
-                    # Aplicar a operação adequada
-                    if operation == "equals":
-                        if case_sensitive:
-                            curr_mask = self.source_data[source_column] == query_value
-                        else:
-                            curr_mask = (
-                                self.source_data[source_column].str.lower()
-                                == str(query_value).lower()
-                            )
-                    elif operation == "contains":
-                        if case_sensitive:
-                            curr_mask = self.source_data[source_column].str.contains(
-                                query_value, na=False
-                            )
-                        else:
-                            curr_mask = self.source_data[source_column].str.contains(
-                                query_value, case=False, na=False
-                            )
-                    elif operation == "startswith":
-                        if case_sensitive:
-                            curr_mask = self.source_data[source_column].str.startswith(
-                                query_value, na=False
-                            )
-                        else:
-                            curr_mask = (
-                                self.source_data[source_column]
-                                .str.lower()
-                                .str.startswith(str(query_value).lower(), na=False)
-                            )
-                    else:
-                        logger.warning(f"Operação não implementada: {operation}")
-                        continue
+            logger.info(
+                f"Consulta concluída: {self.result_count} resultados encontrados"
+            )
+            logger.debug(f"Cache de avaliação: {self.evaluation_cache.get_stats()}")
+            return True
 
-                    # Combinar com a máscara existente (AND lógico)
-                    mask = mask & curr_mask
+        except Exception as e:
+            logger.error(f"Erro ao executar consulta: {str(e)}")
+            return False
 
-                # Adicionar as linhas que correspondem a todos os critérios
-                matching_rows = self.source_data[mask]
-                self.results = pd.concat([self.results, matching_rows])
+    def _explain_criterion(self, criterion: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Descreve a estratégia de um critério e estima os candidatos
 
-            # Remover duplicatas
-            self.results = self.results.drop_duplicates().reset_index(drop=True)
+        A estimativa supõe valores distribuídos uniformemente: cada valor de
+        consulta encontra a média de linhas por chave (ou token, ou valor
+        distinto) do índice. As varreduras não têm estatísticas e estimam a
+        coluna inteira por valor, o limite superior.
 
-            # Filtrar colunas se especificado
-            if columns_to_include:
-                columns_to_include = [
-                    col for col in columns_to_include if col in self.results.columns
-                ]
-                self.results = self.results[columns_to_include]
+        Args:
+            criterion: Critério de consulta (ver add_criteria), com índices já criados
+
+        Returns:
+            Dicionário com a estratégia, o tamanho do índice, as avaliações
+            previstas, os candidatos estimados e os contadores zerados
+        """
+        operation = criterion["operation"]
+        source_column = criterion["source_column"]
+        source_rows = len(self.source_data)
+        evaluations = int(self.query_data[criterion["query_column"]].notna().sum())
+
+        index_entries = None
+        rows_per_entry = float(source_rows)
+        if operation == "equals":
+            index = self._source_key_index(source_column, criterion["case_sensitive"])
+            index_entries = len(index)
+            keyed_rows = self._source_keys(
+                source_column, criterion["case_sensitive"]
+            ).notna()
+            rows_per_entry = keyed_rows.sum() / max(index_entries, 1)
+        elif operation in ("all_tokens", "token_overlap"):
+            token_index = self._token_index(source_column)
+            index_entries = len(token_index.postings)
+            rows_per_entry = token_index.token_counts.sum() / max(index_entries, 1)
+        elif operation == "similar":
+            similar = self._similar_index(source_column, criterion["max_distance"])
+            index_entries = len(similar["positions"])
+            rows_per_entry = source_rows / max(index_entries, 1)
+
+        return {
+            "query_column": criterion["query_column"],
+            "source_column": source_column,
+            "operation": operation,
+            "strategy": STRATEGIES.get(operation, "scan"),
+            "index_entries": index_entries,
+            "evaluations": evaluations,
+            "estimated_candidates": int(round(evaluations * rows_per_entry)),
+            "actual_candidates": 0,
+            "rows_scanned": 0,
+            "cache_hits": 0,
+        }
+
+    def _run_query_loop(
+        self, columns_to_include: Optional[List[str]], track_provenance: bool
+    ) -> None:
+        """
+        Avalia os critérios para cada linha de consulta e registra o resultado
+
+        Args:
+            columns_to_include: Lista de colunas a incluir no resultado (todas se None)
+            track_provenance: Se True, registra a proveniência das correspondências
+        """
+        # Posições de todas as correspondências, na ordem da consulta
+        matched_positions = []
+
+        # Todas as posições da fonte (resultado quando nenhum critério se aplica)
+        all_positions = np.arange(len(self.source_data))
+
+        self.provenance = None
+
+        # Melhor similaridade de cada linha fonte (apenas com critérios 'similar')
+        best_scores = None
+        if any(c["operation"] == "similar" for c in self.criteria):
+            best_scores = np.full(len(self.source_data), np.nan)
+
+        # Valores de consulta normalizados uma única vez por critério (None
+        # nos valores vazios, que não restringem a linha)
+        query_keys = [
+            self._query_keys(criterion, self.query_data[criterion["query_column"]])
+            for criterion in self.criteria
+        ]
+
+        # Para cada valor na planilha de consulta, buscar correspondências
+        for row in range(len(self.query_data)):
+            # None até o primeiro critério aplicado: as posições dele são usadas
+            # diretamente e só os critérios seguintes são intersectados
+            positions = None
+            similar_matches = []
+
+            # Aplicar cada critério de consulta
+            for criterion, explain, keys in zip(
+                self.criteria, self.stats.criteria, query_keys
+            ):
+                normalized = keys[row]
+
+                # Pular critérios com valores vazios
+                if normalized is None:
+                    continue
 
+                curr_positions = self._evaluate_criterion(
+                    criterion, normalized, explain
+                )
+                if curr_positions is None:
+                    continue
+                explain["actual_candidates"] += len(curr_positions)
+
+                # Combinar com as posições já selecionadas (AND lógico)
+                if positions is None:
+                    positions = curr_positions
+                else:
+                    explain["rows_scanned"] += len(positions) + len(curr_positions)
+                    positions = np.intersect1d(
+                        positions, curr_positions, assume_unique=True
+                    )
+
+                if criterion["operation"] == "similar":
+                    similar_matches.append(
+                        self._evaluate_similar(criterion, normalized)
+                    )
+
+            if positions is None:
+                positions = all_positions
+            matched_positions.append(positions)
+
+            # Similaridade da linha: a menor entre os critérios 'similar'
+            if similar_matches:
+                scores = np.ones(len(positions))
+                for crit_positions, crit_scores in similar_matches:
+                    scores = np.minimum(
+                        scores,
+                        crit_scores[np.searchsorted(crit_positions, positions)],
+                    )
+                np.fmax.at(best_scores, positions, scores)
+
+        # Remover posições repetidas mantendo a ordem da primeira ocorrência;
+        # as linhas só são materializadas quando os resultados forem lidos
+        if matched_positions:
+            all_matches = np.concatenate(matched_positions)
+        else:
+            all_matches = np.array([], dtype=np.intp)
+        self._set_lazy_results(pd.unique(all_matches), columns_to_include, best_scores)
+
+        if track_provenance:
+            self.provenance = self._build_provenance(matched_positions, all_matches)
+
+    def execute_enrichment(
+        self,
+        source_columns: List[str],
+        strategy: str = "first",
+        separator: str = ", ",
+    ) -> bool:
+        """
+        Anexa colunas da planilha fonte a cada linha da planilha de consulta
+
+        Funciona como um left join vetorizado: todas as linhas de consulta são
+        mantidas e recebem as colunas fonte da(s) linha(s) correspondente(s).
+        Apenas critérios 'equals' são suportados; as chaves são comparadas na
+        forma canônica e valores vazios não encontram correspondência.
+
+        Args:
+            source_columns: Colunas da planilha fonte a anexar (uma coluna de
+                consulta com o mesmo nome é substituída)
+            strategy: O que fazer com múltiplas correspondências:
+                'first' (primeira), 'last' (última), 'all' (uma linha por
+                correspondência) ou 'concat' (valores unidos por `separator`)
+            separator: Separador usado pela estratégia 'concat'
+
+        Returns:
+            True se o enriquecimento foi bem-sucedido, False caso contrário
+        """
+        if self.source_data is None or self.query_data is None:
+            logger.error("Dados fonte ou dados de consulta não carregados")
+            return False
+
+        if not self.criteria:
+            logger.error("Nenhum critério de consulta definido")
+            return False
+
+        if any(c["operation"] != "equals" for c in self.criteria):
+            logger.error("O enriquecimento suporta apenas critérios 'equals'")
+            return False
+
+        if strategy not in ("first", "last", "all", "concat"):
+            logger.error(f"Estratégia de enriquecimento não suportada: {strategy}")
+            return False
+
+        missing = [c for c in source_columns if c not in self.source_data.columns]
+        if missing:
+            logger.error(f"Colunas não encontradas na planilha fonte: {missing}")
+            return False
+
+        try:
             logger.info(
-                f"Consulta concluída: {len(self.results)} resultados encontrados"
+                f"Executando enriquecimento de {len(self.query_data)} linhas "
+                f"(estratégia: {strategy})..."
+            )
+
+            self.stats.criteria = []
+            self.stats.discard("normalization", "export")
+            with self.stats.stage("query", query_rows=len(self.query_data)) as stage:
+                # Chaves canônicas dos dois lados, em colunas internas
+                key_names = [f"__key{i}" for i in range(len(self.criteria))]
+                left = pd.DataFrame(
+                    {
+                        name: canonicalize_keys(
+                            self.query_data[c["query_column"]], c["case_sensitive"]
+                        ).to_numpy()
+                        for name, c in zip(key_names, self.criteria)
+                    }
+                )
+                left["__query_pos"] = np.arange(len(left))
+
+                right = pd.DataFrame(
+                    {
+                        name: self._source_keys(
+                            c["source_column"], c["case_sensitive"]
+                        ).to_numpy()
+                        for name, c in zip(key_names, self.criteria)
+                    }
+                )
+                right["__source_pos"] = np.arange(len(right))
+                right = right.dropna(subset=key_names)
+
+                merged = left.merge(right, on=key_names, how="left", sort=False)
+                merged = merged.sort_values(
+                    ["__query_pos", "__source_pos"], kind="stable"
+                )
+                source_pos = merged["__source_pos"]
+                matched_query_rows = merged.loc[
+                    source_pos.notna(), "__query_pos"
+                ].nunique()
+
+                source_values = self.source_data[source_columns].reset_index(drop=True)
+
+                if strategy == "concat":
+                    matches = merged.dropna(subset=["__source_pos"])
+                    attached = source_values.take(
+                        matches["__source_pos"].to_numpy(dtype=np.int64)
+                    ).astype("string")
+                    attached.index = matches["__query_pos"].to_numpy()
+                    attached = (
+                        attached.groupby(level=0)
+                        .agg(lambda values: separator.join(values.dropna()))
+                        .reindex(np.arange(len(self.query_data)))
+                    )
+                    enriched = self.query_data.reset_index(drop=True)
+                else:
+                    if strategy in ("first", "last"):
+                        merged = merged.drop_duplicates("__query_pos", keep=strategy)
+                        source_pos = merged["__source_pos"]
+                    enriched = self.query_data.take(
+                        merged["__query_pos"].to_numpy()
+                    ).reset_index(drop=True)
+                    attached = source_values.reindex(source_pos.to_numpy())
+
+                for column in source_columns:
+                    enriched[column] = attached[column].to_numpy()
+
+                self.results = enriched
+                stage["rows_scanned"] = len(right)
+                stage["results"] = len(enriched)
+
+            logger.info(
+                f"Enriquecimento concluído: {matched_query_rows} de "
+                f"{len(self.query_data)} linhas de consulta com correspondência"
             )
             return True
 
         except Exception as e:
-            logger.error(f"Erro ao executar consulta: {str(e)}")
+            logger.error(f"Erro ao executar enriquecimento: {str(e)}")
             return False
 
+    @staticmethod
+    def _build_provenance(
+        matched_positions: List[np.ndarray], all_matches: np.ndarray
+    ) -> Dict[str, Any]:
+        """
+        Monta o mapeamento de proveniência a partir das posições já coletadas
+
+        Args:
+            matched_positions: Posições fonte encontradas por cada linha de consulta
+            all_matches: Concatenação de matched_positions
+
+        Returns:
+            Dicionário com:
+                - query_rows: posição da linha de consulta de cada correspondência
+                - source_rows: posição da linha fonte de cada correspondência
+                - match_counts: número de correspondências por linha de consulta
+                - unmatched_query_rows: posições das linhas de consulta sem resultado
+        """
+        match_counts = np.array(
+            [len(positions) for positions in matched_positions], dtype=np.int64
+        )
+        return {
+            "query_rows": np.repeat(np.arange(len(match_counts)), match_counts),
+            "source_rows": all_matches.astype(np.int64, copy=False),
+            "match_counts": match_counts,
+            "unmatched_query_rows": np.flatnonzero(match_counts == 0).tolist(),
+        }
+
+    def _sync_source_caches(self) -> None:
+        """
+        Invalida os caches se a planilha fonte tiver sido substituída
+
+        Cada nova planilha fonte recebe uma nova versão, que faz parte das
+        chaves do cache de avaliação.
+        """
+        if self._cached_source is not self.source_data:
+            self._cached_source = self.source_data
+            self._source_version += 1
+            self._key_cache = {}
+            self.evaluation_cache.clear()
+
+    def _source_keys(self, source_column: str, case_sensitive: bool) -> pd.Series:
+        """
+        Retorna as chaves canônicas de uma coluna fonte (calculadas uma vez)
+
+        Args:
+            source_column: Nome da coluna na planilha fonte
+            case_sensitive: Se a comparação deve considerar maiúsculas/minúsculas
+
+        Returns:
+            Série "string" com as chaves canônicas, alinhada à planilha fonte
+        """
+        self._sync_source_caches()
+
+        cache_key = ("keys", source_column, case_sensitive)
+        if cache_key not in self._key_cache:
+            self._key_cache[cache_key] = canonicalize_keys(
+                self.source_data[source_column], case_sensitive=case_sensitive
+            )
+        return self._key_cache[cache_key]
+
+    def _source_key_index(
+        self, source_column: str, case_sensitive: bool
+    ) -> Dict[str, np.ndarray]:
+        """
+        Retorna o índice hash (chave canônica -> posições) de uma coluna fonte
+
+        O índice é mantido em cache até que outra planilha fonte seja carregada.
+
+        Args:
+            source_column: Nome da coluna na planilha fonte
+            case_sensitive: Se a comparação deve considerar maiúsculas/minúsculas
+
+        Returns:
+            Dicionário mapeando cada chave canônica para as posições das linhas
+        """
+        cache_key = ("index", source_column, case_sensitive)
+        if cache_key not in self._key_cache:
+            keys = self._source_keys(source_column, case_sensitive)
+            keys = pd.Series(keys.to_numpy(), index=pd.RangeIndex(len(keys)))
+            self._key_cache[cache_key] = keys.groupby(keys, sort=False).indices
+            logger.debug(
+                f"Índice de chaves criado para '{source_column}': "
+                f"{len(self._key_cache[cache_key])} chaves distintas"
+            )
+        return self._key_cache[cache_key]
+
+    @staticmethod
+    def _query_keys(criterion: Dict[str, Any], values: pd.Series) -> List[Any]:
+        """
+        Normaliza de uma vez os valores de consulta de um critério (vetorizado)
+
+        Args:
+            criterion: Critério de consulta (ver add_criteria)
+            values: Coluna de consulta do critério
+
+        Returns:
+            Lista alinhada às linhas de consulta com o valor normalizado usado
+            no cache de avaliação (ver _criterion_cache_key), ou None nos
+            valores vazios
+        """
+        operation = criterion["operation"]
+        if operation == "equals":
+            normalized = canonicalize_keys(values, criterion["case_sensitive"])
+        elif operation in ("similar", "all_tokens", "token_overlap"):
+            normalized = normalize_texts(values)
+        else:
+            normalized = values.astype(str)
+
+        normalized = normalized.astype(object).where(values.notna().to_numpy(), None)
+        keys = normalized.tolist()
+        if operation == "similar":
+            extra = criterion["max_distance"]
+        elif operation == "token_overlap":
+            extra = criterion["min_overlap"]
+        else:
+            return keys
+        return [None if key is None else (key, extra) for key in keys]
+
+    def _criterion_cache_key(
+        self, criterion: Dict[str, Any], normalized: Any, kind: str = "positions"
+    ) -> Tuple:
+        """
+        Monta a chave do cache de avaliação para um critério e valor de consulta
+
+        Args:
+            criterion: Critério de consulta (ver add_criteria)
+            normalized: Valor de consulta normalizado (ver _query_keys)
+            kind: Tipo de array armazenado ('positions' ou 'scores')
+
+        Returns:
+            Tupla (versão da fonte, coluna, operação, case_sensitive, valor
+            normalizado, tipo)
+        """
+        self._sync_source_caches()
+        return (
+            self._source_version,
+            criterion["source_column"],
+            criterion["operation"],
+            criterion["case_sensitive"],
+            normalized,
+            kind,
+        )
+
+    def _evaluate_criterion(
+        self,
+        criterion: Dict[str, Any],
+        normalized: Any,
+        explain: Optional[Dict[str, Any]] = None,
+    ) -> Optional[np.ndarray]:
+        """
+        Avalia um critério para um valor de consulta, usando o cache de avaliação
+
+        Args:
+            criterion: Critério de consulta (ver add_criteria)
+            normalized: Valor de consulta normalizado (ver _query_keys)
+            explain: Contadores do critério (ver _explain_criterion), atualizados
+                com os acertos do cache e as linhas examinadas
+
+        Returns:
+            Array ordenado com as posições das linhas fonte que satisfazem o
+            critério, ou None se a operação não for suportada
+        """
+        operation = criterion["operation"]
+        source_column = criterion["source_column"]
+        case_sensitive = criterion["case_sensitive"]
+
+        if operation not in SUPPORTED_OPERATIONS:
+            logger.warning(f"Operação não implementada: {operation}")
+            return None
+
+        cache_key = self._criterion_cache_key(criterion, normalized)
+        positions = self.evaluation_cache.get(cache_key)
+        if positions is not None:
+            if explain is not None:
+                explain["cache_hits"] += 1
+            return positions
+
+        # Aplicar a operação adequada
+        column = self.source_data[source_column]
+        if operation == "equals":
+            index = self._source_key_index(source_column, case_sensitive)
+            positions = index.get(normalized, np.array([], dtype=np.intp))
+        elif operation == "similar":
+            positions, _ = self._evaluate_similar(criterion, normalized)
+        elif operation == "all_tokens":
+            positions = self._token_index(source_column).all_tokens(normalized)
+        elif operation == "token_overlap":
+            positions = self._token_index(source_column).overlap(
+                normalized[0], normalized[1]
+            )
+        else:
+            if operation == "contains":
+                curr_mask = column.str.contains(
+                    normalized, case=case_sensitive, na=False
+                )
+            elif case_sensitive:
+                curr_mask = column.str.startswith(normalized, na=False)
+            else:
+                curr_mask = column.str.lower().str.startswith(
+                    normalized.lower(), na=False
+                )
+            positions = np.flatnonzero(curr_mask.to_numpy(dtype=bool))
+
+        # Varreduras examinam a coluna inteira; índices, apenas os candidatos
+        # (as interseções com os critérios anteriores são somadas no laço)
+        if explain is not None:
+            explain["rows_scanned"] += (
+                len(column) if STRATEGIES[operation] == "scan" else len(positions)
+            )
+
+        if operation != "similar":
+            self.evaluation_cache.put(cache_key, positions)
+        return positions
+
+    def _token_index(self, source_column: str) -> TokenIndex:
+        """
+        Retorna o índice invertido de tokens de uma coluna fonte (criado uma vez)
+
+        Args:
+            source_column: Nome da coluna na planilha fonte
+
+        Returns:
+            Índice invertido token -> posições das linhas
+        """
+        self._sync_source_caches()
+
+        cache_key = ("tokens", source_column)
+        if cache_key not in self._key_cache:
+            self._key_cache[cache_key] = TokenIndex(self.source_data[source_column])
+            logger.debug(
+                f"Índice de tokens criado para '{source_column}': "
+                f"{len(self._key_cache[cache_key].postings)} tokens distintos"
+            )
+        return self._key_cache[cache_key]
+
+    def _similar_index(self, source_column: str, max_distance: int) -> Dict[str, Any]:
+        """
+        Retorna o índice SymSpell dos valores distintos de uma coluna fonte
+
+        Args:
+            source_column: Nome da coluna na planilha fonte
+            max_distance: Distância de edição máxima suportada pelo índice
+
+        Returns:
+            Dicionário com o índice ('index') e as posições fonte de cada
+            valor distinto ('positions')
+        """
+        self._sync_source_caches()
+
+        cache_key = ("similar", source_column, max_distance)
+        if cache_key not in self._key_cache:
+            texts = normalize_texts(self.source_data[source_column])
+            texts = pd.Series(texts.to_numpy(), index=pd.RangeIndex(len(texts)))
+            postings = texts.groupby(texts, sort=False).indices
+            self._key_cache[cache_key] = {
+                "index": SymSpellIndex(postings.keys(), max_distance=max_distance),
+                "positions": list(postings.values()),
+            }
+            logger.debug(
+                f"Índice de similaridade criado para '{source_column}': "
+                f"{len(postings)} valores distintos"
+            )
+        return self._key_cache[cache_key]
+
+    def _evaluate_similar(
+        self, criterion: Dict[str, Any], normalized: Tuple[str, int]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Avalia um critério 'similar', guardando posições e similaridades no cache
+
+        Args:
+            criterion: Critério de consulta com operação 'similar'
+            normalized: Valor de consulta normalizado e distância máxima (ver
+                _query_keys)
+
+        Returns:
+            Tupla (posições ordenadas, similaridade de cada posição)
+        """
+        positions_key = self._criterion_cache_key(criterion, normalized)
+        scores_key = self._criterion_cache_key(criterion, normalized, "scores")
+        positions = self.evaluation_cache.get(positions_key)
+        scores = self.evaluation_cache.get(scores_key)
+        if positions is not None and scores is not None:
+            return positions, scores
+
+        term, max_distance = normalized
+        similar = self._similar_index(criterion["source_column"], max_distance)
+        matches = similar["index"].lookup(term, max_distance)
+
+        if matches:
+            values = similar["index"].values
+            positions = np.concatenate(
+                [similar["positions"][value_id] for value_id, _ in matches]
+            )
+            scores = np.concatenate(
+                [
+                    np.full(
+                        len(similar["positions"][value_id]),
+                        similarity(term, values[value_id], distance),
+                    )
+                    for value_id, distance in matches
+                ]
+            )
+            order = np.argsort(positions, kind="stable")
+            positions, scores = positions[order], scores[order]
+        else:
+            positions = np.array([], dtype=np.intp)
+            scores = np.array([], dtype=np.float64)
+
+        self.evaluation_cache.put(positions_key, positions)
+        self.evaluation_cache.put(scores_key, scores)
+        return positions, scores
+
     def export_results(self, output_path: str, format: str = "xlsx") -> bool:
         """
         Exporta os resultados da consulta para um arquivo
@@ -291,12 +1128,12 @@ class DataFinder:
         Returns:
             True se a exportação foi bem-sucedida, False caso contrário
         """
-        if self.results is None or len(self.results) == 0:
+        if self.result_count == 0:
             logger.warning("Nenhum resultado para exportar")
             return False
 
         try:
-            logger.info(f"Exportando {len(self.results)} resultados para {output_path}")
+            logger.info(f"Exportando {self.result_count} resultados para {output_path}")
 
             # Criar o diretório de saída se não existir
             output_dir = os.path.dirname(output_path)
@@ -305,14 +1142,19 @@ class DataFinder:
 
             # Exportar no formato especificado
             format = format.lower()
-            if format == "xlsx":
-                self.results.to_excel(output_path, index=False)
-            elif format == "csv":
-                self.results.to_csv(output_path, index=False)
-            else:
+            if format not in ("xlsx", "csv"):
                 logger.error(f"Formato de exportação não suportado: {format}")
                 return False
 
+            with self.stats.stage(
+                "export", rows=self.result_count, format=format
+            ) as stage:
+                if format == "xlsx":
+                    self.results.to_excel(output_path, index=False)
+                else:
+                    self.results.to_csv(output_path, index=False)
+                stage["bytes_written"] = os.path.getsize(output_path)
+
             logger.info(f"Resultados exportados com sucesso para {output_path}")
             return True
 
@@ -320,12 +1162,25 @@ class DataFinder:
             logger.error(f"Erro ao exportar resultados: {str(e)}")
             return False
 
+    def _result_column_names(self) -> List[str]:
+        """Colunas do resultado, sem materializá-lo"""
+        if self._result_positions is not None:
+            columns = self._result_columns
+            if columns is None:
+                columns = list(self._result_source.columns)
+            if self._result_scores is not None:
+                columns = columns + [SIMILARITY_COLUMN]
+            return columns
+        return list(self._results.columns) if self._results is not None else []
+
     def get_summary(self) -> Dict[str, Any]:
         """
         Retorna um resumo dos dados e resultados
 
         Returns:
-            Dicionário com informações resumidas sobre os dados e resultados
+            Dicionário com informações resumidas sobre os dados e resultados;
+            "stats" traz o plano de execução e as estatísticas por etapa (ver
+            src.core.explain), o cache de avaliação e o plano de memória
         """
         summary = {
             "source_data": {
@@ -346,11 +1201,28 @@ class DataFinder:
             },
             "criteria": self.criteria,
             "results": {
-                "available": self.results is not None,
-                "rows": len(self.results) if self.results is not None else 0,
-                "columns": (
-                    list(self.results.columns) if self.results is not None else []
+                "available": self._results is not None
+                or self._result_positions is not None,
+                "rows": self.result_count,
+                "columns": self._result_column_names(),
+            },
+            "provenance": {
+                "available": self.provenance is not None,
+                "matches": (
+                    len(self.provenance["source_rows"])
+                    if self.provenance is not None
+                    else 0
                 ),
+                "unmatched_query_rows": (
+                    len(self.provenance["unmatched_query_rows"])
+                    if self.provenance is not None
+                    else 0
+                ),
+            },
+            "stats": {
+                **self.stats.to_dict(),
+                "cache": self.evaluation_cache.get_stats(),
+                "memory_plan": self.memory_plan,
             },
         }
         return summary
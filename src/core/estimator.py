@@ -0,0 +1,295 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Estimativa de tempo e memória antes de um processamento longo
+
+Nada é carregado por completo: cada planilha é medida pelos metadados (ver
+src.utils.planner) e apenas uma amostra das primeiras linhas é lida e
+processada, para medir as taxas de leitura, de cruzamento e de gravação.
+As taxas são projetadas para o tamanho total de cada etapa e apresentadas
+junto com o plano de memória que seria usado.
+
+As projeções são lineares no tamanho da entrada, exceto nas operações de
+consulta por varredura ('contains' e 'startswith'), cujo custo cresce com o
+produto das linhas fonte e de consulta.
+"""
+
+import io
+import time
+import pandas as pd
+from typing import Dict, List, Optional, Tuple
+
+from src.core.engine import DataFinder
+from src.utils.file_handlers.column_builders import read_sheet_frame
+from src.utils.file_handlers.workbook_probe import find_sheet_part
+from src.utils.logger import get_logger
+from src.utils.planner import (
+    BYTES_CELULA_ESCRITA,
+    estimate_load,
+    estimate_query,
+    format_bytes,
+    measure_sheet,
+    plan_load,
+)
+
+# Obtendo o logger para este módulo
+logger = get_logger("core.estimator")
+
+# Linhas lidas de cada planilha para medir as taxas
+SAMPLE_ROWS = 2000
+
+# Operações avaliadas por varredura da fonte inteira para cada valor de consulta
+SCAN_OPERATIONS = frozenset({"contains", "startswith"})
+
+
+def sample_sheet(
+    file_path: str,
+    sheet_name: Optional[str] = None,
+    n_rows: int = SAMPLE_ROWS,
+    engine: str = "memoria",
+) -> Tuple[pd.DataFrame, float]:
+    """
+    Lê as primeiras linhas de uma planilha e mede o tempo da leitura
+
+    Args:
+        file_path: Caminho do arquivo (.xlsx, .xls ou .csv)
+        sheet_name: Nome da planilha (None usa a primeira)
+        n_rows: Quantidade de linhas de dados a ler
+        engine: Motor do plano de leitura ('memoria' ou 'streaming')
+
+    Returns:
+        Tupla (amostra, segundos)
+    """
+    start = time.perf_counter()
+    if file_path.lower().endswith(".csv"):
+        df = pd.read_csv(file_path, nrows=n_rows)
+    elif engine == "streaming":
+        sheet_part = find_sheet_part(file_path, sheet_name)
+        df = read_sheet_frame(file_path, sheet_part, max_rows=n_rows)
+    else:
+        df = pd.read_excel(file_path, sheet_name=sheet_name or 0, nrows=n_rows)
+    return df, time.perf_counter() - start
+
+
+def total_rows(measure: Dict, sample: pd.DataFrame) -> int:
+    """
+    Linhas de dados de uma planilha medida
+
+    Args:
+        measure: Resultado de measure_sheet
+        sample: Amostra lida (usada se a planilha não declarar a dimensão)
+
+    Returns:
+        Linhas de dados (sem o cabeçalho)
+    """
+    if measure["linhas"] is not None:
+        return max(measure["linhas"] - 1, len(sample))
+    columns = max(sample.shape[1], 1)
+    return max(measure["celulas"] // columns, len(sample))
+
+
+def project(seconds: float, sample_size: int, total_size: int) -> float:
+    """
+    Projeta linearmente o tempo medido em uma amostra
+
+    Args:
+        seconds: Tempo medido
+        sample_size: Tamanho da amostra
+        total_size: Tamanho total
+
+    Returns:
+        Segundos projetados
+    """
+    if sample_size <= 0:
+        return 0.0
+    return seconds * max(total_size, sample_size) / sample_size
+
+
+def stage(name: str, seconds: float, memory: int, detail: str = "") -> Dict:
+    """
+    Descreve uma etapa da estimativa
+
+    Args:
+        name: Nome da etapa
+        seconds: Tempo projetado
+        memory: Pico de memória estimado (bytes)
+        detail: Texto adicional (ex. linhas e taxa medida)
+
+    Returns:
+        Dicionário com "etapa", "segundos", "memoria" e "detalhe"
+    """
+    return {"etapa": name, "segundos": seconds, "memoria": memory, "detalhe": detail}
+
+
+def summarize(stages: List[Dict], plan: Dict) -> Dict:
+    """
+    Reúne as etapas e o plano em uma estimativa
+
+    Args:
+        stages: Etapas (ver stage)
+        plan: Plano de memória usado
+
+    Returns:
+        Dicionário com "etapas", "plano", "total_segundos" e "pico_memoria"
+    """
+    return {
+        "etapas": stages,
+        "plano": plan,
+        "total_segundos": sum(s["segundos"] for s in stages),
+        "pico_memoria": max((s["memoria"] for s in stages), default=0),
+    }
+
+
+def estimate_query_run(
+    source_path: str,
+    query_path: str,
+    criteria: List[Dict],
+    source_sheet: Optional[str] = None,
+    query_sheet: Optional[str] = None,
+    columns_to_include: Optional[List[str]] = None,
+    budget: Optional[int] = None,
+    n_rows: int = SAMPLE_ROWS,
+) -> Dict:
+    """
+    Estima tempo e memória de uma consulta do DataFinder (carga, consulta e exportação)
+
+    Args:
+        source_path: Planilha fonte
+        query_path: Planilha de consulta
+        criteria: Critérios no formato de DataFinder.add_criteria (dicionários
+            com "query_column", "source_column", "operation" etc.)
+        source_sheet: Planilha da fonte (None usa a primeira)
+        query_sheet: Planilha da consulta (None usa a primeira)
+        columns_to_include: Colunas do resultado (todas se None)
+        budget: Orçamento de memória em bytes (None usa o padrão do planejador)
+        n_rows: Linhas da amostra de cada planilha
+
+    Returns:
+        Estimativa (ver summarize)
+    """
+    source_measure = measure_sheet(source_path, source_sheet)
+    plan = plan_load(source_measure, budget)
+    source_sample, source_seconds = sample_sheet(
+        source_path, source_sheet, n_rows, plan["motor"]
+    )
+    source_rows = total_rows(source_measure, source_sample)
+
+    query_measure = measure_sheet(query_path, query_sheet)
+    query_sample, query_seconds = sample_sheet(query_path, query_sheet, n_rows)
+    query_rows = total_rows(query_measure, query_sample)
+
+    # Consulta sobre as amostras, com os mesmos critérios
+    finder = DataFinder()
+    finder.source_data = source_sample
+    finder.query_data = query_sample
+    for criterion in criteria:
+        finder.add_criteria(**criterion)
+    start = time.perf_counter()
+    if not finder.execute_query(columns_to_include):
+        raise ValueError("A consulta falhou na amostra; verifique os critérios")
+    query_time = time.perf_counter() - start
+
+    if any(c.get("operation", "contains") in SCAN_OPERATIONS for c in criteria):
+        scale = (source_rows * query_rows) / max(
+            len(source_sample) * len(query_sample), 1
+        )
+    else:
+        scale = max(
+            source_rows / max(len(source_sample), 1),
+            query_rows / max(len(query_sample), 1),
+        )
+    result_rate = finder.result_count / max(len(source_sample), 1)
+    result_rows = int(min(result_rate * source_rows, source_rows))
+
+    # Exportação da amostra do resultado, em memória
+    results = finder.results
+    start = time.perf_counter()
+    results.to_excel(io.BytesIO(), index=False)
+    export_seconds = project(time.perf_counter() - start, len(results), result_rows)
+    result_cells = result_rows * max(results.shape[1], 1)
+
+    stages = [
+        stage(
+            "leitura da fonte",
+            project(source_seconds, len(source_sample), source_rows),
+            plan["pico_estimado"],
+            f"{source_rows} linhas, motor {plan['motor']}",
+        ),
+        stage(
+            "leitura da consulta",
+            project(query_seconds, len(query_sample), query_rows),
+            estimate_load(query_measure),
+            f"{query_rows} linhas",
+        ),
+        stage(
+            "consulta",
+            query_time * max(scale, 1.0),
+            estimate_query(source_measure, len(criteria)),
+            f"{len(criteria)} critérios, ~{result_rows} resultados",
+        ),
+        stage(
+            "exportação",
+            export_seconds,
+            result_cells * BYTES_CELULA_ESCRITA,
+            f"{result_cells} células",
+        ),
+    ]
+    return summarize(stages, plan)
+
+
+def format_duration(seconds: float) -> str:
+    """
+    Formata uma duração para exibição
+
+    Args:
+        seconds: Duração em segundos
+
+    Returns:
+        Texto como "1h 02min", "3min 20s" ou "4.2s"
+    """
+    if seconds >= 3600:
+        return f"{int(seconds // 3600)}h {int(seconds % 3600 // 60):02d}min"
+    if seconds >= 60:
+        return f"{int(seconds // 60)}min {int(seconds % 60):02d}s"
+    return f"{seconds:.1f}s"
+
+
+def format_estimate(estimate: Dict) -> str:
+    """
+    Formata uma estimativa e o seu plano como texto
+
+    Args:
+        estimate: Resultado de estimate_query_run ou ProcessadorPlanilhas.estimar
+
+    Returns:
+        Texto com uma linha por etapa, os totais e o plano
+    """
+    lines = ["--- Estimativa ---"]
+    for item in estimate["etapas"]:
+        line = (
+            f"{item['etapa']:<22} {format_duration(item['segundos']):>10}  "
+            f"{format_bytes(item['memoria']):>10}"
+        )
+        if item["detalhe"]:
+            line += f"  ({item['detalhe']})"
+        lines.append(line)
+
+    plan = estimate["plano"]
+    lines.append(
+        f"{'total':<22} {format_duration(estimate['total_segundos']):>10}  "
+        f"{format_bytes(estimate['pico_memoria']):>10}  (pico)"
+    )
+    lines.append(f"Orçamento de memória: {format_bytes(plan['orcamento'])}")
+    lines.append(
+        "Plano: "
+        + ", ".join(
+            f"{key}={value}"
+            for key, value in plan.items()
+            if key not in ("motores", "pico_estimado", "orcamento")
+        )
+    )
+    if estimate["pico_memoria"] > plan["orcamento"]:
+        lines.append("Atenção: o pico estimado excede o orçamento de memória")
+    lines.append("------------------")
+    return "\n".join(lines)
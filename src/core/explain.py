@@ -0,0 +1,199 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Plano de execução e estatísticas por etapa do DataFinder
+
+Cada DataFinder registra, a cada execução, o tempo e a memória de cada etapa
+(leitura da fonte e da consulta, criação dos índices, laço de consulta e
+exportação) e, para cada critério, a estratégia usada e as contagens de
+candidatos estimadas e reais. Os números ficam disponíveis em
+DataFinder.get_summary()["stats"] e são exibidos pela opção --explain da CLI.
+
+Medir a memória usa o tracemalloc, que deixa a execução mais lenta; por isso
+a memória só é medida quando o DataFinder é criado com config["trace_memory"].
+Sem ela, o campo "memory" das etapas fica None.
+"""
+
+import time
+import tracemalloc
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from src.utils.planner import format_bytes
+
+# Estratégia de avaliação de cada operação de consulta
+STRATEGIES = {
+    "equals": "hash join",
+    "all_tokens": "index lookup",
+    "token_overlap": "index lookup",
+    "similar": "index lookup",
+    "contains": "scan",
+    "startswith": "scan",
+}
+
+# Ordem de exibição das etapas
+STAGE_ORDER = ("load_source", "load_query", "normalization", "query", "export")
+
+# Nomes das etapas na saída da CLI
+STAGE_LABELS = {
+    "load_source": "leitura da fonte",
+    "load_query": "leitura da consulta",
+    "normalization": "índices (normalização)",
+    "query": "consulta",
+    "export": "exportação",
+}
+
+
+class ExecutionStats:
+    """
+    Tempo, memória e contadores das etapas e critérios de um DataFinder
+    """
+
+    def __init__(self, trace_memory: bool = False):
+        """
+        Inicializa as estatísticas vazias
+
+        Args:
+            trace_memory: Se True, mede o pico de memória de cada etapa com o
+                tracemalloc
+        """
+        self.trace_memory = trace_memory
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self.criteria: List[Dict[str, Any]] = []
+
+    @contextmanager
+    def stage(self, name: str, **details: Any) -> Iterator[Dict[str, Any]]:
+        """
+        Mede uma etapa, substituindo a medição anterior de mesmo nome
+
+        Args:
+            name: Nome da etapa (ver STAGE_ORDER)
+            **details: Contadores iniciais da etapa
+
+        Yields:
+            Dicionário da etapa, onde o chamador completa os contadores
+        """
+        record = dict(details)
+        started_tracing = False
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            elif hasattr(tracemalloc, "reset_peak"):
+                tracemalloc.reset_peak()
+            else:
+                # Python 3.8 não tem reset_peak: reiniciar o rastreamento zera o pico
+                tracemalloc.stop()
+                tracemalloc.start()
+            baseline = tracemalloc.get_traced_memory()[0]
+
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record["seconds"] = time.perf_counter() - start
+            record["memory"] = None
+            if self.trace_memory:
+                record["memory"] = max(tracemalloc.get_traced_memory()[1] - baseline, 0)
+                if started_tracing:
+                    tracemalloc.stop()
+            self.stages[name] = record
+
+    def discard(self, *names: str) -> None:
+        """
+        Remove medições de etapas (ex. exportação de uma consulta anterior)
+
+        Args:
+            *names: Nomes das etapas
+        """
+        for name in names:
+            self.stages.pop(name, None)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Estatísticas em forma de dicionário
+
+        Returns:
+            Dicionário com "stages" (por nome, na ordem de STAGE_ORDER),
+            "criteria", "total_seconds" e "peak_memory" (None sem medição)
+        """
+        stages = {
+            name: dict(self.stages[name]) for name in STAGE_ORDER if name in self.stages
+        }
+        memories = [s["memory"] for s in stages.values() if s["memory"] is not None]
+        return {
+            "stages": stages,
+            "criteria": [dict(criterion) for criterion in self.criteria],
+            "total_seconds": sum(s["seconds"] for s in stages.values()),
+            "peak_memory": max(memories) if memories else None,
+        }
+
+
+def _format_memory(size: Optional[int]) -> str:
+    return format_bytes(size) if size is not None else "-"
+
+
+def format_explain(stats: Dict[str, Any]) -> str:
+    """
+    Formata o plano e as estatísticas de execução como texto
+
+    Args:
+        stats: DataFinder.get_summary()["stats"]
+
+    Returns:
+        Texto com uma linha por critério (estratégia e candidatos estimados
+        e reais) e uma linha por etapa (tempo, memória e contadores)
+    """
+    lines = ["--- Plano de Execução ---"]
+    for criterion in stats["criteria"]:
+        line = (
+            f"{criterion['query_column']} {criterion['operation']} "
+            f"{criterion['source_column']}: {criterion['strategy']}"
+        )
+        if criterion["index_entries"] is not None:
+            line += f" (índice com {criterion['index_entries']} entradas)"
+        lines.append(line)
+        lines.append(
+            f"  candidatos estimados {criterion['estimated_candidates']}, "
+            f"reais {criterion['actual_candidates']}; "
+            f"{criterion['evaluations']} avaliações, "
+            f"{criterion['cache_hits']} do cache, "
+            f"{criterion['rows_scanned']} linhas examinadas"
+        )
+
+    lines.append("--- Estatísticas por Etapa ---")
+    for name, item in stats["stages"].items():
+        line = (
+            f"{STAGE_LABELS.get(name, name):<24} {item['seconds']:>9.3f}s  "
+            f"{_format_memory(item['memory']):>10}"
+        )
+        details = []
+        if "rows" in item:
+            details.append(f"{item['rows']} linhas")
+        if item.get("bytes_read") is not None:
+            details.append(f"{format_bytes(item['bytes_read'])} lidos")
+        if item.get("engine"):
+            details.append(f"motor {item['engine']}")
+        if "rows_scanned" in item:
+            details.append(f"{item['rows_scanned']} linhas examinadas")
+        if "cache_hits" in item:
+            details.append(
+                f"cache {item['cache_hits']} acertos/{item['cache_misses']} falhas"
+            )
+        if "results" in item:
+            details.append(f"{item['results']} resultados")
+        if item.get("bytes_written") is not None:
+            details.append(f"{format_bytes(item['bytes_written'])} gravados")
+        if item.get("memory_estimated") is not None:
+            details.append(f"estimado {format_bytes(item['memory_estimated'])}")
+        if details:
+            line += f"  ({', '.join(details)})"
+        lines.append(line)
+
+    lines.append(
+        f"{'total':<24} {stats['total_seconds']:>9.3f}s  "
+        f"{_format_memory(stats['peak_memory']):>10}  (pico)"
+    )
+    lines.append("-----------------------------")
+    return "\n".join(lines)
@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Busca aproximada (tolerante a erros de digitação) do DataFinder
+
+Este módulo implementa um índice SymSpell (vizinhança de deleções) sobre os
+valores distintos e normalizados de uma coluna. Cada consulta gera apenas as
+deleções do próprio termo e verifica a distância de edição de um pequeno
+conjunto de candidatos, em vez de comparar o termo com todas as linhas da fonte.
+"""
+
+import pandas as pd
+from collections import defaultdict
+from typing import Dict, Iterable, List, Set, Tuple
+
+
+def normalize_texts(values: pd.Series) -> pd.Series:
+    """
+    Normaliza uma coluna de textos para comparação aproximada (vetorizado)
+
+    Remove acentos, converte para minúsculas e colapsa espaços, de forma que
+    "  Sílvia  JOÃO" vire "silvia joao".
+
+    Args:
+        values: Série com os valores originais
+
+    Returns:
+        Série do tipo "string" com os textos normalizados
+    """
+    return (
+        values.astype("string")
+        .str.normalize("NFKD")
+        .str.replace("[\u0300-\u036f]", "", regex=True)
+        .str.lower()
+        .str.strip()
+        .str.replace(r"\s+", " ", regex=True)
+    )
+
+
+def normalize_text(value) -> str:
+    """
+    Normaliza um único valor para comparação aproximada
+
+    Args:
+        value: Valor original
+
+    Returns:
+        Texto normalizado (sem acentos, minúsculo e com espaços colapsados)
+    """
+    return normalize_texts(pd.Series([value], dtype=object)).iloc[0]
+
+
+def edit_distance(first: str, second: str, max_distance: int) -> int:
+    """
+    Calcula a distância de edição (Damerau-Levenshtein restrita) com limite
+
+    Inserções, remoções, substituições e transposições de caracteres
+    adjacentes custam 1. O cálculo é interrompido assim que a distância
+    ultrapassa o limite.
+
+    Args:
+        first: Primeiro texto
+        second: Segundo texto
+        max_distance: Distância máxima de interesse
+
+    Returns:
+        A distância de edição, ou max_distance + 1 se o limite for ultrapassado
+    """
+    if abs(len(first) - len(second)) > max_distance:
+        return max_distance + 1
+
+    previous_previous = None
+    previous = list(range(len(second) + 1))
+    for i in range(1, len(first) + 1):
+        current = [i] + [0] * len(second)
+        row_min = i
+        for j in range(1, len(second) + 1):
+            cost = 0 if first[i - 1] == second[j - 1] else 1
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if (
+                previous_previous is not None
+                and j > 1
+                and first[i - 1] == second[j - 2]
+                and first[i - 2] == second[j - 1]
+            ):
+                value = min(value, previous_previous[j - 2] + 1)
+            current[j] = value
+            row_min = min(row_min, value)
+        if row_min > max_distance:
+            return max_distance + 1
+        previous_previous, previous = previous, current
+
+    return min(previous[-1], max_distance + 1)
+
+
+def similarity(first: str, second: str, distance: int) -> float:
+    """
+    Converte uma distância de edição em similaridade entre 0 e 1
+
+    Args:
+        first: Primeiro texto
+        second: Segundo texto
+        distance: Distância de edição entre os dois textos
+
+    Returns:
+        1.0 para textos idênticos, diminuindo com a distância
+    """
+    longest = max(len(first), len(second))
+    return 1.0 - distance / longest if longest else 1.0
+
+
+def _deletes(word: str, max_distance: int) -> Set[str]:
+    """Gera o próprio termo e todas as variações com até max_distance deleções"""
+    variants = {word}
+    frontier = {word}
+    for _ in range(max_distance):
+        frontier = {
+            candidate[:i] + candidate[i + 1 :]
+            for candidate in frontier
+            for i in range(len(candidate))
+        }
+        variants |= frontier
+    return variants
+
+
+class SymSpellIndex:
+    """
+    Índice SymSpell sobre um conjunto de valores distintos
+
+    Os valores são indexados pelas deleções do seu prefixo; uma consulta gera
+    as deleções do prefixo do termo buscado, reúne os candidatos que
+    compartilham alguma variação e confirma a distância de edição completa.
+    """
+
+    def __init__(
+        self, values: Iterable[str], max_distance: int = 2, prefix_length: int = 7
+    ):
+        """
+        Constrói o índice
+
+        Args:
+            values: Valores distintos (já normalizados) a indexar
+            max_distance: Maior distância de edição suportada nas consultas
+            prefix_length: Tamanho do prefixo usado para gerar as deleções
+        """
+        self.values = list(values)
+        self.max_distance = max_distance
+        self.prefix_length = prefix_length
+        self._deletes: Dict[str, List[int]] = defaultdict(list)
+
+        for value_id, value in enumerate(self.values):
+            for variant in _deletes(value[:prefix_length], max_distance):
+                self._deletes[variant].append(value_id)
+
+    def lookup(self, term: str, max_distance: int = None) -> List[Tuple[int, int]]:
+        """
+        Busca os valores a até max_distance edições do termo
+
+        Args:
+            term: Termo buscado (já normalizado)
+            max_distance: Distância máxima (limitada à distância do índice)
+
+        Returns:
+            Lista de tuplas (id do valor, distância de edição)
+        """
+        if max_distance is None or max_distance > self.max_distance:
+            max_distance = self.max_distance
+
+        candidates = set()
+        for variant in _deletes(term[: self.prefix_length], max_distance):
+            candidates.update(self._deletes.get(variant, ()))
+
+        matches = []
+        for value_id in candidates:
+            distance = edit_distance(term, self.values[value_id], max_distance)
+            if distance <= max_distance:
+                matches.append((value_id, distance))
+        return matches
@@ -0,0 +1,322 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Arquivos de lote de consultas do DataFinder
+
+Um arquivo de lote (JSON ou YAML) descreve uma planilha fonte e várias
+consultas, cada uma com a sua planilha de consulta, critérios, colunas e
+saída. A fonte é carregada uma única vez, os índices usados pelos critérios
+são criados uma única vez e compartilhados, e as consultas independentes são
+executadas em paralelo, em threads que compartilham a fonte em memória.
+
+Exemplo (JSON):
+
+    {
+        "source": "dados/grande.xlsx",
+        "queries": [
+            {
+                "name": "vip",
+                "query": "dados/vip.xlsx",
+                "criteria": [
+                    {"query_column": "Nome", "source_column": "Cliente",
+                     "operation": "equals"}
+                ],
+                "columns": ["Cliente", "Telefone"],
+                "output": "dados/saida/vip.xlsx"
+            }
+        ]
+    }
+
+Caminhos relativos são resolvidos a partir da pasta do arquivo de lote.
+"""
+
+import os
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+from src.core.engine import SUPPORTED_OPERATIONS, DataFinder
+from src.utils.logger import get_logger
+
+# Obtendo o logger para este módulo
+logger = get_logger("core.jobs")
+
+# Campos aceitos em cada critério (os mesmos de DataFinder.add_criteria)
+CRITERION_FIELDS = frozenset(
+    {
+        "query_column",
+        "source_column",
+        "operation",
+        "case_sensitive",
+        "max_distance",
+        "min_overlap",
+    }
+)
+
+
+def _resolve(base_dir: str, path: Optional[str]) -> Optional[str]:
+    """Resolve um caminho relativo à pasta do arquivo de lote"""
+    if not path or os.path.isabs(path):
+        return path
+    return os.path.normpath(os.path.join(base_dir, path))
+
+
+def _validate_query(query: Any, position: int) -> Dict:
+    """
+    Valida e normaliza uma consulta do arquivo de lote
+
+    Raises:
+        ValueError: Se a consulta estiver incompleta ou inválida
+    """
+    if not isinstance(query, dict):
+        raise ValueError(f"Consulta {position}: deve ser um objeto")
+    name = str(query.get("name") or f"consulta{position}")
+    for field in ("query", "output"):
+        if not query.get(field):
+            raise ValueError(f"Consulta '{name}': campo '{field}' obrigatório")
+
+    criteria = query.get("criteria")
+    if not isinstance(criteria, list) or not criteria:
+        raise ValueError(f"Consulta '{name}': informe ao menos um critério")
+    for criterion in criteria:
+        if not isinstance(criterion, dict):
+            raise ValueError(f"Consulta '{name}': critério deve ser um objeto")
+        unknown = set(criterion) - CRITERION_FIELDS
+        if unknown:
+            raise ValueError(
+                f"Consulta '{name}': campos de critério desconhecidos: "
+                f"{', '.join(sorted(unknown))}"
+            )
+        for field in ("query_column", "source_column"):
+            if not criterion.get(field):
+                raise ValueError(f"Consulta '{name}': critério sem '{field}'")
+        if criterion.get("operation", "equals") not in SUPPORTED_OPERATIONS:
+            raise ValueError(
+                f"Consulta '{name}': operação não suportada: {criterion['operation']}"
+            )
+
+    columns = query.get("columns")
+    if isinstance(columns, str):
+        columns = [column.strip() for column in columns.split(",") if column.strip()]
+
+    return {
+        "name": name,
+        "query": query["query"],
+        "query_sheet": query.get("query_sheet"),
+        "criteria": [dict(c) for c in criteria],
+        "columns": columns or None,
+        "output": query["output"],
+    }
+
+
+def load_job_file(path: str) -> Dict:
+    """
+    Lê e valida um arquivo de lote
+
+    Args:
+        path: Caminho do arquivo (.json, .yaml ou .yml)
+
+    Returns:
+        Dicionário com "source", "source_sheet", "use_xml", "memory_budget"
+        (bytes ou None), "max_workers" e "queries" (lista de consultas com
+        "name", "query", "query_sheet", "criteria", "columns" e "output"),
+        com os caminhos já resolvidos
+
+    Raises:
+        ValueError: Se o arquivo for inválido ou YAML sem o PyYAML instalado
+    """
+    ext = os.path.splitext(path)[1].lower()
+    with open(path, "r", encoding="utf-8") as f:
+        if ext in (".yaml", ".yml"):
+            try:
+                import yaml
+            except ImportError:
+                raise ValueError(
+                    "Arquivos de lote YAML exigem o pacote PyYAML (pip install pyyaml)"
+                )
+            data = yaml.safe_load(f)
+        elif ext == ".json":
+            data = json.load(f)
+        else:
+            raise ValueError(f"Formato de arquivo de lote não suportado: {ext}")
+
+    if not isinstance(data, dict) or not data.get("source"):
+        raise ValueError("O arquivo de lote deve definir a planilha fonte ('source')")
+    queries = data.get("queries")
+    if not isinstance(queries, list) or not queries:
+        raise ValueError("O arquivo de lote deve definir ao menos uma consulta")
+
+    base_dir = os.path.dirname(os.path.abspath(path))
+    job = {
+        "source": _resolve(base_dir, data["source"]),
+        "source_sheet": data.get("source_sheet"),
+        "use_xml": bool(data.get("use_xml", False)),
+        "memory_budget": (
+            int(data["memory_budget"]) * 1024 * 1024
+            if data.get("memory_budget")
+            else None
+        ),
+        "max_workers": data.get("max_workers"),
+        "queries": [],
+    }
+    for position, query in enumerate(queries, start=1):
+        query = _validate_query(query, position)
+        query["query"] = _resolve(base_dir, query["query"])
+        query["output"] = _resolve(base_dir, query["output"])
+        job["queries"].append(query)
+
+    names = [query["name"] for query in job["queries"]]
+    if len(set(names)) != len(names):
+        raise ValueError("Os nomes das consultas devem ser únicos")
+    return job
+
+
+def _run_query(finder: DataFinder, query: Dict) -> Dict:
+    """
+    Executa uma consulta do lote sobre a fonte compartilhada
+
+    Args:
+        finder: DataFinder com a fonte carregada e os índices criados
+        query: Consulta validada (ver load_job_file)
+
+    Returns:
+        Resumo da consulta ("name", "status", "query_rows", "results",
+        "output", "seconds", "stats" (ver DataFinder.get_summary) e, em caso
+        de falha, "error")
+    """
+    start = time.perf_counter()
+    summary = {
+        "name": query["name"],
+        "status": "erro",
+        "query_rows": 0,
+        "results": 0,
+        "output": query["output"],
+    }
+    shared = finder.share_source()
+
+    if not shared.load_query_data(query["query"], sheet_name=query["query_sheet"]):
+        summary["error"] = f"Falha ao carregar dados de consulta de {query['query']}"
+    else:
+        summary["query_rows"] = len(shared.query_data)
+        for criterion in query["criteria"]:
+            shared.add_criteria(**criterion)
+        if not shared.execute_query(columns_to_include=query["columns"]):
+            summary["error"] = "Falha ao executar consulta"
+        else:
+            summary["results"] = shared.result_count
+            output_format = (
+                "csv" if query["output"].lower().endswith(".csv") else "xlsx"
+            )
+            if shared.result_count == 0:
+                summary["status"] = "sem resultados"
+            elif shared.export_results(query["output"], output_format):
+                summary["status"] = "ok"
+            else:
+                summary["error"] = (
+                    f"Falha ao exportar resultados para {query['output']}"
+                )
+
+    summary["seconds"] = time.perf_counter() - start
+    summary["stats"] = shared.get_summary()["stats"]
+    logger.info(
+        f"Consulta '{query['name']}': {summary['status']}, "
+        f"{summary['results']} resultados em {summary['seconds']:.2f}s"
+    )
+    return summary
+
+
+def run_job(job: Dict, max_workers: Optional[int] = None) -> Dict:
+    """
+    Executa um lote: carrega a fonte e cria os índices uma vez e roda as consultas
+
+    Args:
+        job: Lote validado (ver load_job_file)
+        max_workers: Consultas executadas ao mesmo tempo (None usa o valor do
+            lote ou a quantidade de núcleos)
+
+    Returns:
+        Resumo com "source" (arquivo, linhas e segundos), "indexes"
+        (segundos), "queries" (resumo de cada consulta, na ordem do lote),
+        "cache" (estatísticas do cache compartilhado), "failed" e
+        "total_seconds"
+
+    Raises:
+        ValueError: Se a fonte não puder ser carregada ou indexada
+    """
+    start = time.perf_counter()
+    config = {}
+    if job.get("memory_budget"):
+        config["memory_budget"] = job["memory_budget"]
+    finder = DataFinder(config)
+
+    if not finder.load_source_data(
+        job["source"],
+        sheet_name=job.get("source_sheet"),
+        use_xml_extraction=job.get("use_xml", False),
+    ):
+        raise ValueError(f"Falha ao carregar dados fonte de {job['source']}")
+    source_seconds = time.perf_counter() - start
+
+    index_start = time.perf_counter()
+    criteria: List[Dict] = [c for q in job["queries"] for c in q["criteria"]]
+    if not finder.build_indexes(criteria):
+        raise ValueError("Falha ao criar os índices da planilha fonte")
+    index_seconds = time.perf_counter() - index_start
+
+    workers = max_workers or job.get("max_workers") or os.cpu_count() or 1
+    workers = max(1, min(int(workers), len(job["queries"])))
+    logger.info(
+        f"Executando {len(job['queries'])} consultas com {workers} threads "
+        f"sobre {len(finder.source_data)} linhas fonte"
+    )
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        queries = list(pool.map(lambda q: _run_query(finder, q), job["queries"]))
+
+    return {
+        "source": {
+            "file": job["source"],
+            "rows": len(finder.source_data),
+            "seconds": source_seconds,
+        },
+        "indexes": {"criteria": len(criteria), "seconds": index_seconds},
+        "queries": queries,
+        "cache": finder.evaluation_cache.get_stats(),
+        "failed": sum(1 for q in queries if q["status"] == "erro"),
+        "total_seconds": time.perf_counter() - start,
+    }
+
+
+def format_job_summary(summary: Dict) -> str:
+    """
+    Formata o resumo de um lote para exibição
+
+    Args:
+        summary: Resultado de run_job
+
+    Returns:
+        Texto com a carga da fonte, os índices e uma linha por consulta
+    """
+    source = summary["source"]
+    lines = [
+        "--- Resumo do Lote ---",
+        f"Planilha fonte: {source['file']} ({source['rows']} linhas, "
+        f"{source['seconds']:.2f}s)",
+        f"Índices: {summary['indexes']['criteria']} critérios "
+        f"({summary['indexes']['seconds']:.2f}s)",
+    ]
+    for query in summary["queries"]:
+        line = (
+            f"{query['name']}: {query['status']}, {query['results']} resultados de "
+            f"{query['query_rows']} linhas de consulta ({query['seconds']:.2f}s)"
+        )
+        if query.get("error"):
+            line += f" - {query['error']}"
+        lines.append(line)
+    lines.append(
+        f"Total: {len(summary['queries'])} consultas, {summary['failed']} com falha "
+        f"({summary['total_seconds']:.2f}s)"
+    )
+    lines.append("----------------------")
+    return "\n".join(lines)
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Normalização canônica de chaves do DataFinder
+
+Este módulo converte colunas de identificadores (IDs, códigos, telefones, nomes)
+para uma representação textual única e comparável. Planilhas exportadas pelo
+Excel costumam trazer o mesmo ID como inteiro (123), float (123.0), notação
+científica (1.23E2) ou texto com zeros à esquerda ("00123"); após a
+canonicalização todas essas formas viram "123" e podem ser comparadas por
+igualdade exata (hash join) em vez de buscas lentas com "contains".
+"""
+
+import pandas as pd
+from typing import Any
+
+# Números inteiros escritos como texto, com ou sem sufixo ".0" ("123", "00123", "123.00")
+_INTEGER_PATTERN = r"[+-]?\d+(?:\.0*)?"
+
+# Números em notação científica ("1.1987654321E10")
+_SCIENTIFIC_PATTERN = r"[+-]?\d+(?:\.\d+)?[eE][+-]?\d+"
+
+
+def canonicalize_keys(values: pd.Series, case_sensitive: bool = False) -> pd.Series:
+    """
+    Converte uma coluna inteira para a forma canônica de chave (vetorizado)
+
+    Regras aplicadas:
+        - espaços nas pontas são removidos e espaços internos repetidos viram um só
+        - inteiros, floats integrais ("123.0") e notação científica viram o
+          inteiro em texto ("123")
+        - zeros à esquerda de chaves numéricas são removidos ("00123" -> "123")
+        - sem case_sensitive, o texto é convertido para minúsculas
+
+    Args:
+        values: Série com os valores originais (qualquer dtype)
+        case_sensitive: Se False, as chaves são convertidas para minúsculas
+
+    Returns:
+        Série do tipo "string" com as chaves canônicas (valores nulos viram <NA>)
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        # Canonicalizar só as categorias e expandir pelos códigos
+        categories = canonicalize_keys(
+            pd.Series(values.cat.categories), case_sensitive=case_sensitive
+        )
+        keys = categories.array.take(values.cat.codes.to_numpy(), allow_fill=True)
+        return pd.Series(keys, index=values.index, name=values.name)
+
+    if pd.api.types.is_bool_dtype(values.dtype):
+        keys = values.astype("string")
+    elif pd.api.types.is_integer_dtype(values.dtype):
+        keys = values.astype("Int64").astype("string")
+    elif pd.api.types.is_float_dtype(values.dtype):
+        keys = _canonicalize_floats(values)
+    else:
+        keys = _canonicalize_text(values.astype("string"))
+
+    if not case_sensitive:
+        keys = keys.str.lower()
+    return keys
+
+
+def canonicalize_key(value: Any, case_sensitive: bool = False) -> Any:
+    """
+    Converte um único valor para a forma canônica de chave
+
+    Args:
+        value: Valor original
+        case_sensitive: Se False, a chave é convertida para minúsculas
+
+    Returns:
+        Chave canônica em texto, ou pd.NA se o valor for nulo
+    """
+    return canonicalize_keys(
+        pd.Series([value], dtype=object), case_sensitive=case_sensitive
+    ).iloc[0]
+
+
+def _canonicalize_floats(values: pd.Series) -> pd.Series:
+    """Converte uma coluna float, mantendo valores integrais sem o sufixo '.0'"""
+    keys = values.astype("string")
+    integral = values.notna() & (values % 1 == 0) & (values.abs() < 2**63)
+    if integral.any():
+        keys[integral] = values[integral].astype("int64").astype("string")
+    return keys
+
+
+def _canonicalize_text(text: pd.Series) -> pd.Series:
+    """Normaliza uma coluna textual (ou mista) para a forma canônica"""
+    text = text.str.strip().str.replace(r"\s+", " ", regex=True)
+
+    # Inteiros em texto: remover sufixo ".0" e zeros à esquerda
+    integer_mask = text.str.fullmatch(_INTEGER_PATTERN).fillna(False)
+    if integer_mask.any():
+        text[integer_mask] = (
+            text[integer_mask]
+            .str.replace(r"\.0*$", "", regex=True)
+            .str.replace(r"^([+-]?)0+(?=\d)", r"\1", regex=True)
+            .str.replace(r"^[+-]0$", "0", regex=True)
+        )
+
+    # Notação científica: converter para número e, se integral, para inteiro
+    scientific_mask = text.str.fullmatch(_SCIENTIFIC_PATTERN).fillna(False)
+    if scientific_mask.any():
+        numbers = pd.to_numeric(text[scientific_mask], errors="coerce")
+        text[scientific_mask] = _canonicalize_floats(numbers)
+
+    return text
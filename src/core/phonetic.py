@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Chaves fonéticas para nomes em português do Brasil
+
+Este módulo gera códigos fonéticos (variante simplificada de Metaphone/BuscaBR
+para o português) usados para agrupar nomes parecidos em blocos. Em vez de
+comparar cada cliente com todos os contatos, a correspondência aproximada
+compara apenas os nomes que caem no mesmo bloco.
+"""
+
+import re
+import pandas as pd
+from functools import lru_cache
+from typing import List
+
+from src.core.tokens import tokenize_texts
+
+# Regras aplicadas em ordem sobre o token normalizado (sem acentos, minúsculo)
+_RULES = [
+    (re.compile(r"[^a-z]"), ""),
+    (re.compile(r"sch"), "x"),
+    (re.compile(r"ch|sh"), "x"),
+    (re.compile(r"lh"), "l"),
+    (re.compile(r"nh"), "n"),
+    (re.compile(r"ph"), "f"),
+    (re.compile(r"th"), "t"),
+    (re.compile(r"g(?=[eiy])"), "j"),
+    (re.compile(r"gu(?=[eiy])"), "g"),
+    (re.compile(r"qu?"), "k"),
+    (re.compile(r"sc(?=[eiy])"), "s"),
+    (re.compile(r"c(?=[eiy])"), "s"),
+    (re.compile(r"c"), "k"),
+    (re.compile(r"w"), "v"),
+    (re.compile(r"y"), "i"),
+    (re.compile(r"z"), "s"),
+    (re.compile(r"h"), ""),
+    (re.compile(r"m$"), "n"),
+    (re.compile(r"l(?=[^aeiou]|$)"), "u"),
+]
+
+
+@lru_cache(maxsize=65536)
+def phonetic_code(token: str) -> str:
+    """
+    Gera o código fonético de uma palavra
+
+    Após as regras de pronúncia, a primeira letra é mantida, as demais vogais
+    são removidas e letras repetidas são colapsadas ("Sylvia" e "Silvia"
+    geram o mesmo código).
+
+    Args:
+        token: Palavra normalizada (sem acentos e em minúsculas)
+
+    Returns:
+        Código fonético (pode ser vazio)
+    """
+    code = token
+    for pattern, replacement in _RULES:
+        code = pattern.sub(replacement, code)
+    if not code:
+        return ""
+    code = code[0] + re.sub(r"[aeiou]", "", code[1:])
+    return re.sub(r"(.)\1+", r"\1", code)
+
+
+def _block_key(tokens: List[str]) -> str:
+    """Chave de bloco: códigos fonéticos da primeira e da última palavra"""
+    codes = [code for code in (phonetic_code(t) for t in tokens) if code]
+    if not codes:
+        return ""
+    return f"{codes[0]} {codes[-1]}" if len(codes) > 1 else codes[0]
+
+
+def phonetic_block_keys(values: pd.Series) -> pd.Series:
+    """
+    Gera a chave de bloco fonético de cada nome de uma coluna
+
+    O código de cada valor distinto é calculado uma única vez.
+
+    Args:
+        values: Série com os nomes
+
+    Returns:
+        Série com a chave de bloco (vazia para nomes sem letras)
+    """
+    # "ç" soa como "s"; sem isso a remoção de acentos o transformaria em "c"
+    texts = values.astype("string").str.replace("[çÇ]", "s", regex=True)
+    distinct = pd.Series(pd.unique(texts.dropna()), dtype="string")
+    keys = dict(zip(distinct.tolist(), tokenize_texts(distinct).map(_block_key)))
+    return texts.map(keys)
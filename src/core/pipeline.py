@@ -0,0 +1,180 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Estágios de pipeline com filas limitadas
+
+Este módulo contém os dois estágios de fundo usados pelo modo pipeline do
+processador: um leitor que carrega os próximos itens em uma thread enquanto
+o atual é processado, e um gravador que consome os resultados em outra
+thread. As filas entre os estágios são limitadas, de modo que a memória
+fica restrita à profundidade das filas e o tempo total se aproxima do tempo
+do estágio mais lento, em vez da soma de todos.
+"""
+
+import queue
+import threading
+import time
+from typing import Any, Callable, Iterable, Iterator, Tuple
+
+from src.utils.logger import get_logger
+
+# Obtendo o logger para este módulo
+logger = get_logger("core.pipeline")
+
+# Marca o fim dos itens em uma fila
+_FIM = object()
+
+# Intervalo para verificar se o estágio foi cancelado enquanto espera a fila
+_INTERVALO_CANCELAMENTO = 0.1
+
+
+class PrefetchReader:
+    """
+    Carrega itens em uma thread de fundo, no máximo `depth` à frente do consumo
+    """
+
+    def __init__(self, load: Callable[[Any], Any], items: Iterable, depth: int = 2):
+        """
+        Inicializa o leitor e começa a carregar imediatamente
+
+        Args:
+            load: Função que carrega um item (ex. lê e analisa uma planilha)
+            items: Itens a carregar, na ordem de consumo
+            depth: Quantidade máxima de itens carregados aguardando consumo
+        """
+        self._load = load
+        self._queue: queue.Queue = queue.Queue(maxsize=max(depth, 1))
+        self._stop = threading.Event()
+        self.wait_time = 0.0
+        self._thread = threading.Thread(
+            target=self._run, args=(list(items),), name="PrefetchReader", daemon=True
+        )
+        self._thread.start()
+
+    def _put(self, entry) -> bool:
+        """Enfileira sem bloquear indefinidamente se o leitor for cancelado"""
+        while not self._stop.is_set():
+            try:
+                self._queue.put(entry, timeout=_INTERVALO_CANCELAMENTO)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self, items: list) -> None:
+        """Laço da thread de leitura"""
+        for item in items:
+            if self._stop.is_set():
+                return
+            try:
+                entry = (item, self._load(item), None)
+            except Exception as e:
+                entry = (item, None, e)
+            if not self._put(entry) or entry[2] is not None:
+                return
+        self._put(_FIM)
+
+    def __iter__(self) -> Iterator[Tuple[Any, Any]]:
+        """
+        Percorre os itens carregados, na ordem original
+
+        Yields:
+            Tuplas (item, resultado de load)
+
+        Raises:
+            Exception: O erro de load, no item em que ocorreu
+        """
+        while True:
+            start = time.perf_counter()
+            entry = self._queue.get()
+            self.wait_time += time.perf_counter() - start
+            if entry is _FIM:
+                return
+            item, result, error = entry
+            if error is not None:
+                raise error
+            yield item, result
+
+    def close(self) -> None:
+        """Cancela a leitura pendente e aguarda o fim da thread"""
+        self._stop.set()
+        while self._thread.is_alive():
+            try:
+                self._queue.get(timeout=_INTERVALO_CANCELAMENTO)
+            except queue.Empty:
+                pass
+        self._thread.join()
+
+    def __enter__(self) -> "PrefetchReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+class BackgroundWriter:
+    """
+    Grava itens em uma thread de fundo, com no máximo `depth` itens pendentes
+    """
+
+    def __init__(self, write: Callable[[Any], None], depth: int = 2):
+        """
+        Inicializa o gravador e sua thread
+
+        Args:
+            write: Função que grava um item
+            depth: Quantidade máxima de itens aguardando gravação
+        """
+        self._write = write
+        self._queue: queue.Queue = queue.Queue(maxsize=max(depth, 1))
+        self.error = None
+        self.wait_time = 0.0
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name="BackgroundWriter", daemon=True
+        )
+        self._thread.start()
+
+    def _run(self) -> None:
+        """Laço da thread de gravação; após um erro, os itens são descartados"""
+        while True:
+            item = self._queue.get()
+            if item is _FIM:
+                return
+            if self.error is None:
+                try:
+                    self._write(item)
+                except Exception as e:
+                    logger.error(f"Erro no estágio de gravação: {str(e)}")
+                    self.error = e
+
+    def put(self, item: Any) -> None:
+        """
+        Envia um item para gravação (bloqueia se a fila estiver cheia)
+
+        Args:
+            item: Item a gravar
+
+        Raises:
+            Exception: O erro de uma gravação anterior
+        """
+        if self.error is not None:
+            raise self.error
+        start = time.perf_counter()
+        self._queue.put(item)
+        self.wait_time += time.perf_counter() - start
+
+    def close(self) -> None:
+        """
+        Aguarda a gravação dos itens pendentes
+
+        Raises:
+            Exception: O erro de alguma gravação
+        """
+        if not self._closed:
+            self._closed = True
+            self._queue.put(_FIM)
+            self._thread.join()
+        if self.error is not None:
+            raise self.error
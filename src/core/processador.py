@@ -5,14 +5,40 @@ Este módulo contém a lógica principal para processar múltiplas planilhas Exc
 extrair números de telefone e mesclar dados em uma nova planilha consolidada.
 """
 
+import io
 import os
+import time
+import numpy as np
 import pandas as pd
 from typing import List, Tuple, Dict, Optional
 
+from src.core.engine import DataFinder
+from src.core.estimator import (
+    SAMPLE_ROWS,
+    project,
+    sample_sheet,
+    stage,
+    summarize,
+    total_rows,
+)
+from src.core.pipeline import BackgroundWriter, PrefetchReader
+from src.core.fuzzy import edit_distance, normalize_texts, similarity
+from src.core.phonetic import phonetic_block_keys
+from src.core.tokens import tokenize_texts
+from src.utils.checkpoint import BatchCheckpoint
 from src.utils.logger import get_logger
+from src.utils.manifest import ProcessingManifest
 from src.utils.performance import monitor_performance
+from src.utils.planner import estimate_load, log_plan, measure_sheet, plan_batch
+from src.utils.phone_normalizer import format_national, normalize_phones
 from src.utils.file_handlers import FileHandler, XMLExtractor
 
+# Coluna com a qualidade da correspondência (apenas com etapas aproximadas)
+COLUNA_QUALIDADE = "Qualidade_Correspondencia"
+
+# Blocos fonéticos maiores que isto são ignorados (nomes comuns demais)
+TAMANHO_MAXIMO_BLOCO = 1000
+
 
 class ProcessadorPlanilhas:
     """Classe para processar planilhas Excel e adicionar telefones"""
@@ -22,6 +48,13 @@ class ProcessadorPlanilhas:
         diretorio_entrada: str = "dados/entrada",
         diretorio_saida: str = "dados/saida",
         nome_arquivo_saida: str = "Clientes_Com_Telefones.xlsx",
+        estrategia_correspondencia: str = "exata",
+        limiar_similaridade: float = 0.85,
+        snapshot_telefones: Optional[str] = None,
+        pipeline: bool = False,
+        profundidade_fila: int = 2,
+        diretorio_checkpoint: Optional[str] = None,
+        orcamento_memoria: Optional[int] = None,
     ):
         """
         Inicializa o processador de planilhas
@@ -30,6 +63,33 @@ class ProcessadorPlanilhas:
             diretorio_entrada: Diretório onde estão as planilhas de entrada
             diretorio_saida: Diretório onde será salva a planilha processada
             nome_arquivo_saida: Nome do arquivo de saída
+            estrategia_correspondencia: Como cruzar clientes e telefones:
+                'exata' (nome normalizado igual), 'tokens' (também aceita
+                nomes com as mesmas palavras em outra ordem, ex.
+                "Silva, Maria" e "Maria da Silva"), 'fonetica' (também aceita
+                nomes com grafia parecida, ex. "Sylvia Sousa" e "Sílvia
+                Souza") ou etapas combinadas, ex. 'tokens+fonetica'
+            limiar_similaridade: Similaridade mínima (0 a 1) da etapa fonética
+            snapshot_telefones: Caminho de um diretório de telefones persistido;
+                se informado, a planilha de telefones é atualizada de forma
+                incremental (apenas as linhas alteradas são analisadas), com
+                os mesmos telefones gravados pela extração completa
+            pipeline: Se True, a leitura da próxima planilha de clientes, o
+                cruzamento da atual e a gravação das já processadas ocorrem
+                ao mesmo tempo, em threads ligadas por filas limitadas
+            profundidade_fila: Planilhas que podem aguardar em cada fila do
+                pipeline (limita a memória usada)
+            diretorio_checkpoint: Se informado, os telefones extraídos e cada
+                planilha enriquecida são guardados nele assim que ficam
+                prontos, e processar_planilhas(retomar=True) reaproveita esse
+                trabalho após uma interrupção
+            orcamento_memoria: Memória (bytes) que o lote pode usar; pelos
+                metadados das planilhas, o processador passa a ler em fluxo as
+                que não cabem e liga o pipeline (com filas menores) se a saída
+                não couber. None usa uma fração da memória disponível
+
+        Raises:
+            ValueError: Se a estratégia de correspondência não for reconhecida
         """
         self.logger = get_logger("processador")
         self.logger.info("Inicializando ProcessadorPlanilhas")
@@ -37,6 +97,17 @@ class ProcessadorPlanilhas:
         self.diretorio_entrada = diretorio_entrada
         self.diretorio_saida = diretorio_saida
         self.nome_arquivo_saida = nome_arquivo_saida
+        self.estrategia_correspondencia = estrategia_correspondencia
+        self.limiar_similaridade = limiar_similaridade
+        self.snapshot_telefones = snapshot_telefones
+        self.pipeline = pipeline
+        self.profundidade_fila = profundidade_fila
+        self.diretorio_checkpoint = diretorio_checkpoint
+        self.checkpoint = None
+        self.orcamento_memoria = orcamento_memoria
+        self.plano_memoria = None
+        self.motores_leitura = {}
+        self.medidas_clientes = {}
         self.xml_extractor = XMLExtractor()
 
         # Certificar-se de que o diretório de saída existe
@@ -45,6 +116,18 @@ class ProcessadorPlanilhas:
 
         # Dicionário para mapear nomes de clientes para telefones
         self.dict_telefones = {}
+        self.finder_telefones = None
+        self.finder_tokens = None
+
+        # Etapas de correspondência aproximada, executadas após a exata
+        self.etapas_aproximadas = [
+            etapa for etapa in estrategia_correspondencia.split("+") if etapa != "exata"
+        ]
+        invalidas = set(self.etapas_aproximadas) - {"tokens", "fonetica"}
+        if invalidas:
+            raise ValueError(
+                f"Estratégia de correspondência não suportada: {', '.join(invalidas)}"
+            )
 
     @monitor_performance()
     def extrair_clientes(
@@ -63,19 +146,31 @@ class ProcessadorPlanilhas:
             self.logger.info(f"Extraindo clientes de {arquivo}")
             caminho_completo = os.path.join(self.diretorio_entrada, arquivo)
 
-            # Usar o pandas diretamente para ler o arquivo Excel
-            try:
-                df = pd.read_excel(caminho_completo)
-                self.logger.info(f"Arquivo {arquivo} lido com sucesso usando pandas")
-            except Exception as e:
-                self.logger.warning(f"Erro ao ler arquivo com pandas: {str(e)}")
-                self.logger.info("Tentando extrair dados usando XMLExtractor...")
-                # Se falhar, tenta usar o XMLExtractor para extrair os dados
+            # Planilhas que não cabem no orçamento de memória são lidas em fluxo
+            if self.motores_leitura.get(arquivo) == "streaming":
+                self.logger.info(f"Lendo {arquivo} em fluxo (plano de memória)")
                 df = self.xml_extractor.extract_data_from_xlsx(caminho_completo)
-
                 if df.empty:
                     self.logger.error(f"Não foi possível extrair dados de {arquivo}")
                     return None, []
+            else:
+                # Usar o pandas diretamente para ler o arquivo Excel
+                try:
+                    df = pd.read_excel(caminho_completo)
+                    self.logger.info(
+                        f"Arquivo {arquivo} lido com sucesso usando pandas"
+                    )
+                except Exception as e:
+                    self.logger.warning(f"Erro ao ler arquivo com pandas: {str(e)}")
+                    self.logger.info("Tentando extrair dados usando XMLExtractor...")
+                    # Se falhar, tenta usar o XMLExtractor para extrair os dados
+                    df = self.xml_extractor.extract_data_from_xlsx(caminho_completo)
+
+                    if df.empty:
+                        self.logger.error(
+                            f"Não foi possível extrair dados de {arquivo}"
+                        )
+                        return None, []
 
             # Verificar se a planilha tem pelo menos 3 colunas
             if df.shape[1] < 3:
@@ -90,31 +185,486 @@ class ProcessadorPlanilhas:
             self.logger.error(f"Erro ao processar {arquivo}: {str(e)}", exc_info=True)
             return None, []
 
+    def _adicionar_telefones(self, df: pd.DataFrame) -> int:
+        """
+        Adiciona a coluna 'Telefone' a uma planilha de clientes
+
+        Os nomes da coluna C são cruzados com a tabela de telefones em um único
+        left join (DataFinder.execute_enrichment), sem laço por linha. Os
+        clientes sem correspondência exata passam pelas etapas aproximadas
+        configuradas, e nesse caso a coluna COLUNA_QUALIDADE registra a
+        qualidade de cada correspondência (1.0 = exata).
+
+        Args:
+            df: DataFrame da planilha de clientes (alterado no lugar)
+
+        Returns:
+            Número de telefones encontrados
+        """
+        nomes = df.iloc[:, 2]
+        self.finder_telefones.query_data = pd.DataFrame({"Cliente": nomes.to_numpy()})
+        df["Telefone"] = None
+
+        # Se houver nomes repetidos na tabela, vale o último (como no dicionário)
+        if not self.finder_telefones.execute_enrichment(["Telefone"], strategy="last"):
+            self.logger.warning("Falha ao cruzar clientes com a tabela de telefones")
+            return 0
+
+        telefones = np.array(self.finder_telefones.results["Telefone"], dtype=object)
+        qualidade = np.where(pd.notna(telefones), 1.0, np.nan)
+
+        etapas = {
+            "tokens": self._correspondencia_tokens,
+            "fonetica": self._correspondencia_fonetica,
+        }
+        for etapa in self.etapas_aproximadas:
+            faltantes = pd.isna(telefones) & nomes.notna().to_numpy()
+            if not faltantes.any():
+                break
+
+            encontrados, similaridades = etapas[etapa](nomes[faltantes])
+            telefones[faltantes] = encontrados
+            qualidade[faltantes] = similaridades
+            self.logger.info(
+                f"Correspondência '{etapa}': {int(pd.notna(encontrados).sum())} de "
+                f"{int(faltantes.sum())} clientes sem correspondência"
+            )
+
+        df["Telefone"] = pd.Series(telefones).where(pd.notna(telefones), None).values
+        if self.etapas_aproximadas:
+            df[COLUNA_QUALIDADE] = qualidade
+        return int(pd.notna(telefones).sum())
+
+    def _correspondencia_tokens(
+        self, nomes: pd.Series
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Busca telefones por tokens para clientes sem correspondência exata
+
+        Um contato corresponde quando contém todas as palavras do nome do
+        cliente; havendo vários, vence o que tem menos palavras extras.
+
+        Args:
+            nomes: Nomes dos clientes ainda sem telefone
+
+        Returns:
+            Tupla (telefone ou None, qualidade) alinhada a `nomes`; a qualidade
+            é a fração das palavras do contato presentes no nome do cliente
+        """
+        telefones = np.full(len(nomes), None, dtype=object)
+        qualidade = np.full(len(nomes), np.nan)
+
+        self.finder_tokens.query_data = pd.DataFrame({"Cliente": nomes.to_numpy()})
+        if not self.finder_tokens.execute_query(track_provenance=True):
+            return telefones, qualidade
+
+        proveniencia = self.finder_tokens.provenance
+        tokens_cliente = tokenize_texts(nomes).str.len().to_numpy()
+        pares = pd.DataFrame(
+            {
+                "cliente": proveniencia["query_rows"],
+                "contato": proveniencia["source_rows"],
+            }
+        )
+        pares["extras"] = (
+            self.tokens_por_nome[pares["contato"]] - tokens_cliente[pares["cliente"]]
+        )
+        melhores = pares.sort_values(
+            ["cliente", "extras", "contato"], kind="stable"
+        ).drop_duplicates("cliente")
+
+        clientes = melhores["cliente"].to_numpy()
+        contatos = melhores["contato"].to_numpy()
+        telefones[clientes] = self.tabela_telefones["Telefone"].to_numpy()[contatos]
+        qualidade[clientes] = tokens_cliente[clientes] / self.tokens_por_nome[contatos]
+        return telefones, qualidade
+
+    def _correspondencia_fonetica(
+        self, nomes: pd.Series
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Busca telefones por semelhança fonética e ortográfica
+
+        Os clientes só são comparados com os contatos do mesmo bloco fonético
+        (ver src.core.phonetic); dentro do bloco vence o contato de maior
+        similaridade de edição, desde que atinja o limiar configurado.
+
+        Args:
+            nomes: Nomes dos clientes ainda sem telefone
+
+        Returns:
+            Tupla (telefone ou None, similaridade) alinhada a `nomes`
+        """
+        telefones = np.full(len(nomes), None, dtype=object)
+        qualidade = np.full(len(nomes), np.nan)
+
+        clientes = pd.DataFrame(
+            {
+                "cliente": np.arange(len(nomes)),
+                "bloco": phonetic_block_keys(nomes).to_numpy(dtype=object),
+                "nome": normalize_texts(nomes).to_numpy(dtype=object),
+            }
+        )
+        clientes = clientes[clientes["bloco"].notna() & (clientes["bloco"] != "")]
+        pares = clientes.merge(self.blocos_contatos, on="bloco")
+        if pares.empty:
+            return telefones, qualidade
+
+        similaridades = []
+        for nome, nome_contato in zip(pares["nome"], pares["nome_contato"]):
+            maior = max(len(nome), len(nome_contato))
+            limite = int((1 - self.limiar_similaridade) * maior)
+            distancia = edit_distance(nome, nome_contato, limite)
+            similaridades.append(similarity(nome, nome_contato, distancia))
+        pares["similaridade"] = similaridades
+
+        pares = pares[pares["similaridade"] >= self.limiar_similaridade]
+        melhores = pares.sort_values(
+            ["cliente", "similaridade", "contato"],
+            ascending=[True, False, True],
+            kind="stable",
+        ).drop_duplicates("cliente")
+
+        posicoes = melhores["cliente"].to_numpy()
+        contatos = melhores["contato"].to_numpy()
+        telefones[posicoes] = self.tabela_telefones["Telefone"].to_numpy()[contatos]
+        qualidade[posicoes] = melhores["similaridade"].to_numpy()
+        return telefones, qualidade
+
+    def _preparar_correspondencia(self) -> None:
+        """
+        Prepara a tabela de telefones e os índices usados no cruzamento
+
+        A tabela é a fonte de um único DataFinder, reaproveitado (com os seus
+        índices) por todas as planilhas de clientes. Os telefones fixos e
+        celulares válidos são normalizados (DDD + número, sem o +55 e sem
+        pontuação), de modo que o mesmo número é gravado sempre da mesma
+        forma; os demais (0800, ramais, internacionais, dois números na mesma
+        célula etc.) são mantidos como vieram.
+        """
+        telefones = pd.Series(list(self.dict_telefones.values()), dtype=object)
+        normalizados = normalize_phones(telefones)
+        validos = normalizados["tipo"].isin(["fixo", "celular"]).to_numpy()
+        formatados = format_national(normalizados["e164"]).to_numpy(dtype=object)
+        self.tabela_telefones = pd.DataFrame(
+            {
+                "Nome": list(self.dict_telefones.keys()),
+                "Telefone": np.where(validos, formatados, telefones.to_numpy()),
+            }
+        )
+        self.finder_telefones = DataFinder()
+        self.finder_telefones.source_data = self.tabela_telefones
+        self.finder_telefones.add_criteria(
+            query_column="Cliente", source_column="Nome", operation="equals"
+        )
+
+        if "tokens" in self.etapas_aproximadas:
+            self.finder_tokens = DataFinder()
+            self.finder_tokens.source_data = self.tabela_telefones
+            self.finder_tokens.add_criteria(
+                query_column="Cliente", source_column="Nome", operation="all_tokens"
+            )
+            self.tokens_por_nome = (
+                tokenize_texts(self.tabela_telefones["Nome"]).str.len().to_numpy()
+            )
+
+        if "fonetica" in self.etapas_aproximadas:
+            blocos = pd.DataFrame(
+                {
+                    "bloco": phonetic_block_keys(self.tabela_telefones["Nome"]),
+                    "contato": np.arange(len(self.tabela_telefones)),
+                    "nome_contato": normalize_texts(self.tabela_telefones["Nome"]),
+                }
+            ).astype({"bloco": object, "nome_contato": object})
+            blocos = blocos[blocos["bloco"].notna() & (blocos["bloco"] != "")]
+
+            # Blocos muito grandes (nomes muito comuns) tornariam o custo quadrático
+            tamanhos = blocos.groupby("bloco")["contato"].transform("size")
+            grandes = tamanhos > TAMANHO_MAXIMO_BLOCO
+            if grandes.any():
+                self.logger.warning(
+                    f"{int(grandes.sum())} contatos em blocos fonéticos com mais de "
+                    f"{TAMANHO_MAXIMO_BLOCO} nomes foram ignorados na etapa fonética"
+                )
+            self.blocos_contatos = blocos[~grandes]
+
     @monitor_performance()
     def processar_planilhas(
-        self, arquivos_cliente: List[str], arquivo_telefones: str
+        self, arquivos_cliente: List[str], arquivo_telefones: str, retomar: bool = False
     ) -> bool:
         """
         Processa as planilhas de clientes e adiciona os telefones
 
+        No modo pipeline, as planilhas de clientes começam a ser lidas em
+        segundo plano junto com a planilha de telefones, e cada planilha
+        processada é gravada enquanto a seguinte é cruzada.
+
         Args:
             arquivos_cliente: Lista de nomes de arquivos com dados de clientes
             arquivo_telefones: Nome do arquivo com os telefones
+            retomar: Se True (e com diretorio_checkpoint), reaproveita os
+                telefones e as planilhas concluídos por uma execução anterior
+                interrompida e processa apenas o restante
 
         Returns:
             True se o processamento foi bem-sucedido, False caso contrário
         """
         self.logger.info("Iniciando processamento de planilhas")
 
+        self.checkpoint = None
+        if self.diretorio_checkpoint:
+            self.checkpoint = BatchCheckpoint(self.diretorio_checkpoint)
+            self.checkpoint.start(
+                {
+                    "entrada": os.path.abspath(self.diretorio_entrada),
+                    "arquivos": list(arquivos_cliente),
+                    "telefones": arquivo_telefones,
+                    "estrategia": self.estrategia_correspondencia,
+                    "limiar": self.limiar_similaridade,
+                },
+                resume=retomar,
+            )
+        elif retomar:
+            self.logger.warning("Retomada solicitada sem diretório de checkpoint")
+
+        pipeline, profundidade = self._planejar_memoria(arquivos_cliente)
+
+        leitor = None
+        if pipeline:
+            leitor = PrefetchReader(self._ler_cliente, arquivos_cliente, profundidade)
+
+        try:
+            if not self._carregar_telefones(arquivo_telefones):
+                return False
+
+            self._preparar_correspondencia()
+
+            if leitor is not None:
+                sucesso = self._processar_em_pipeline(leitor, profundidade)
+            else:
+                sucesso = self._processar_sequencial(arquivos_cliente)
+        finally:
+            if leitor is not None:
+                leitor.close()
+            checkpoint, self.checkpoint = self.checkpoint, None
+
+        # Lote concluído: o trabalho guardado não é mais necessário
+        if sucesso and checkpoint is not None:
+            checkpoint.clear()
+        return sucesso
+
+    def _planejar_memoria(self, arquivos_cliente: List[str]) -> Tuple[bool, int]:
+        """
+        Planeja o lote pelo orçamento de memória (ver src.utils.planner)
+
+        Define o motor de leitura de cada planilha de clientes e decide se o
+        pipeline é necessário para que a saída caiba no orçamento.
+
+        Args:
+            arquivos_cliente: Lista de nomes de arquivos com dados de clientes
+
+        Returns:
+            Tupla (pipeline, profundidade_fila) a usar neste lote
+        """
+        self.plano_memoria = None
+        self.motores_leitura = {}
+        self.medidas_clientes = medidas = {}
+        for arquivo in arquivos_cliente:
+            caminho = os.path.join(self.diretorio_entrada, arquivo)
+            try:
+                medidas[arquivo] = measure_sheet(caminho)
+            except (OSError, ValueError):
+                # Arquivos ausentes ou inválidos são tratados na leitura
+                continue
+        if not medidas:
+            return self.pipeline, self.profundidade_fila
+
+        self.plano_memoria = plan_batch(
+            list(medidas.values()),
+            self.orcamento_memoria,
+            self.pipeline,
+            self.profundidade_fila,
+        )
+        log_plan(f"Lote de {len(medidas)} planilhas", self.plano_memoria)
+        self.motores_leitura = {
+            arquivo: self.plano_memoria["motores"][medida["arquivo"]]["motor"]
+            for arquivo, medida in medidas.items()
+        }
+        return self.plano_memoria["pipeline"], self.plano_memoria["profundidade_fila"]
+
+    def estimar(
+        self,
+        arquivos_cliente: List[str],
+        arquivo_telefones: str,
+        amostra: int = SAMPLE_ROWS,
+    ) -> Dict:
+        """
+        Estima tempo e memória de processar_planilhas sem carregar nada por completo
+
+        As planilhas são medidas pelos metadados e só as primeiras `amostra`
+        linhas de cada uma são lidas. O cruzamento é medido na amostra da
+        primeira planilha de clientes (com os próprios nomes como tabela de
+        telefones) e projetado para o total de linhas.
+
+        Args:
+            arquivos_cliente: Lista de nomes de arquivos com dados de clientes
+            arquivo_telefones: Nome do arquivo com os telefones
+            amostra: Linhas lidas de cada planilha
+
+        Returns:
+            Estimativa com "etapas", "plano", "total_segundos" e "pico_memoria"
+            (ver src.core.estimator)
+
+        Raises:
+            ValueError: Se nenhuma planilha de clientes puder ser medida
+        """
+        self.logger.info("Estimando processamento de planilhas")
+        pipeline, profundidade = self._planejar_memoria(arquivos_cliente)
+        if self.plano_memoria is None:
+            raise ValueError("Nenhuma planilha de clientes encontrada para estimar")
+
+        caminho_telefones = os.path.join(self.diretorio_entrada, arquivo_telefones)
+        medida_telefones = measure_sheet(caminho_telefones)
+        amostra_telefones, segundos = sample_sheet(
+            caminho_telefones, n_rows=amostra, engine="streaming"
+        )
+        linhas_telefones = total_rows(medida_telefones, amostra_telefones)
+        etapas = [
+            stage(
+                "extração de telefones",
+                project(segundos, len(amostra_telefones), linhas_telefones),
+                estimate_load(medida_telefones, "streaming"),
+                f"{linhas_telefones} linhas",
+            )
+        ]
+
+        leitura, linhas_clientes, amostras = 0.0, 0, []
+        for arquivo, motor in self.motores_leitura.items():
+            caminho = os.path.join(self.diretorio_entrada, arquivo)
+            df, segundos = sample_sheet(caminho, n_rows=amostra, engine=motor)
+            linhas = total_rows(self.medidas_clientes[arquivo], df)
+            leitura += project(segundos, len(df), linhas)
+            linhas_clientes += linhas
+            amostras.append(df)
+        etapas.append(
+            stage(
+                "leitura dos clientes",
+                leitura,
+                max(p["pico_estimado"] for p in self.plano_memoria["motores"].values()),
+                f"{len(amostras)} planilhas, {linhas_clientes} linhas",
+            )
+        )
+
+        # Cruzamento na amostra, preservando o estado do processador
+        df = next((df for df in amostras if df.shape[1] >= 3), None)
+        if df is not None and len(df):
+            estado = (self.dict_telefones, self.finder_telefones, self.finder_tokens)
+            try:
+                self.dict_telefones = {
+                    str(nome): "11999990000" for nome in df.iloc[:, 2].dropna()
+                }
+                inicio = time.perf_counter()
+                self._preparar_correspondencia()
+                preparo = time.perf_counter() - inicio
+
+                df = df.copy()
+                inicio = time.perf_counter()
+                self._adicionar_telefones(df)
+                cruzamento = time.perf_counter() - inicio
+            finally:
+                self.dict_telefones, self.finder_telefones, self.finder_tokens = estado
+            etapas.append(
+                stage(
+                    "cruzamento",
+                    project(preparo, len(df), linhas_telefones)
+                    + project(cruzamento, len(df), linhas_clientes),
+                    self.plano_memoria["pico_estimado"],
+                    f"estratégia {self.estrategia_correspondencia}",
+                )
+            )
+
+            inicio = time.perf_counter()
+            df.to_excel(io.BytesIO(), index=False)
+            etapas.append(
+                stage(
+                    "gravação da saída",
+                    project(time.perf_counter() - inicio, len(df), linhas_clientes),
+                    self.plano_memoria["pico_estimado"],
+                    "pipeline" if pipeline else "sequencial",
+                )
+            )
+
+        return summarize(etapas, self.plano_memoria)
+
+    def _ler_cliente(self, arquivo: str) -> Tuple[Optional[pd.DataFrame], bool]:
+        """
+        Obtém uma planilha de clientes do checkpoint ou, se preciso, do arquivo
+
+        Args:
+            arquivo: Nome do arquivo de clientes
+
+        Returns:
+            Tupla (DataFrame, retomado); retomado indica que a planilha veio
+            do checkpoint e já está enriquecida
+        """
+        if self.checkpoint is not None:
+            df = self.checkpoint.load_frame(
+                arquivo, os.path.join(self.diretorio_entrada, arquivo)
+            )
+            if df is not None:
+                return df, True
+        df, _ = self.extrair_clientes(arquivo)
+        return df, False
+
+    def _concluir(self, arquivo: str, df: pd.DataFrame) -> None:
+        """
+        Enriquece uma planilha lida e a guarda no checkpoint
+
+        Args:
+            arquivo: Nome do arquivo de origem
+            df: DataFrame da planilha de clientes (alterado no lugar)
+        """
+        self._enriquecer(arquivo, df)
+        if self.checkpoint is not None:
+            try:
+                self.checkpoint.save_frame(
+                    arquivo, os.path.join(self.diretorio_entrada, arquivo), df
+                )
+            except Exception as e:
+                # O lote segue; a planilha apenas será refeita se o lote for retomado
+                self.logger.warning(f"Falha ao guardar {arquivo} no checkpoint: {e}")
+
+    def _carregar_telefones(self, arquivo_telefones: str) -> bool:
+        """
+        Extrai a tabela nome -> telefone para self.dict_telefones
+
+        Args:
+            arquivo_telefones: Nome do arquivo com os telefones
+
+        Returns:
+            True se algum telefone foi extraído, False caso contrário
+        """
         # Extrair telefones do arquivo de telefones
         caminho_telefones = os.path.join(self.diretorio_entrada, arquivo_telefones)
         self.logger.info(f"Extraindo telefones de {caminho_telefones}")
 
+        if self.checkpoint is not None:
+            self.dict_telefones = self.checkpoint.load_phones(caminho_telefones)
+            if self.dict_telefones:
+                return True
+
         try:
-            # Usar o XMLExtractor para extrair os telefones
-            self.dict_telefones = self.xml_extractor.extract_phones_from_xlsx(
-                caminho_telefones
-            )
+            if self.snapshot_telefones:
+                # Reaproveitar o snapshot e analisar apenas as linhas alteradas
+                diretorio = self.xml_extractor.refresh_phone_directory(
+                    caminho_telefones, self.snapshot_telefones
+                )
+                self.dict_telefones = diretorio.to_dict()
+            else:
+                # Usar o XMLExtractor para extrair os telefones
+                self.dict_telefones = self.xml_extractor.extract_phones_from_xlsx(
+                    caminho_telefones
+                )
         except Exception as e:
             self.logger.error(f"Falha ao extrair telefones: {str(e)}", exc_info=True)
             self.dict_telefones = {}
@@ -126,38 +676,50 @@ class ProcessadorPlanilhas:
             return False
 
         self.logger.info(f"Extraídos {len(self.dict_telefones)} contatos com telefones")
+        if self.checkpoint is not None:
+            try:
+                self.checkpoint.save_phones(caminho_telefones, self.dict_telefones)
+            except Exception as e:
+                self.logger.warning(f"Falha ao guardar os telefones no checkpoint: {e}")
+        return True
+
+    def _enriquecer(self, arquivo: str, df: pd.DataFrame) -> None:
+        """
+        Adiciona a coluna de telefone a uma planilha de clientes já lida
+
+        Args:
+            arquivo: Nome do arquivo de origem (para o log)
+            df: DataFrame da planilha de clientes (alterado no lugar)
+        """
+        # Adicionar coluna de telefone via enriquecimento vetorizado
+        telefones_encontrados = self._adicionar_telefones(df)
 
+        self.logger.info(f"Encontrados {telefones_encontrados} telefones em {arquivo}")
+        self.logger.info(f"Processado {arquivo} com {len(df)} linhas")
+
+    def _processar_sequencial(self, arquivos_cliente: List[str]) -> bool:
+        """
+        Lê, cruza e grava as planilhas de clientes uma após a outra
+
+        Args:
+            arquivos_cliente: Lista de nomes de arquivos com dados de clientes
+
+        Returns:
+            True se o arquivo de saída foi gravado, False caso contrário
+        """
         # Processar cada planilha de cliente
         dfs_processados = []
         sheet_names = []
 
         for idx, arquivo in enumerate(arquivos_cliente):
             self.logger.info(f"Processando {arquivo}...")
-            df, clientes = self.extrair_clientes(arquivo)
+            df, retomado = self._ler_cliente(arquivo)
 
             if df is not None:
-                # Adicionar coluna de telefone
-                df["Telefone"] = None
-
-                # Para cada cliente na planilha, buscar o telefone
-                telefones_encontrados = 0
-                for i, row in df.iterrows():
-                    if pd.notna(row.iloc[2]):  # Se há um nome na coluna C
-                        try:
-                            nome_cliente = str(row.iloc[2]).strip().lower()
-                            if nome_cliente in self.dict_telefones:
-                                df.at[i, "Telefone"] = self.dict_telefones[nome_cliente]
-                                telefones_encontrados += 1
-                        except Exception as e:
-                            self.logger.debug(f"Erro ao processar linha {i}: {str(e)}")
-                            continue
-
-                self.logger.info(
-                    f"Encontrados {telefones_encontrados} telefones em {arquivo}"
-                )
+                if not retomado:
+                    self._concluir(arquivo, df)
                 dfs_processados.append(df)
                 sheet_names.append(f"Planilha{idx+1}")
-                self.logger.info(f"Processado {arquivo} com {len(df)} linhas")
 
         # Salvar as planilhas processadas
         if dfs_processados:
@@ -178,3 +740,241 @@ class ProcessadorPlanilhas:
         else:
             self.logger.warning("Nenhuma planilha foi processada com sucesso")
             return False
+
+    def _processar_em_pipeline(self, leitor: PrefetchReader, profundidade: int) -> bool:
+        """
+        Cruza as planilhas lidas em segundo plano e grava cada uma assim que pronta
+
+        Leitura, cruzamento e gravação ocorrem em paralelo; no máximo
+        `profundidade` planilhas aguardam em cada fila.
+
+        Args:
+            leitor: Leitor antecipado das planilhas de clientes
+            profundidade: Profundidade da fila de gravação
+
+        Returns:
+            True se o arquivo de saída foi gravado, False caso contrário
+        """
+        caminho_saida = os.path.join(self.diretorio_saida, self.nome_arquivo_saida)
+        saida = {}
+
+        def gravar(item: Tuple[str, pd.DataFrame]) -> None:
+            sheet_name, df = item
+            # O arquivo só é criado quando a primeira planilha fica pronta
+            if "writer" not in saida:
+                self.logger.info(f"Salvando resultado em {caminho_saida}")
+                saida["writer"] = pd.ExcelWriter(caminho_saida, engine="openpyxl")
+            df.to_excel(saida["writer"], sheet_name=sheet_name, index=False)
+
+        gravador = BackgroundWriter(gravar, profundidade)
+        processadas = 0
+        try:
+            for idx, (arquivo, (df, retomado)) in enumerate(leitor):
+                self.logger.info(f"Processando {arquivo}...")
+                if df is None:
+                    continue
+                if not retomado:
+                    self._concluir(arquivo, df)
+                gravador.put((f"Planilha{idx+1}", df))
+                processadas += 1
+            gravador.close()
+            if "writer" in saida:
+                saida.pop("writer").close()
+        except Exception as e:
+            self.logger.error(
+                f"Erro no processamento em pipeline: {str(e)}", exc_info=True
+            )
+            return False
+        finally:
+            # Em caso de falha, encerrar os estágios sem propagar novos erros
+            try:
+                gravador.close()
+            except Exception:
+                pass
+            if "writer" in saida:
+                try:
+                    saida.pop("writer").close()
+                except Exception as e:
+                    self.logger.error(f"Erro ao fechar {caminho_saida}: {str(e)}")
+
+        self.logger.info(
+            f"Pipeline: {leitor.wait_time:.2f}s aguardando leitura, "
+            f"{gravador.wait_time:.2f}s aguardando gravação"
+        )
+        if not processadas:
+            self.logger.warning("Nenhuma planilha foi processada com sucesso")
+            return False
+        self.logger.info(f"Arquivo salvo com sucesso: {caminho_saida}")
+        return True
+
+    def listar_planilhas_entrada(self, arquivo_telefones: str) -> List[str]:
+        """
+        Lista as planilhas de clientes presentes no diretório de entrada
+
+        Args:
+            arquivo_telefones: Nome do arquivo com os telefones (excluído)
+
+        Returns:
+            Nomes dos arquivos .xlsx/.xls em ordem alfabética, sem a planilha
+            de telefones e sem arquivos temporários do Excel ("~$...")
+        """
+        if not os.path.isdir(self.diretorio_entrada):
+            return []
+        return sorted(
+            nome
+            for nome in os.listdir(self.diretorio_entrada)
+            if nome.lower().endswith((".xlsx", ".xls"))
+            and nome != arquivo_telefones
+            and not nome.startswith("~$")
+            and os.path.isfile(os.path.join(self.diretorio_entrada, nome))
+        )
+
+    @monitor_performance()
+    def processar_incremental(
+        self, arquivo_telefones: str, caminho_manifesto: Optional[str] = None
+    ) -> bool:
+        """
+        Processa apenas as planilhas de clientes novas ou alteradas
+
+        O diretório de entrada é varrido e comparado com o manifesto dos
+        arquivos já processados (tamanho, data e hash). Só os arquivos novos
+        ou alterados são lidos e cruzados, e a saída consolidada é atualizada
+        no lugar: as planilhas desses arquivos são substituídas ou
+        acrescentadas, e as de arquivos removidos são excluídas. Se a
+        planilha de telefones mudar (ou a saída não existir), todos os
+        arquivos são reprocessados.
+
+        Args:
+            arquivo_telefones: Nome do arquivo com os telefones
+            caminho_manifesto: Caminho do manifesto (padrão: .manifesto.json
+                no diretório de saída)
+
+        Returns:
+            True se a saída está atualizada, False em caso de falha
+        """
+        caminho_saida = os.path.join(self.diretorio_saida, self.nome_arquivo_saida)
+        manifesto = ProcessingManifest(
+            caminho_manifesto or os.path.join(self.diretorio_saida, ".manifesto.json")
+        )
+        caminho_telefones = os.path.join(self.diretorio_entrada, arquivo_telefones)
+        if not os.path.exists(caminho_telefones):
+            self.logger.error(
+                f"Planilha de telefones não encontrada: {caminho_telefones}"
+            )
+            return False
+
+        recriar = not os.path.exists(caminho_saida) or manifesto.phones_changed(
+            caminho_telefones
+        )
+        if recriar:
+            self.logger.info("Saída ausente ou telefones alterados; reprocessando tudo")
+            manifesto.clear()
+
+        arquivos = self.listar_planilhas_entrada(arquivo_telefones)
+        alterados = [
+            arquivo
+            for arquivo in arquivos
+            if manifesto.is_changed(
+                arquivo, os.path.join(self.diretorio_entrada, arquivo)
+            )
+        ]
+        removidos = manifesto.removed(arquivos)
+        self.logger.info(
+            f"{len(arquivos)} planilhas de clientes: {len(alterados)} novas ou "
+            f"alteradas, {len(removidos)} removidas"
+        )
+        if not alterados and not removidos:
+            manifesto.save()
+            self.logger.info("Saída consolidada já está atualizada")
+            return True
+
+        # Telefones atualizados de forma incremental pelo snapshot (o diretório
+        # guarda os telefones fora do formato como vieram, então a saída é a
+        # mesma de processar_planilhas)
+        if self.snapshot_telefones is None:
+            self.snapshot_telefones = os.path.join(
+                self.diretorio_saida, ".telefones.lteldir"
+            )
+        if alterados and not self._carregar_telefones(arquivo_telefones):
+            return False
+        if alterados:
+            self._preparar_correspondencia()
+
+        novas = {}
+        for arquivo in alterados:
+            self.logger.info(f"Processando {arquivo}...")
+            df, _ = self.extrair_clientes(arquivo)
+            if df is None:
+                # Sem registro no manifesto: o arquivo é tentado de novo na próxima vez
+                continue
+            self._enriquecer(arquivo, df)
+            novas[arquivo] = (manifesto.sheet_for(arquivo), df)
+        excluidas = [manifesto.remove(arquivo) for arquivo in removidos]
+
+        try:
+            self._atualizar_saida(
+                caminho_saida,
+                [planilha for planilha, _ in novas.values()],
+                [df for _, df in novas.values()],
+                [planilha for planilha in excluidas if planilha],
+                recriar,
+            )
+        except Exception as e:
+            self.logger.error(
+                f"Erro ao atualizar {caminho_saida}: {str(e)}", exc_info=True
+            )
+            return False
+
+        for arquivo, (planilha, _) in novas.items():
+            manifesto.record(
+                arquivo, os.path.join(self.diretorio_entrada, arquivo), planilha
+            )
+        manifesto.record_phones(caminho_telefones)
+        manifesto.save()
+        self.logger.info(
+            f"Saída consolidada atualizada: {len(novas)} planilhas gravadas, "
+            f"{len(removidos)} removidas"
+        )
+        return True
+
+    def _atualizar_saida(
+        self,
+        caminho_saida: str,
+        sheet_names: List[str],
+        dfs: List[pd.DataFrame],
+        excluidas: List[str],
+        recriar: bool = False,
+    ) -> None:
+        """
+        Substitui, acrescenta e exclui planilhas da saída consolidada
+
+        As demais planilhas do arquivo são mantidas como estão.
+
+        Args:
+            caminho_saida: Caminho do arquivo de saída
+            sheet_names: Planilhas a gravar (substituídas se já existirem)
+            dfs: DataFrames alinhados a `sheet_names`
+            excluidas: Planilhas a excluir
+            recriar: Se True, o arquivo é gravado do zero só com `dfs`
+        """
+        if recriar or not os.path.exists(caminho_saida):
+            if dfs:
+                with pd.ExcelWriter(caminho_saida, engine="openpyxl") as writer:
+                    for sheet_name, df in zip(sheet_names, dfs):
+                        df.to_excel(writer, sheet_name=sheet_name, index=False)
+            return
+
+        with pd.ExcelWriter(
+            caminho_saida, engine="openpyxl", mode="a", if_sheet_exists="replace"
+        ) as writer:
+            for sheet_name, df in zip(sheet_names, dfs):
+                df.to_excel(writer, sheet_name=sheet_name, index=False)
+            restantes = [
+                nome for nome in writer.book.sheetnames if nome not in excluidas
+            ]
+            if not restantes:
+                # Um arquivo Excel precisa de ao menos uma planilha
+                writer.book.create_sheet("Vazio")
+            for nome in excluidas:
+                if nome in writer.book.sheetnames:
+                    writer.book.remove(writer.book[nome])
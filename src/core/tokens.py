@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Índice invertido de tokens do DataFinder
+
+Este módulo permite comparar nomes independentemente da ordem das palavras
+("Silva, Maria", "Maria da Silva" e "MARIA SILVA"). Cada valor é quebrado em
+tokens normalizados e o índice guarda, para cada token, a lista ordenada das
+linhas onde ele aparece. As consultas cruzam apenas essas listas, começando
+pelo token mais raro, em vez de varrer a coluna inteira.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, List
+
+from src.core.fuzzy import normalize_texts
+
+# Conectivos ignorados na comparação de nomes ("Maria da Silva" == "Maria Silva")
+STOPWORDS = frozenset({"da", "de", "do", "das", "dos", "e"})
+
+
+def tokenize_texts(values: pd.Series) -> pd.Series:
+    """
+    Quebra uma coluna de textos em listas de tokens normalizados (vetorizado)
+
+    Args:
+        values: Série com os valores originais
+
+    Returns:
+        Série de listas de tokens (sem acentos, minúsculos, sem pontuação e
+        sem conectivos); valores nulos viram listas vazias
+    """
+    texts = normalize_texts(values).str.replace(r"[^\w\s]", " ", regex=True)
+    tokens = texts.fillna("").str.split()
+    exploded = tokens.explode()
+    exploded = exploded[exploded.notna() & ~exploded.isin(STOPWORDS)]
+    grouped = exploded.groupby(level=0, sort=False).agg(list)
+    return grouped.reindex(values.index).apply(
+        lambda value: value if isinstance(value, list) else []
+    )
+
+
+class TokenIndex:
+    """
+    Índice invertido token -> posições ordenadas das linhas
+    """
+
+    def __init__(self, values: pd.Series):
+        """
+        Constrói o índice sobre uma coluna
+
+        Args:
+            values: Série com os valores a indexar (as posições das linhas
+                são usadas como identificadores)
+        """
+        tokens = tokenize_texts(values).reset_index(drop=True)
+        exploded = tokens.explode().dropna()
+        pairs = pd.DataFrame(
+            {"token": exploded.to_numpy(dtype=object), "row": exploded.index}
+        ).drop_duplicates()
+        pairs = pairs.sort_values(["token", "row"], kind="stable")
+
+        unique_tokens, starts = np.unique(
+            pairs["token"].to_numpy(dtype=str), return_index=True
+        )
+        rows = pairs["row"].to_numpy(dtype=np.int64)
+        bounds = np.append(starts, len(rows))
+        self.postings: Dict[str, np.ndarray] = {
+            token: rows[bounds[i] : bounds[i + 1]]
+            for i, token in enumerate(unique_tokens)
+        }
+        self.token_counts = tokens.str.len().to_numpy(dtype=np.int64)
+
+    def _query_tokens(self, value) -> List[str]:
+        """Tokeniza um único valor de consulta, sem tokens repetidos"""
+        tokens = tokenize_texts(pd.Series([value], dtype=object)).iloc[0]
+        return list(dict.fromkeys(tokens))
+
+    def all_tokens(self, value) -> np.ndarray:
+        """
+        Retorna as linhas que contêm todos os tokens do valor
+
+        Args:
+            value: Valor de consulta
+
+        Returns:
+            Array ordenado de posições
+        """
+        tokens = self._query_tokens(value)
+        if not tokens:
+            return np.array([], dtype=np.int64)
+
+        postings = [self.postings.get(token) for token in tokens]
+        if any(posting is None for posting in postings):
+            return np.array([], dtype=np.int64)
+
+        # Começar pelo token mais raro mantém as interseções pequenas
+        postings.sort(key=len)
+        rows = postings[0]
+        for posting in postings[1:]:
+            if len(rows) == 0:
+                break
+            rows = np.intersect1d(rows, posting, assume_unique=True)
+        return rows
+
+    def overlap(self, value, min_overlap: int) -> np.ndarray:
+        """
+        Retorna as linhas que compartilham ao menos min_overlap tokens com o valor
+
+        Args:
+            value: Valor de consulta
+            min_overlap: Número mínimo de tokens em comum
+
+        Returns:
+            Array ordenado de posições
+        """
+        tokens = self._query_tokens(value)
+        postings = [self.postings[t] for t in tokens if t in self.postings]
+        if not postings or len(postings) < min_overlap:
+            return np.array([], dtype=np.int64)
+
+        rows, counts = np.unique(np.concatenate(postings), return_counts=True)
+        return rows[counts >= min_overlap]
@@ -18,6 +18,9 @@ from typing import List
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
 
 from src.core.engine import DataFinder
+from src.core.estimator import estimate_query_run, format_estimate
+from src.core.explain import format_explain
+from src.core.jobs import format_job_summary, load_job_file, run_job
 
 # Configuração de logging
 logging.basicConfig(
@@ -39,35 +42,34 @@ def parse_arguments() -> argparse.Namespace:
         epilog="""
 Exemplos de uso:
   python -m src.interfaces.cli --source dados/grande.xlsx --query dados/consulta.xlsx --source-column "Cliente" --query-column "Nome" --output resultados.xlsx
+  python -m src.interfaces.cli --source dados/grande.xlsx --query dados/consulta.xlsx --source-column "Cliente" --query-column "Nome" --estimate
+  python -m src.interfaces.cli --source dados/grande.xlsx --query dados/consulta.xlsx --source-column "Cliente" --query-column "Nome" --output resultados.xlsx --explain
+  python -m src.interfaces.cli --job consultas.json --workers 4
   python -m src.interfaces.cli --source dados/vendas.csv --query dados/clientes.xlsx --source-column "ID" --query-column "Código" --operation equals --output resultados.csv
 """,
     )
 
-    # Argumentos obrigatórios
-    parser.add_argument(
-        "--source", required=True, help="Caminho para a planilha fonte (grande)"
-    )
-    parser.add_argument(
-        "--query", required=True, help="Caminho para a planilha de consulta (pequena)"
-    )
+    # Argumentos obrigatórios (exceto com --job)
+    parser.add_argument("--source", help="Caminho para a planilha fonte (grande)")
+    parser.add_argument("--query", help="Caminho para a planilha de consulta (pequena)")
     parser.add_argument(
         "--source-column",
-        required=True,
         help="Nome da coluna na planilha fonte a ser consultada",
     )
     parser.add_argument(
         "--query-column",
-        required=True,
         help="Nome da coluna na planilha de consulta que contém os valores de busca",
     )
     parser.add_argument(
-        "--output", required=True, help="Caminho para o arquivo de saída (resultados)"
+        "--output",
+        help="Caminho para o arquivo de saída (resultados); obrigatório, "
+        "exceto com --estimate",
     )
 
     # Argumentos opcionais
     parser.add_argument(
         "--operation",
-        choices=["equals", "contains", "startswith"],
+        choices=["equals", "contains", "startswith", "similar"],
         default="contains",
         help="Tipo de operação para a consulta (default: contains)",
     )
@@ -76,6 +78,12 @@ Exemplos de uso:
         action="store_true",
         help="Comparação considera maiúsculas/minúsculas",
     )
+    parser.add_argument(
+        "--max-distance",
+        type=int,
+        default=2,
+        help="Distância de edição máxima da operação 'similar' (default: 2)",
+    )
     parser.add_argument(
         "--source-sheet",
         help="Nome da planilha na planilha fonte (para arquivos Excel)",
@@ -93,13 +101,97 @@ Exemplos de uso:
         action="store_true",
         help="Usar extração via XML para planilhas corrompidas",
     )
+    parser.add_argument(
+        "--job",
+        help="Arquivo de lote (JSON ou YAML) com várias consultas sobre a mesma "
+        "fonte; substitui os argumentos de fonte, consulta, critério e saída",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        help="Consultas do arquivo de lote executadas ao mesmo tempo "
+        "(default: quantidade de núcleos)",
+    )
+    parser.add_argument(
+        "--memory-budget",
+        type=int,
+        metavar="MB",
+        help="Memória que a consulta pode usar, em MB (default: fração da "
+        "memória disponível)",
+    )
+    parser.add_argument(
+        "--estimate",
+        action="store_true",
+        help="Apenas estima tempo e memória de cada etapa, lendo os metadados "
+        "e uma amostra das planilhas, e mostra o plano que seria usado",
+    )
+    parser.add_argument(
+        "--explain",
+        "--stats",
+        dest="explain",
+        action="store_true",
+        help="Mostra a estratégia de cada critério (scan, hash join, index "
+        "lookup), os candidatos estimados e reais e o tempo, a memória e os "
+        "contadores de cada etapa",
+    )
     parser.add_argument(
         "--verbose",
         action="store_true",
         help="Mostrar mensagens detalhadas durante a execução",
     )
 
-    return parser.parse_args()
+    args = parser.parse_args()
+    if args.job:
+        if args.estimate:
+            parser.error("--estimate não pode ser usado com --job")
+        return args
+
+    if args.estimate and args.explain:
+        parser.error("--explain não pode ser usado com --estimate")
+
+    missing = [
+        flag
+        for flag, value in (
+            ("--source", args.source),
+            ("--query", args.query),
+            ("--source-column", args.source_column),
+            ("--query-column", args.query_column),
+        )
+        if not value
+    ]
+    if not args.output and not args.estimate:
+        missing.append("--output")
+    if missing:
+        parser.error(f"argumentos obrigatórios: {', '.join(missing)}")
+    return args
+
+
+def run_job_file(args: argparse.Namespace) -> int:
+    """
+    Executa as consultas de um arquivo de lote e exibe o resumo
+
+    Args:
+        args: Argumentos da linha de comando
+
+    Returns:
+        Código de saída (0 se todas as consultas foram executadas)
+    """
+    try:
+        job = load_job_file(args.job)
+        if args.memory_budget:
+            job["memory_budget"] = args.memory_budget * 1024 * 1024
+        summary = run_job(job, max_workers=args.workers)
+    except (OSError, ValueError) as e:
+        logger.error(f"Falha no arquivo de lote {args.job}: {str(e)}")
+        return 1
+
+    print(format_job_summary(summary))
+    if args.explain:
+        for query in summary["queries"]:
+            if query.get("stats"):
+                print(f"\nConsulta '{query['name']}':")
+                print(format_explain(query["stats"]))
+    return 1 if summary["failed"] else 0
 
 
 def main():
@@ -111,8 +203,50 @@ def main():
     if args.verbose:
         logging.getLogger("DataFinder").setLevel(logging.DEBUG)
 
+    if args.job:
+        return run_job_file(args)
+
+    # Orçamento de memória do planejador (em bytes)
+    config = {}
+    if args.memory_budget:
+        config["memory_budget"] = args.memory_budget * 1024 * 1024
+
+    # Com --explain, a memória de cada etapa também é medida (mais lento)
+    if args.explain:
+        config["trace_memory"] = True
+
+    # Colunas a incluir no resultado
+    columns_to_include = None
+    if args.columns:
+        columns_to_include = [col.strip() for col in args.columns.split(",")]
+
+    if args.estimate:
+        try:
+            estimate = estimate_query_run(
+                args.source,
+                args.query,
+                [
+                    {
+                        "query_column": args.query_column,
+                        "source_column": args.source_column,
+                        "operation": args.operation,
+                        "case_sensitive": args.case_sensitive,
+                        "max_distance": args.max_distance,
+                    }
+                ],
+                source_sheet=args.source_sheet,
+                query_sheet=args.query_sheet,
+                columns_to_include=columns_to_include,
+                budget=config.get("memory_budget"),
+            )
+        except Exception as e:
+            logger.error(f"Falha ao estimar a consulta: {str(e)}")
+            return 1
+        print(format_estimate(estimate))
+        return 0
+
     # Criar uma instância do DataFinder
-    finder = DataFinder()
+    finder = DataFinder(config)
 
     # Carregar dados fonte
     if not finder.load_source_data(
@@ -132,13 +266,9 @@ def main():
         source_column=args.source_column,
         operation=args.operation,
         case_sensitive=args.case_sensitive,
+        max_distance=args.max_distance,
     )
 
-    # Colunas a incluir no resultado
-    columns_to_include = None
-    if args.columns:
-        columns_to_include = [col.strip() for col in args.columns.split(",")]
-
     # Executar consulta
     if not finder.execute_query(columns_to_include=columns_to_include):
         logger.error("Falha ao executar consulta")
@@ -162,6 +292,8 @@ def main():
     print(f"Resultados encontrados: {summary['results']['rows']}")
     print(f"Arquivo de saída: {args.output}")
     print("-------------------------")
+    if args.explain:
+        print(format_explain(summary["stats"]))
 
     return 0
 
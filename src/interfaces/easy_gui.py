@@ -19,6 +19,7 @@ import streamlit as st
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
 
 from src.core.engine import DataFinder
+from src.utils.file_handlers.preview import format_row_count, peek_file
 
 # Configuração da página
 st.set_page_config(
@@ -181,11 +182,12 @@ if "finder" not in st.session_state:
     st.session_state["source_data_loaded"] = False
     st.session_state["query_data_loaded"] = False
     st.session_state["results_available"] = False
-    st.session_state["operations"] = ["contains", "equals", "startswith"]
+    st.session_state["operations"] = ["contains", "equals", "startswith", "similar"]
     st.session_state["op_descriptions"] = {
         "contains": "Contém o texto (Ex: buscar 'João' encontra 'Maria João Silva')",
         "equals": "Exatamente igual (Ex: buscar 'João' encontra apenas 'João')",
         "startswith": "Começa com o texto (Ex: buscar 'João' encontra 'João Silva')",
+        "similar": "Parecido, tolerando erros de digitação e acentos (Ex: buscar 'Joao Slva' encontra 'João Silva')",
     }
 
 finder = st.session_state["finder"]
@@ -340,6 +342,30 @@ def main():
                             unsafe_allow_html=True,
                         )
 
+    # Prévia imediata dos arquivos enviados, sem carregar as planilhas inteiras
+    if not (
+        st.session_state["source_data_loaded"] and st.session_state["query_data_loaded"]
+    ):
+        uploads = [("Planilha Grande", source_file), ("Planilha de Consulta", query_file)]
+        for col, (title, upload) in zip(st.columns(2), uploads):
+            if upload is None:
+                continue
+            with col:
+                st.markdown(f"### Prévia: {title} (primeiras 5 linhas)")
+                try:
+                    preview = peek_file(upload, n_rows=5)
+                except Exception as e:
+                    st.caption(f"Prévia indisponível: {str(e)}")
+                    continue
+                st.dataframe(preview["rows"], use_container_width=True)
+                st.caption(
+                    f"Total: {format_row_count(preview)}, {len(preview['columns'])} colunas"
+                )
+                if len(preview["sheets"]) > 1:
+                    st.caption(
+                        f"Mostrando a primeira planilha de: {', '.join(preview['sheets'])}"
+                    )
+
     # Se os dados foram carregados, mostrar próximos passos
     if st.session_state["source_data_loaded"] and st.session_state["query_data_loaded"]:
         # Mostrar prévia das planilhas
@@ -455,9 +481,9 @@ def main():
 
                     if success:
                         st.session_state["results_available"] = True
-                        if len(finder.results) > 0:
+                        if finder.result_count > 0:
                             st.markdown(
-                                f'<div class="success-box">✅ Busca concluída! Encontrados {len(finder.results)} resultados.</div>',
+                                f'<div class="success-box">✅ Busca concluída! Encontrados {finder.result_count} resultados.</div>',
                                 unsafe_allow_html=True,
                             )
                         else:
@@ -20,6 +20,7 @@ import streamlit as st
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..")))
 
 from src.core.engine import DataFinder
+from src.utils.file_handlers.preview import format_row_count, peek_file
 
 # Configuração da página
 st.set_page_config(
@@ -35,7 +36,7 @@ if "finder" not in st.session_state:
     st.session_state["source_data_loaded"] = False
     st.session_state["query_data_loaded"] = False
     st.session_state["results_available"] = False
-    st.session_state["operations"] = ["equals", "contains", "startswith"]
+    st.session_state["operations"] = ["equals", "contains", "startswith", "similar"]
 
 finder = st.session_state["finder"]
 
@@ -122,6 +123,30 @@ def main():
             else:
                 st.warning("Por favor, carregue a planilha de consulta.")
 
+    # Prévia imediata dos arquivos enviados, sem carregar as planilhas inteiras
+    if not (
+        st.session_state["source_data_loaded"] and st.session_state["query_data_loaded"]
+    ):
+        uploads = [("Planilha Fonte", source_file), ("Planilha de Consulta", query_file)]
+        for col, (title, upload) in zip(st.columns(2), uploads):
+            if upload is None:
+                continue
+            with col:
+                st.subheader(f"Prévia: {title}")
+                try:
+                    preview = peek_file(upload, n_rows=10)
+                except Exception as e:
+                    st.warning(f"Não foi possível gerar a prévia: {str(e)}")
+                    continue
+                st.dataframe(preview["rows"])
+                st.text(f"Total: {format_row_count(preview)}")
+                if len(preview["sheets"]) > 1:
+                    st.caption(
+                        f"Prévia da primeira planilha. Planilhas: {', '.join(preview['sheets'])}"
+                    )
+                st.markdown("**Colunas disponíveis:**")
+                st.write(", ".join(map(str, preview["columns"])))
+
     # Seção principal
     if st.session_state["source_data_loaded"] and st.session_state["query_data_loaded"]:
         col1, col2 = st.columns(2)
@@ -221,7 +246,7 @@ def main():
                     if success:
                         st.session_state["results_available"] = True
                         st.success(
-                            f"Consulta executada com sucesso! {len(finder.results)} resultados encontrados."
+                            f"Consulta executada com sucesso! {finder.result_count} resultados encontrados."
                         )
                     else:
                         st.error("Erro ao executar consulta.")
@@ -10,36 +10,148 @@ dos arquivos a serem processados.
 
 import os
 import sys
-from typing import List
+import time
+import argparse
+from typing import List, Optional
 
 # Adicionar o diretório raiz ao path para importações
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from src.utils.logger import get_logger
 from src.utils.performance import monitor_performance
+from src.core.estimator import format_estimate
 from src.core.processador import ProcessadorPlanilhas
 
+# Nomes padrão dos arquivos de entrada
+ARQUIVOS_CLIENTE = [
+    "Avec SalãoVIP - Sistema de Administração (10).xlsx",
+    "Avec SalãoVIP - Sistema de Administração (11).xlsx",
+    "Avec SalãoVIP - Sistema de Administração (12).xlsx",
+    "Avec SalãoVIP - Sistema de Administração (13).xlsx",
+    "Avec SalãoVIP - Sistema de Administração (14).xlsx",
+    "Avec SalãoVIP - Sistema de Administração (15).xlsx",
+]
+ARQUIVO_TELEFONES = "ClientescomTelefone.xlsx"
+
+
+def criar_parser() -> argparse.ArgumentParser:
+    """Cria o parser dos argumentos de linha de comando"""
+    parser = argparse.ArgumentParser(
+        description="Adiciona telefones às planilhas de clientes"
+    )
+    parser.add_argument(
+        "arquivos",
+        nargs="*",
+        help="Planilhas de clientes (padrão: as exportações configuradas)",
+    )
+    parser.add_argument(
+        "--entrada", default="dados/entrada", help="Diretório de entrada"
+    )
+    parser.add_argument("--saida", default="dados/saida", help="Diretório de saída")
+    parser.add_argument(
+        "--telefones", default=ARQUIVO_TELEFONES, help="Planilha de telefones"
+    )
+    parser.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Lê, cruza e grava as planilhas ao mesmo tempo",
+    )
+    parser.add_argument(
+        "--estimate",
+        action="store_true",
+        help="Apenas estima tempo e memória de cada etapa, lendo os metadados "
+        "e uma amostra das planilhas, e mostra o plano que seria usado",
+    )
+    parser.add_argument(
+        "--memoria",
+        type=int,
+        metavar="MB",
+        help="Memória que o lote pode usar, em MB (padrão: fração da memória "
+        "disponível)",
+    )
+    parser.add_argument(
+        "--checkpoint",
+        action="store_true",
+        help="Guarda o progresso do lote em SAIDA/.checkpoint, para que ele "
+        "possa ser retomado com --resume",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Retoma um lote interrompido, reaproveitando os telefones e as "
+        "planilhas já concluídos (implica --checkpoint)",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Processa apenas as planilhas novas ou alteradas do diretório de "
+        "entrada e atualiza a saída no lugar (uma passada, para uso no cron)",
+    )
+    parser.add_argument(
+        "--watch",
+        type=float,
+        metavar="SEGUNDOS",
+        help="Repete o modo incremental a cada SEGUNDOS, até ser interrompido",
+    )
+    return parser
+
 
 @monitor_performance()
-def main():
-    """Função principal do programa"""
+def main(argv: Optional[List[str]] = None):
+    """
+    Função principal do programa
+
+    Args:
+        argv: Argumentos de linha de comando (None usa sys.argv)
+
+    Returns:
+        True se o processamento foi concluído com sucesso
+    """
+    args = criar_parser().parse_args(argv)
     logger = get_logger("main")
     logger.info("Iniciando processamento principal")
 
-    # Nomes dos arquivos de entrada
-    arquivos_cliente = [
-        "Avec SalãoVIP - Sistema de Administração (10).xlsx",
-        "Avec SalãoVIP - Sistema de Administração (11).xlsx",
-        "Avec SalãoVIP - Sistema de Administração (12).xlsx",
-        "Avec SalãoVIP - Sistema de Administração (13).xlsx",
-        "Avec SalãoVIP - Sistema de Administração (14).xlsx",
-        "Avec SalãoVIP - Sistema de Administração (15).xlsx",
-    ]
-    arquivo_telefones = "ClientescomTelefone.xlsx"
-
     # Iniciar processamento
-    processador = ProcessadorPlanilhas()
-    resultado = processador.processar_planilhas(arquivos_cliente, arquivo_telefones)
+    processador = ProcessadorPlanilhas(
+        diretorio_entrada=args.entrada,
+        diretorio_saida=args.saida,
+        pipeline=args.pipeline,
+        orcamento_memoria=args.memoria * 1024 * 1024 if args.memoria else None,
+        # O progresso só é guardado quando pedido (ou para retomar um lote)
+        diretorio_checkpoint=(
+            os.path.join(args.saida, ".checkpoint")
+            if args.checkpoint or args.resume
+            else None
+        ),
+    )
+
+    if args.estimate:
+        try:
+            estimativa = processador.estimar(
+                args.arquivos or ARQUIVOS_CLIENTE, args.telefones
+            )
+        except Exception as e:
+            logger.error(f"Falha ao estimar o processamento: {str(e)}")
+            return False
+        print(format_estimate(estimativa))
+        return True
+
+    if args.watch:
+        logger.info(f"Monitorando {args.entrada} a cada {args.watch} segundos")
+        try:
+            while True:
+                processador.processar_incremental(args.telefones)
+                time.sleep(args.watch)
+        except KeyboardInterrupt:
+            logger.info("Monitoramento interrompido")
+        return True
+
+    if args.incremental:
+        resultado = processador.processar_incremental(args.telefones)
+    else:
+        resultado = processador.processar_planilhas(
+            args.arquivos or ARQUIVOS_CLIENTE, args.telefones, retomar=args.resume
+        )
 
     if resultado:
         logger.info("Processamento concluído com sucesso")
@@ -11,6 +11,7 @@ incluindo manipuladores de arquivo, extratores XML e ferramentas de logging.
 from src.utils.logger import get_logger, enable_debug
 from src.utils.performance import performance_monitor, monitor_performance
 from src.utils.file_handlers import FileHandler, XMLExtractor
+from src.utils.phone_directory import PhoneDirectory
 
 __all__ = [
     "get_logger",
@@ -19,4 +20,5 @@ __all__ = [
     "monitor_performance",
     "FileHandler",
     "XMLExtractor",
+    "PhoneDirectory",
 ]
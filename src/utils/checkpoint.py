@@ -0,0 +1,203 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Pontos de retomada de processamentos em lote
+
+Este módulo guarda, em um diretório, o dicionário de telefones já extraído e
+cada planilha de clientes já enriquecida, assim que ficam prontos. Se o lote
+for interrompido (ex. falta de memória ao gravar a saída), uma nova execução
+com a mesma configuração reaproveita esse trabalho e processa apenas as
+planilhas restantes. Cada item guardado é validado pela assinatura do
+arquivo de origem (tamanho, data e hash), de modo que arquivos alterados
+entre as execuções são processados de novo.
+"""
+
+import os
+import json
+import shutil
+import pandas as pd
+from typing import Dict, Optional
+
+from src.utils.logger import get_logger
+from src.utils.manifest import ProcessingManifest
+
+# Obtendo o logger para este módulo
+logger = get_logger("utils.checkpoint")
+
+# Versão do formato do estado do lote
+_VERSAO = 2
+
+# Arquivos dentro do diretório de retomada
+_ESTADO = "estado.json"
+_TELEFONES = "telefones.json"
+
+
+class BatchCheckpoint:
+    """
+    Diretório com o trabalho já concluído de um lote
+    """
+
+    def __init__(self, directory: str):
+        """
+        Inicializa o ponto de retomada (nada é lido ou gravado até start)
+
+        Args:
+            directory: Diretório onde os itens concluídos são guardados
+        """
+        self.directory = directory
+        self.config: Dict = {}
+        self.phones: Optional[Dict] = None
+        self.entries: Dict[str, Dict] = {}
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def start(self, config: Dict, resume: bool = False) -> bool:
+        """
+        Começa (ou retoma) um lote
+
+        Args:
+            config: Configuração do lote (arquivos, estratégia etc.); o lote
+                só é retomado se ela for igual à da execução anterior
+            resume: Se False, o trabalho guardado é descartado
+
+        Returns:
+            True se havia trabalho guardado para retomar
+        """
+        if resume:
+            try:
+                with open(self._path(_ESTADO), "r", encoding="utf-8") as f:
+                    state = json.load(f)
+                if state.get("versao") == _VERSAO and state.get("config") == config:
+                    self.config = config
+                    self.phones = state.get("telefones")
+                    self.entries = state.get("arquivos", {})
+                    logger.info(
+                        f"Retomando lote de {self.directory}: "
+                        f"{len(self.entries)} planilhas já concluídas"
+                    )
+                    return True
+                logger.warning("Configuração do lote mudou; recomeçando do início")
+            except FileNotFoundError:
+                logger.info(f"Nenhum lote para retomar em {self.directory}")
+            except (OSError, ValueError) as e:
+                logger.warning(f"Estado do lote ilegível ({str(e)}); recomeçando")
+
+        self.clear()
+        self.config = config
+        self._save_state()
+        return False
+
+    def _save_state(self) -> None:
+        """Grava o estado do lote de forma atômica"""
+        os.makedirs(self.directory, exist_ok=True)
+        temp_path = self._path(f"{_ESTADO}.tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {
+                    "versao": _VERSAO,
+                    "config": self.config,
+                    "telefones": self.phones,
+                    "arquivos": self.entries,
+                },
+                f,
+                ensure_ascii=False,
+                indent=2,
+            )
+        os.replace(temp_path, self._path(_ESTADO))
+
+    @staticmethod
+    def _is_current(path: str, previous: Optional[Dict]) -> bool:
+        """Indica se o arquivo de origem é o mesmo do item guardado"""
+        if not previous or not os.path.exists(path):
+            return False
+        signature = ProcessingManifest.signature(path, previous)
+        return signature["hash"] == previous.get("hash")
+
+    def load_phones(self, path: str) -> Optional[Dict[str, str]]:
+        """
+        Lê o dicionário de telefones guardado
+
+        Args:
+            path: Caminho da planilha de telefones de origem
+
+        Returns:
+            Dicionário nome -> telefone, exatamente como foi extraído, ou None
+            se não houver um dicionário guardado para esta versão da planilha
+        """
+        if not self._is_current(path, self.phones):
+            return None
+        try:
+            with open(self._path(_TELEFONES), "r", encoding="utf-8") as f:
+                dict_telefones = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Telefones guardados ilegíveis: {str(e)}")
+            return None
+        logger.info(f"Telefones retomados do lote ({len(dict_telefones)} contatos)")
+        return dict_telefones
+
+    def save_phones(self, path: str, dict_telefones: Dict[str, str]) -> None:
+        """
+        Guarda o dicionário de telefones extraído, sem alterar nomes ou telefones
+
+        Args:
+            path: Caminho da planilha de telefones de origem
+            dict_telefones: Dicionário nome -> telefone
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        temp_path = self._path(f"{_TELEFONES}.tmp")
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(dict_telefones, f, ensure_ascii=False)
+        os.replace(temp_path, self._path(_TELEFONES))
+        self.phones = ProcessingManifest.signature(path)
+        self._save_state()
+
+    def load_frame(self, name: str, path: str) -> Optional[pd.DataFrame]:
+        """
+        Lê uma planilha já concluída
+
+        Args:
+            name: Nome do arquivo de origem no lote
+            path: Caminho do arquivo de origem
+
+        Returns:
+            DataFrame guardado, ou None se a planilha não foi concluída ou se
+            o arquivo de origem mudou
+        """
+        entry = self.entries.get(name)
+        if not self._is_current(path, entry):
+            return None
+        try:
+            df = pd.read_pickle(self._path(entry["frame"]))
+        except Exception as e:
+            logger.warning(f"Planilha guardada de {name} ilegível: {str(e)}")
+            return None
+        logger.info(f"Planilha {name} retomada do lote ({len(df)} linhas)")
+        return df
+
+    def save_frame(self, name: str, path: str, df: pd.DataFrame) -> None:
+        """
+        Guarda uma planilha concluída
+
+        Args:
+            name: Nome do arquivo de origem no lote
+            path: Caminho do arquivo de origem
+            df: Planilha enriquecida
+        """
+        frame = (
+            self.entries.get(name, {}).get("frame")
+            or f"planilha{len(self.entries)}.pkl"
+        )
+        temp_path = self._path(f"{frame}.tmp")
+        df.to_pickle(temp_path)
+        os.replace(temp_path, self._path(frame))
+        self.entries[name] = {**ProcessingManifest.signature(path), "frame": frame}
+        self._save_state()
+
+    def clear(self) -> None:
+        """Descarta todo o trabalho guardado"""
+        if os.path.isdir(self.directory):
+            shutil.rmtree(self.directory)
+        self.phones = None
+        self.entries = {}
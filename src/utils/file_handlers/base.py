@@ -12,6 +12,7 @@ import pandas as pd
 from typing import Optional, Union
 
 from src.utils.logger import get_logger
+from src.utils.file_handlers.workbook_probe import find_sheet_part
 
 # Obtendo o logger para este módulo
 logger = get_logger("utils.file_handlers.base")
@@ -47,7 +48,8 @@ class FileHandler:
             DataFrame com os dados do arquivo
 
         Raises:
-            ValueError: Se o formato do arquivo não for suportado
+            ValueError: Se o formato do arquivo não for suportado ou a planilha
+                não existir
             FileNotFoundError: Se o arquivo não for encontrado
         """
         if not os.path.exists(file_path):
@@ -61,6 +63,9 @@ class FileHandler:
             if file_type == "csv":
                 return pd.read_csv(file_path)
             elif file_type in ["xlsx", "xls"]:
+                if file_type == "xlsx" and sheet_name is not None:
+                    # Validar o nome da planilha pelos metadados, sem ler os dados
+                    find_sheet_part(file_path, sheet_name)
                 return pd.read_excel(file_path, sheet_name=sheet_name)
             else:
                 logger.error(f"Formato de arquivo não suportado: {file_type}")
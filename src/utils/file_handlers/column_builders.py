@@ -0,0 +1,426 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Construção tipada de colunas a partir do XML de uma planilha
+
+Este módulo decodifica as células de uma planilha XLSX diretamente em
+construtores por coluna. Ao final, cada coluna vira uma série com o tipo
+adequado: inteiros, floats, datas (número serial do Excel com formato de
+data), booleanos ou texto. Colunas formadas apenas por textos compartilhados
+(t="s") são emitidas como categóricas usando os próprios índices da tabela
+de textos, sem criar uma string Python por célula.
+"""
+
+import re
+import zipfile
+import numpy as np
+import pandas as pd
+from defusedxml import ElementTree
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from src.utils.logger import get_logger
+from src.utils.file_handlers.sheet_stream import (
+    DEFAULT_SHEET_PART,
+    column_index,
+    column_letter,
+    item_text,
+    local_name,
+    read_shared_strings,
+)
+
+# Obtendo o logger para este módulo
+logger = get_logger("utils.file_handlers.column_builders")
+
+# Formatos numéricos internos do Excel que representam datas e horas
+_BUILTIN_DATE_FORMATS = frozenset(range(14, 23)) | {45, 46, 47}
+
+# Trechos de um formato que não indicam data (textos entre aspas, cores, escapes)
+_FORMAT_LITERALS = re.compile(r'"[^"]*"|\[[^\]]*\]|\\.')
+
+# Letras da referência de célula ("AB12" -> "AB")
+_COLUMN_REF = re.compile(r"[A-Z]+")
+
+# Origem das datas seriais do Excel (sistema 1900 e sistema 1904)
+_EXCEL_EPOCH = "1899-12-30"
+_EXCEL_EPOCH_1904 = "1904-01-01"
+
+# Maior inteiro representado exatamente em float64
+_MAX_EXACT_INTEGER = 2**53
+
+
+def _is_date_format(format_code: str) -> bool:
+    """Indica se um formato numérico personalizado representa data ou hora"""
+    return bool(re.search(r"[dyhs]", _FORMAT_LITERALS.sub("", format_code.lower())))
+
+
+def read_date_styles(zip_ref: zipfile.ZipFile) -> Set[int]:
+    """
+    Lê os índices de estilo de célula (atributo s) que formatam datas
+
+    Args:
+        zip_ref: Arquivo XLSX aberto
+
+    Returns:
+        Conjunto de índices de cellXfs com formato de data ou hora
+    """
+    if "xl/styles.xml" not in zip_ref.namelist():
+        return set()
+
+    root = ElementTree.fromstring(zip_ref.read("xl/styles.xml"))
+    custom_dates = set()
+    date_styles = set()
+    for element in root:
+        name = local_name(element.tag)
+        if name == "numFmts":
+            for fmt in element:
+                if _is_date_format(fmt.get("formatCode", "")):
+                    custom_dates.add(int(fmt.get("numFmtId", -1)))
+        elif name == "cellXfs":
+            for style, xf in enumerate(element):
+                fmt_id = int(xf.get("numFmtId", 0))
+                if fmt_id in _BUILTIN_DATE_FORMATS or fmt_id in custom_dates:
+                    date_styles.add(style)
+    return date_styles
+
+
+def uses_1904_dates(zip_ref: zipfile.ZipFile) -> bool:
+    """Indica se a pasta de trabalho usa o sistema de datas de 1904"""
+    if "xl/workbook.xml" not in zip_ref.namelist():
+        return False
+    content = zip_ref.read("xl/workbook.xml")
+    return re.search(rb'date1904="(?:1|true)"', content) is not None
+
+
+class ColumnBuilder:
+    """
+    Acumula as células de uma coluna e gera a série tipada
+    """
+
+    def __init__(self):
+        """Inicializa o construtor vazio"""
+        self.rows: List[int] = []
+        self.values: List[str] = []
+        self.kinds: List[str] = []
+        self.date_cells = 0
+
+    def append(self, row: int, kind: str, value: Optional[str], is_date: bool) -> None:
+        """
+        Adiciona uma célula
+
+        Args:
+            row: Posição da linha de dados (a partir de zero)
+            kind: Tipo da célula ("s", "n", "b", "str" ou "e")
+            value: Valor bruto da célula (índice, número ou texto)
+            is_date: Se a célula tem estilo de data
+        """
+        if value is None:
+            return
+        self.rows.append(row)
+        self.values.append(value)
+        self.kinds.append(kind)
+        self.date_cells += is_date
+
+    def build(self, n_rows: int, shared_strings: np.ndarray, date_origin: str):
+        """
+        Gera a série da coluna
+
+        Args:
+            n_rows: Quantidade de linhas de dados
+            shared_strings: Tabela de textos compartilhados
+            date_origin: Data correspondente ao serial 0
+
+        Returns:
+            Série com o tipo inferido para a coluna
+        """
+        rows = np.array(self.rows, dtype=np.int64)
+        kinds = set(self.kinds)
+
+        if kinds == {"s"}:
+            return self._build_categorical(rows, n_rows, shared_strings)
+        if kinds == {"n"}:
+            numbers = np.array(self.values, dtype=np.float64)
+            if self.date_cells == len(rows):
+                return self._build_dates(rows, numbers, n_rows, date_origin)
+            return self._build_numbers(rows, numbers, n_rows)
+        if kinds == {"b"}:
+            values = pd.array([None] * n_rows, dtype="boolean")
+            values[rows] = np.array(self.values) == "1"
+            return pd.Series(values)
+        return self._build_objects(rows, n_rows, shared_strings)
+
+    def _build_categorical(self, rows, n_rows, shared_strings):
+        """Coluna só de textos compartilhados: categórica sobre os índices"""
+        indexes = np.array(self.values, dtype=np.int64)
+        used, codes = np.unique(indexes, return_inverse=True)
+        categories = pd.Index(shared_strings[used])
+        if not categories.is_unique:
+            # Tabelas com textos repetidos: deixar o pandas fatorar os valores
+            return pd.Series(
+                pd.Categorical(self._objects(rows, n_rows, shared_strings))
+            )
+        full_codes = np.full(n_rows, -1, dtype=np.int64)
+        full_codes[rows] = codes
+        return pd.Series(pd.Categorical.from_codes(full_codes, categories))
+
+    def _build_dates(self, rows, numbers, n_rows, date_origin):
+        """Coluna numérica com formato de data: converte o serial do Excel"""
+        serials = np.full(n_rows, np.nan)
+        serials[rows] = numbers
+        return pd.Series(pd.to_datetime(serials, unit="D", origin=date_origin))
+
+    def _build_numbers(self, rows, numbers, n_rows):
+        """Coluna numérica: int64 quando todos os valores são inteiros"""
+        integral = np.all(np.mod(numbers, 1) == 0) and np.all(
+            np.abs(numbers) < _MAX_EXACT_INTEGER
+        )
+        if integral:
+            if len(rows) == n_rows:
+                values = np.empty(n_rows, dtype=np.int64)
+                values[rows] = numbers.astype(np.int64)
+                return pd.Series(values)
+            values = pd.array([None] * n_rows, dtype="Int64")
+            values[rows] = numbers.astype(np.int64)
+            return pd.Series(values)
+        values = np.full(n_rows, np.nan)
+        values[rows] = numbers
+        return pd.Series(values)
+
+    def _objects(self, rows, n_rows, shared_strings) -> np.ndarray:
+        """Valores Python de cada célula, para colunas com tipos misturados"""
+        values = np.full(n_rows, None, dtype=object)
+        for row, kind, value in zip(rows.tolist(), self.kinds, self.values):
+            if kind == "s":
+                values[row] = shared_strings[int(value)]
+            elif kind == "n":
+                number = float(value)
+                values[row] = int(number) if number.is_integer() else number
+            elif kind == "b":
+                values[row] = value == "1"
+            else:
+                values[row] = value
+        return values
+
+    def _build_objects(self, rows, n_rows, shared_strings):
+        """Coluna de texto livre ou com tipos misturados"""
+        return pd.Series(self._objects(rows, n_rows, shared_strings), dtype=object)
+
+
+def _cell_content(cell) -> tuple:
+    """Tipo e valor bruto de uma célula <c>"""
+    cell_type = cell.get("t", "n")
+    for child in cell:
+        name = local_name(child.tag)
+        if name == "is":
+            return "str", item_text(child)
+        if name == "v":
+            if cell_type in ("s", "n", "b"):
+                return cell_type, child.text
+            return "str", child.text
+    return cell_type, None
+
+
+def read_date_context(zip_ref: zipfile.ZipFile) -> Tuple[Set[int], str]:
+    """
+    Lê o que é preciso para reconhecer datas: estilos de data e origem dos seriais
+
+    Args:
+        zip_ref: Arquivo XLSX aberto
+
+    Returns:
+        Tupla (índices de estilo de data, data correspondente ao serial 0)
+    """
+    date_origin = _EXCEL_EPOCH_1904 if uses_1904_dates(zip_ref) else _EXCEL_EPOCH
+    return read_date_styles(zip_ref), date_origin
+
+
+def iter_row_elements(stream) -> Iterator:
+    """
+    Percorre os elementos <row> de um XML de planilha, liberando cada um após o uso
+
+    Args:
+        stream: Arquivo (binário) com o XML da planilha ou de um trecho
+            envolvido em <sheetData>
+
+    Yields:
+        Elementos <row> completos, na ordem do arquivo
+    """
+    parent = None
+    for event, element in ElementTree.iterparse(stream, ("start", "end")):
+        name = local_name(element.tag)
+        if event == "start":
+            if name == "sheetData":
+                parent = element
+            continue
+        if name != "row":
+            continue
+
+        yield element
+
+        # Liberar a linha já processada
+        element.clear()
+        if parent is not None:
+            parent.clear()
+
+
+def iter_cells(row) -> Iterator[Tuple[int, str, Optional[str], int]]:
+    """
+    Percorre as células de um elemento <row>
+
+    Args:
+        row: Elemento <row>
+
+    Yields:
+        Tuplas (índice da coluna, tipo, valor bruto, índice de estilo)
+    """
+    position = 0
+    for cell in row:
+        if local_name(cell.tag) != "c":
+            continue
+        reference = cell.get("r")
+        if reference:
+            column = column_index(_COLUMN_REF.match(reference).group(0))
+        else:
+            column = position
+        position = column + 1
+        kind, value = _cell_content(cell)
+        yield column, kind, value, int(cell.get("s", 0))
+
+
+class RowDecoder:
+    """
+    Decodifica linhas da planilha nos construtores de cada coluna
+    """
+
+    def __init__(
+        self, shared_strings: np.ndarray, date_styles: Set[int], date_origin: str
+    ):
+        """
+        Inicializa o decodificador
+
+        Args:
+            shared_strings: Tabela de textos compartilhados
+            date_styles: Índices de estilo com formato de data
+            date_origin: Data correspondente ao serial 0
+        """
+        self.shared_strings = shared_strings
+        self.date_styles = date_styles
+        self.date_origin = date_origin
+        self.builders: Dict[int, ColumnBuilder] = {}
+        self.n_rows = 0
+
+    def header(self, row) -> Dict[int, str]:
+        """
+        Lê a linha de cabeçalho
+
+        Args:
+            row: Elemento <row> do cabeçalho
+
+        Returns:
+            Dicionário índice da coluna -> rótulo
+        """
+        headers = {}
+        for column, kind, value, _ in iter_cells(row):
+            if value is not None:
+                headers[column] = (
+                    self.shared_strings[int(value)] if kind == "s" else value
+                )
+        return headers
+
+    def add_row(self, row) -> None:
+        """
+        Adiciona uma linha de dados
+
+        Args:
+            row: Elemento <row>
+        """
+        for column, kind, value, style in iter_cells(row):
+            if column not in self.builders:
+                self.builders[column] = ColumnBuilder()
+            self.builders[column].append(
+                self.n_rows, kind, value, style in self.date_styles
+            )
+        self.n_rows += 1
+
+    def build_columns(self) -> Dict[int, pd.Series]:
+        """
+        Gera as séries tipadas das colunas lidas
+
+        Returns:
+            Dicionário índice da coluna -> série
+        """
+        return {
+            column: builder.build(self.n_rows, self.shared_strings, self.date_origin)
+            for column, builder in self.builders.items()
+        }
+
+
+def assemble_frame(
+    headers: Dict[int, str], columns: Dict[int, pd.Series], n_rows: int
+) -> pd.DataFrame:
+    """
+    Monta o DataFrame final a partir do cabeçalho e das colunas tipadas
+
+    Colunas sem cabeçalho recebem a letra da coluna como nome.
+
+    Args:
+        headers: Dicionário índice da coluna -> rótulo
+        columns: Dicionário índice da coluna -> série
+        n_rows: Quantidade de linhas de dados
+
+    Returns:
+        DataFrame com as colunas na ordem da planilha
+    """
+    data = {}
+    for column in sorted(set(headers) | set(columns)):
+        label = str(headers.get(column) or column_letter(column))
+        # Cabeçalhos repetidos seguem a convenção do pandas ("Nome", "Nome.1")
+        base, repeat = label, 0
+        while label in data:
+            repeat += 1
+            label = f"{base}.{repeat}"
+        if column in columns:
+            data[label] = columns[column]
+        else:
+            data[label] = pd.Series(np.full(n_rows, None, dtype=object))
+    return pd.DataFrame(data, index=pd.RangeIndex(n_rows))
+
+
+def read_sheet_frame(
+    file_path: str,
+    sheet_part: str = DEFAULT_SHEET_PART,
+    shared_strings: Optional[np.ndarray] = None,
+    max_rows: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Lê uma planilha XLSX em um DataFrame tipado, direto do XML
+
+    A primeira linha é usada como cabeçalho.
+
+    Args:
+        file_path: Caminho para o arquivo XLSX
+        sheet_part: Caminho da planilha dentro do ZIP
+        shared_strings: Tabela de textos compartilhados (carregada se None)
+        max_rows: Quantidade máxima de linhas de dados a ler
+
+    Returns:
+        DataFrame com uma série tipada por coluna
+    """
+    if shared_strings is None:
+        shared_strings = read_shared_strings(file_path)
+
+    headers = None
+    with zipfile.ZipFile(file_path, "r") as zip_ref:
+        decoder = RowDecoder(shared_strings, *read_date_context(zip_ref))
+        with zip_ref.open(sheet_part) as stream:
+            for row in iter_row_elements(stream):
+                if headers is None:
+                    headers = decoder.header(row)
+                    continue
+                if max_rows is not None and decoder.n_rows >= max_rows:
+                    break
+                decoder.add_row(row)
+
+    df = assemble_frame(headers or {}, decoder.build_columns(), decoder.n_rows)
+    logger.info(f"Lidas {len(df)} linhas e {df.shape[1]} colunas de {sheet_part}")
+    return df
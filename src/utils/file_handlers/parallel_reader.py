@@ -0,0 +1,216 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Leitura paralela de uma única planilha grande
+
+Uma primeira varredura, barata, registra a posição (em bytes, no XML
+descompactado) do início de cada <row>. Com esse índice a planilha é
+dividida em faixas de linhas de tamanho equilibrado, que são decodificadas
+em paralelo por um pool de processos. A tabela de textos compartilhados é
+carregada uma vez e entregue a cada processo na inicialização; as colunas
+de cada faixa são concatenadas na ordem original.
+"""
+
+import io
+import os
+import zipfile
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from defusedxml import ElementTree
+from pandas.api.types import union_categoricals
+from typing import Dict, List, Optional, Set, Tuple
+
+from src.utils.logger import get_logger
+from src.utils.file_handlers.column_builders import (
+    RowDecoder,
+    assemble_frame,
+    iter_row_elements,
+    read_date_context,
+    read_sheet_frame,
+)
+from src.utils.file_handlers.sheet_stream import (
+    DEFAULT_SHEET_PART,
+    index_row_offsets,
+    read_namespace_declarations,
+    read_shared_strings,
+    wrap_rows,
+)
+
+# Obtendo o logger para este módulo
+logger = get_logger("utils.file_handlers.parallel_reader")
+
+# Faixas por processo (mais faixas equilibram melhor linhas de tamanhos diferentes)
+CHUNKS_PER_WORKER = 4
+
+# Abaixo disto por faixa, o custo de distribuir supera o ganho do paralelismo
+MIN_ROWS_PER_CHUNK = 20000
+
+# Estado de cada processo do pool, definido uma vez por _init_worker
+_WORKER_STATE: dict = {}
+
+
+def plan_row_ranges(offsets: np.ndarray, n_chunks: int) -> List[Tuple[int, int]]:
+    """
+    Divide as linhas de dados (após o cabeçalho) em faixas de bytes equilibradas
+
+    Args:
+        offsets: Resultado de index_row_offsets
+        n_chunks: Quantidade desejada de faixas
+
+    Returns:
+        Lista de faixas (primeira linha, linha final exclusiva), contíguas e
+        em ordem, cobrindo as linhas 1 até o fim
+    """
+    n_rows = len(offsets) - 1
+    if n_rows <= 1:
+        return []
+    targets = np.linspace(offsets[1], offsets[-1], max(n_chunks, 1) + 1)
+    bounds = np.searchsorted(offsets[:-1], targets)
+    bounds = np.unique(np.clip(bounds, 1, n_rows))
+    bounds[0], bounds[-1] = 1, n_rows
+    bounds = np.unique(bounds)
+    return [(int(a), int(b)) for a, b in zip(bounds[:-1], bounds[1:])]
+
+
+def _init_worker(
+    shared_strings: np.ndarray,
+    date_styles: Set[int],
+    date_origin: str,
+    declarations: bytes,
+) -> None:
+    """Guarda no processo o contexto comum a todas as faixas"""
+    _WORKER_STATE.update(
+        shared_strings=shared_strings,
+        date_styles=date_styles,
+        date_origin=date_origin,
+        declarations=declarations,
+    )
+
+
+def _parse_rows(payload: bytes) -> Tuple[int, Dict[int, pd.Series]]:
+    """Decodifica uma faixa de linhas (elementos <row> consecutivos) no pool"""
+    state = _WORKER_STATE
+    decoder = RowDecoder(
+        state["shared_strings"], state["date_styles"], state["date_origin"]
+    )
+    stream = io.BytesIO(wrap_rows(payload, state["declarations"]))
+    for row in iter_row_elements(stream):
+        decoder.add_row(row)
+    return decoder.n_rows, decoder.build_columns()
+
+
+def _concat_column(parts: List[pd.Series]) -> pd.Series:
+    """Concatena os pedaços de uma coluna, preservando o tipo quando possível"""
+    filled = [part for part in parts if part.notna().any()]
+    if not filled:
+        return pd.Series(np.full(sum(map(len, parts)), None, dtype=object))
+
+    if all(isinstance(part.dtype, pd.CategoricalDtype) for part in filled):
+        categoricals = [
+            (
+                part.array
+                if isinstance(part.dtype, pd.CategoricalDtype)
+                else pd.Categorical([None] * len(part))
+            )
+            for part in parts
+        ]
+        return pd.Series(union_categoricals(categoricals))
+
+    # Com decimais em algum pedaço a coluna é float64, como na leitura
+    # sequencial (e não Float64, que resultaria de misturar Int64 e float64)
+    numeric = {np.dtype(np.int64), np.dtype(np.float64), pd.Int64Dtype()}
+    dtypes = {part.dtype for part in filled}
+    if np.dtype(np.float64) in dtypes and dtypes <= numeric:
+        return pd.concat([part.astype(np.float64) for part in parts], ignore_index=True)
+
+    # Pedaços vazios assumem o tipo dos demais (int64 vira Int64 por causa dos nulos)
+    if len(dtypes) == 1:
+        target = dtypes.pop()
+        if target == np.int64:
+            target = "Int64"
+        parts = [
+            part if part.notna().any() else part.astype(object).astype(target)
+            for part in parts
+        ]
+    return pd.concat(parts, ignore_index=True)
+
+
+def read_sheet_parallel(
+    file_path: str,
+    sheet_part: str = DEFAULT_SHEET_PART,
+    max_workers: Optional[int] = None,
+    min_rows_per_chunk: int = MIN_ROWS_PER_CHUNK,
+) -> pd.DataFrame:
+    """
+    Lê uma planilha XLSX em um DataFrame tipado, decodificando faixas em paralelo
+
+    Produz o mesmo resultado de read_sheet_frame. Planilhas pequenas (ou sem
+    linhas localizáveis pela varredura) são lidas sequencialmente.
+
+    Args:
+        file_path: Caminho para o arquivo XLSX
+        sheet_part: Caminho da planilha dentro do ZIP
+        max_workers: Quantidade de processos (None usa todos os núcleos)
+        min_rows_per_chunk: Quantidade mínima de linhas por faixa
+
+    Returns:
+        DataFrame com uma série tipada por coluna
+    """
+    workers = max_workers or os.cpu_count() or 1
+    offsets = index_row_offsets(file_path, sheet_part)
+    n_data_rows = max(len(offsets) - 2, 0)
+    n_chunks = min(
+        workers * CHUNKS_PER_WORKER, n_data_rows // max(min_rows_per_chunk, 1)
+    )
+
+    if workers <= 1 or n_chunks < 2:
+        return read_sheet_frame(file_path, sheet_part)
+
+    ranges = plan_row_ranges(offsets, n_chunks)
+    shared_strings = read_shared_strings(file_path)
+    declarations = read_namespace_declarations(file_path, sheet_part)
+    logger.info(
+        f"Lendo {n_data_rows} linhas de {sheet_part} em {len(ranges)} faixas "
+        f"com {workers} processos"
+    )
+
+    with zipfile.ZipFile(file_path, "r") as zip_ref:
+        date_styles, date_origin = read_date_context(zip_ref)
+
+        with zip_ref.open(sheet_part) as stream:
+            stream.read(int(offsets[0]))
+            header_payload = stream.read(int(offsets[1] - offsets[0]))
+            header_row = ElementTree.fromstring(wrap_rows(header_payload, declarations))
+            headers = RowDecoder(shared_strings, date_styles, date_origin).header(
+                header_row[0]
+            )
+
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker,
+                initargs=(shared_strings, date_styles, date_origin, declarations),
+            ) as pool:
+                # As faixas são lidas em sequência e enviadas assim que ficam prontas
+                futures = [
+                    pool.submit(
+                        _parse_rows, stream.read(int(offsets[last] - offsets[first]))
+                    )
+                    for first, last in ranges
+                ]
+                chunks = [future.result() for future in futures]
+
+    n_rows = sum(count for count, _ in chunks)
+    columns = {}
+    for column in sorted(set().union(*(parts for _, parts in chunks))):
+        columns[column] = _concat_column(
+            [
+                parts.get(column, pd.Series(np.full(count, None, dtype=object)))
+                for count, parts in chunks
+            ]
+        )
+
+    df = assemble_frame(headers, columns, n_rows)
+    logger.info(f"Lidas {len(df)} linhas e {df.shape[1]} colunas de {sheet_part}")
+    return df
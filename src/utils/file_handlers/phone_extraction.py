@@ -0,0 +1,230 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Extração de telefones da planilha de contatos
+
+Este módulo concentra a leitura da planilha de telefones usada pelo
+XMLExtractor e por src.utils.extrator_xml. As colunas de nome, telefone fixo e
+celular são identificadas pelo cabeçalho (referência de célula), e cada linha
+é analisada uma única vez por um parser XML, em tempo linear. Linhas que não
+puderem ser lidas são registradas individualmente, sem interromper a extração.
+"""
+
+import re
+import unicodedata
+import numpy as np
+from defusedxml import ElementTree
+from typing import Dict, List, Optional, Tuple
+
+from src.utils.logger import get_logger
+from src.utils.file_handlers.sheet_stream import (
+    DEFAULT_SHEET_PART,
+    column_index,
+    column_letter,
+    item_text,
+    iter_row_fragments,
+    local_name,
+    read_namespace_declarations,
+    read_shared_strings,
+    wrap_rows,
+)
+
+# Obtendo o logger para este módulo
+logger = get_logger("utils.file_handlers.phone_extraction")
+
+# Palavras do cabeçalho que identificam cada coluna (sem acentos, minúsculas)
+_NAME_LABELS = frozenset({"nome", "cliente", "contato", "razao"})
+_LANDLINE_LABELS = frozenset({"telefone", "fone", "fixo", "tel"})
+_MOBILE_LABELS = frozenset({"celular", "cel", "movel", "whatsapp"})
+
+# Posições usadas quando o cabeçalho não é reconhecido (layout histórico)
+LEGACY_COLUMNS = {"nome": "A", "fixo": "D", "celular": "E"}
+
+# Letras da referência de célula ("AB12" -> "AB")
+_COLUMN_REF = re.compile(r"[A-Z]+")
+
+# Quantidade de falhas detalhadas no log
+_MAX_LOGGED_FAILURES = 5
+
+
+def _label_words(label: Optional[str]) -> set:
+    """Palavras de um rótulo de cabeçalho, sem acentos e em minúsculas"""
+    text = unicodedata.normalize("NFKD", label or "")
+    text = text.encode("ascii", "ignore").decode("ascii").lower()
+    return set(re.findall(r"[a-z]+", text))
+
+
+class PhoneRowParser:
+    """
+    Leitor das linhas da planilha de telefones
+    """
+
+    def __init__(
+        self, shared_strings: Optional[np.ndarray] = None, namespaces: bytes = b""
+    ):
+        """
+        Inicializa o leitor com o layout histórico de colunas
+
+        Args:
+            shared_strings: Tabela de textos compartilhados da pasta de trabalho
+            namespaces: Declarações de namespace da raiz da planilha
+        """
+        self.shared_strings = (
+            shared_strings if shared_strings is not None else np.array([], dtype=object)
+        )
+        self.namespaces = namespaces
+        self.columns = dict(LEGACY_COLUMNS)
+
+    def read_cells(self, fragment: bytes) -> Dict[str, Optional[str]]:
+        """
+        Lê os valores das células de uma linha
+
+        Args:
+            fragment: Bytes do elemento <row>
+
+        Returns:
+            Dicionário letra da coluna -> valor em texto
+
+        Raises:
+            ParseError: Se o XML da linha estiver malformado
+            IndexError: Se a linha referenciar um texto compartilhado inexistente
+        """
+        row = ElementTree.fromstring(wrap_rows(fragment, self.namespaces))[0]
+        cells = {}
+        position = 0
+        for cell in row:
+            if local_name(cell.tag) != "c":
+                continue
+            reference = cell.get("r")
+            if reference:
+                column = _COLUMN_REF.match(reference).group(0)
+            else:
+                column = column_letter(position)
+            position = column_index(column) + 1
+            cells[column] = self._cell_value(cell)
+        return cells
+
+    def _cell_value(self, cell) -> Optional[str]:
+        """Valor de uma célula em texto, resolvendo textos compartilhados"""
+        cell_type = cell.get("t")
+        value = None
+        for child in cell:
+            name = local_name(child.tag)
+            if name == "is":
+                return item_text(child)
+            if name == "v":
+                value = child.text
+        if cell_type == "s" and value is not None:
+            return self.shared_strings[int(value)]
+        return value
+
+    def resolve_columns(self, header: bytes) -> bool:
+        """
+        Identifica as colunas de nome, fixo e celular a partir do cabeçalho
+
+        Args:
+            header: Bytes da primeira linha da planilha
+
+        Returns:
+            True se o cabeçalho foi reconhecido (a linha não contém dados);
+            False se o layout histórico foi mantido
+        """
+        labels = {
+            column: _label_words(value)
+            for column, value in self.read_cells(header).items()
+        }
+
+        def _find(words: frozenset, excluded: set) -> Optional[str]:
+            for column, label in labels.items():
+                if column not in excluded and label & words:
+                    return column
+            return None
+
+        celular = _find(_MOBILE_LABELS, set())
+        fixo = _find(_LANDLINE_LABELS, {celular})
+        nome = _find(_NAME_LABELS, {celular, fixo})
+
+        if nome is None or (fixo is None and celular is None):
+            logger.warning(
+                "Cabeçalho da planilha de telefones não reconhecido; usando as "
+                f"colunas {LEGACY_COLUMNS}"
+            )
+            return False
+
+        self.columns = {"nome": nome, "fixo": fixo, "celular": celular}
+        logger.info(f"Colunas da planilha de telefones: {self.columns}")
+        return True
+
+    def parse_row(self, fragment: bytes) -> Optional[Tuple[str, str]]:
+        """
+        Extrai o contato de uma linha
+
+        O celular tem prioridade; sem celular, é usado o telefone fixo.
+
+        Args:
+            fragment: Bytes do elemento <row>
+
+        Returns:
+            Tupla (nome, telefone) ou None se a linha não tiver contato com telefone
+        """
+        cells = self.read_cells(fragment)
+        nome = cells.get(self.columns["nome"])
+        telefone = cells.get(self.columns["celular"]) or cells.get(self.columns["fixo"])
+        if nome and nome.strip() and telefone:
+            return nome, telefone
+        return None
+
+
+def extract_phones(
+    file_path: str, sheet_part: str = DEFAULT_SHEET_PART
+) -> Tuple[Dict[str, str], List[Tuple[int, str]]]:
+    """
+    Extrai o dicionário nome -> telefone da planilha de telefones
+
+    Args:
+        file_path: Caminho para o arquivo Excel com os números de telefone
+        sheet_part: Caminho da planilha dentro do ZIP
+
+    Returns:
+        Tupla com o dicionário (nomes em lowercase; nomes repetidos ficam com o
+        último telefone) e a lista de falhas (número da linha, erro)
+    """
+    parser = PhoneRowParser(
+        read_shared_strings(file_path),
+        read_namespace_declarations(file_path, sheet_part),
+    )
+    dict_telefones = {}
+    failures = []
+
+    for number, fragment in enumerate(iter_row_fragments(file_path, sheet_part), 1):
+        try:
+            if number == 1 and parser.resolve_columns(fragment):
+                continue
+            contact = parser.parse_row(fragment)
+        except Exception as e:
+            failures.append((number, str(e)))
+            continue
+
+        if contact:
+            nome, telefone = contact
+            dict_telefones[nome.strip().lower()] = telefone
+
+    log_failures(failures)
+    logger.info(f"Extraídos {len(dict_telefones)} contatos com telefones.")
+    return dict_telefones, failures
+
+
+def log_failures(failures: List[Tuple[int, str]]) -> None:
+    """
+    Registra no log as linhas que não puderam ser lidas
+
+    Args:
+        failures: Lista de (número da linha, erro)
+    """
+    if not failures:
+        return
+    details = "; ".join(
+        f"linha {number}: {error}" for number, error in failures[:_MAX_LOGGED_FAILURES]
+    )
+    logger.warning(f"{len(failures)} linhas não puderam ser lidas ({details})")
@@ -0,0 +1,201 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Prévia rápida de planilhas grandes
+
+Este módulo lê apenas o necessário para mostrar uma planilha: o cabeçalho,
+uma janela de linhas (as primeiras N ou as linhas i..j) e a quantidade
+aproximada de linhas, obtida da tag <dimension> ou estimada pelo tamanho
+das linhas lidas. A planilha nunca é carregada por inteiro, de modo que o
+tempo da prévia não depende do tamanho do arquivo.
+"""
+
+import os
+import zipfile
+import numpy as np
+import pandas as pd
+from defusedxml import ElementTree
+from typing import Dict
+
+from src.utils.logger import get_logger
+from src.utils.file_handlers.column_builders import (
+    RowDecoder,
+    assemble_frame,
+    iter_cells,
+    read_date_context,
+)
+from src.utils.file_handlers.sheet_stream import (
+    DEFAULT_SHEET_PART,
+    index_row_offsets,
+    iter_row_fragments,
+    read_namespace_declarations,
+    read_shared_strings,
+    wrap_rows,
+)
+from src.utils.file_handlers.workbook_probe import read_dimension, sheet_parts
+
+# Obtendo o logger para este módulo
+logger = get_logger("utils.file_handlers.preview")
+
+# Linhas mostradas quando nenhuma janela é indicada
+DEFAULT_PREVIEW_ROWS = 10
+
+
+def peek_sheet(
+    file_path,
+    sheet_part: str = DEFAULT_SHEET_PART,
+    start: int = 0,
+    stop: int = DEFAULT_PREVIEW_ROWS,
+    count_rows: bool = False,
+) -> Dict:
+    """
+    Lê o cabeçalho e uma janela de linhas de uma planilha XLSX
+
+    Só as linhas até `stop` são percorridas, e só as da janela são
+    decodificadas; a tabela de textos compartilhados é lida apenas até o
+    maior índice usado na janela.
+
+    Args:
+        file_path: Caminho (ou arquivo aberto) do XLSX
+        sheet_part: Caminho da planilha dentro do ZIP
+        start: Primeira linha de dados da janela (a partir de zero)
+        stop: Linha de dados final da janela (exclusiva)
+        count_rows: Se True, conta as linhas com o índice de posições (lê o
+            XML inteiro, sem decodificar); senão, a contagem é aproximada
+
+    Returns:
+        Dicionário com "columns" (cabeçalho), "rows" (DataFrame da janela,
+        indexado pela posição das linhas), "row_count" (linhas de dados) e
+        "row_count_exact"
+    """
+    header = None
+    window = []
+    data_rows = 0
+    data_bytes = 0
+    exhausted = True
+    for fragment in iter_row_fragments(file_path, sheet_part):
+        if header is None:
+            header = fragment
+            continue
+        if data_rows >= stop:
+            exhausted = False
+            break
+        if data_rows >= start:
+            window.append(fragment)
+        data_rows += 1
+        data_bytes += len(fragment)
+
+    declarations = read_namespace_declarations(file_path, sheet_part)
+    rows = list(
+        ElementTree.fromstring(
+            wrap_rows(b"".join([header or b""] + window), declarations)
+        )
+    )
+
+    # Ler os textos compartilhados só até o maior índice usado
+    shared_indexes = [
+        int(value)
+        for row in rows
+        for _, kind, value, _ in iter_cells(row)
+        if kind == "s" and value is not None
+    ]
+    shared_strings = (
+        read_shared_strings(file_path, limit=max(shared_indexes) + 1)
+        if shared_indexes
+        else np.array([], dtype=object)
+    )
+
+    with zipfile.ZipFile(file_path, "r") as zip_ref:
+        decoder = RowDecoder(shared_strings, *read_date_context(zip_ref))
+        sheet_size = zip_ref.getinfo(sheet_part).file_size
+
+    headers = decoder.header(rows[0]) if header is not None else {}
+    for row in rows[1:]:
+        decoder.add_row(row)
+    df = assemble_frame(headers, decoder.build_columns(), decoder.n_rows)
+    df.index = pd.RangeIndex(start, start + len(df))
+
+    if exhausted:
+        row_count, exact = data_rows, True
+    elif count_rows:
+        row_count, exact = (
+            max(len(index_row_offsets(file_path, sheet_part)) - 2, 0),
+            True,
+        )
+    else:
+        dimension = read_dimension(file_path, sheet_part)
+        if dimension is not None and dimension[0] - 1 >= data_rows:
+            row_count = dimension[0] - 1
+        elif data_bytes:
+            # Sem dimensão confiável: estimar pelo tamanho médio das linhas lidas
+            row_count = max(int(sheet_size * data_rows / data_bytes), data_rows)
+        else:
+            row_count = data_rows
+        exact = False
+
+    return {
+        "columns": df.columns.tolist(),
+        "rows": df,
+        "row_count": row_count,
+        "row_count_exact": exact,
+    }
+
+
+def peek_file(file, n_rows: int = DEFAULT_PREVIEW_ROWS) -> Dict:
+    """
+    Prévia das primeiras linhas de um arquivo de dados (XLSX, XLS ou CSV)
+
+    Arquivos XLSX usam peek_sheet na primeira planilha; os demais formatos
+    leem apenas as primeiras linhas com o pandas.
+
+    Args:
+        file: Caminho do arquivo ou arquivo aberto com atributo `name`
+            (ex. upload do Streamlit)
+        n_rows: Quantidade de linhas da prévia
+
+    Returns:
+        Dicionário no formato de peek_sheet ("row_count" é None quando a
+        contagem não está disponível sem ler o arquivo), com "sheets" (nomes
+        das planilhas de um XLSX; vazia nos demais formatos)
+    """
+    name = file if isinstance(file, str) else getattr(file, "name", "")
+    extension = os.path.splitext(name)[1].lower()
+
+    if extension == ".xlsx":
+        parts = sheet_parts(file)
+        sheet_part = next(iter(parts.values()), DEFAULT_SHEET_PART)
+        preview = peek_sheet(file, sheet_part, stop=n_rows)
+        preview["sheets"] = list(parts)
+        return preview
+
+    if extension == ".csv":
+        df = pd.read_csv(file, nrows=n_rows)
+    else:
+        df = pd.read_excel(file, nrows=n_rows)
+    if hasattr(file, "seek"):
+        file.seek(0)
+    return {
+        "columns": df.columns.tolist(),
+        "rows": df,
+        "row_count": None,
+        "row_count_exact": False,
+        "sheets": [],
+    }
+
+
+def format_row_count(preview: Dict) -> str:
+    """
+    Descreve a quantidade de linhas de uma prévia para exibição
+
+    Args:
+        preview: Resultado de peek_sheet ou peek_file
+
+    Returns:
+        Texto como "1200 linhas" ou "cerca de 1200 linhas"
+    """
+    if preview["row_count"] is None:
+        return "total de linhas disponível após o carregamento"
+    if preview["row_count_exact"]:
+        return f"{preview['row_count']} linhas"
+    return f"cerca de {preview['row_count']} linhas"
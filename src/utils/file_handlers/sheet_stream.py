@@ -0,0 +1,331 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Leitura em streaming das linhas de uma planilha XLSX
+
+Este módulo lê o XML de uma planilha diretamente do arquivo ZIP, em blocos,
+sem extrair o arquivo para o disco nem carregar o XML inteiro na memória.
+Cada linha (<row>...</row>) é entregue como um fragmento de bytes, o que
+permite calcular hashes por linha e analisar apenas as linhas necessárias.
+"""
+
+import re
+import hashlib
+import zipfile
+import numpy as np
+from defusedxml import ElementTree
+from typing import Iterator, List, Optional, Tuple
+
+from src.utils.logger import get_logger
+
+# Obtendo o logger para este módulo
+logger = get_logger("utils.file_handlers.sheet_stream")
+
+# Planilha usada quando nenhuma outra é indicada
+DEFAULT_SHEET_PART = "xl/worksheets/sheet1.xml"
+
+# Tabela de textos compartilhados da pasta de trabalho
+SHARED_STRINGS_PART = "xl/sharedStrings.xml"
+
+# Tamanho dos blocos lidos do arquivo ZIP
+CHUNK_SIZE = 1024 * 1024
+
+# Início de um elemento <row> (com ou sem atributos)
+_ROW_START = re.compile(rb"<row[\s>/]")
+
+# Referências de célula/linha, que mudam quando linhas são inseridas ou ordenadas
+_REFERENCE_ATTRIBUTE = re.compile(rb'\sr="[A-Z]*\d+"')
+
+# Valor de uma célula de texto compartilhado (t="s"): abertura, índice e fechamento
+_SHARED_STRING_VALUE = re.compile(rb'(<c\b[^>]*\st="s"[^>]*>\s*<v>)(\d+)(</v>)')
+
+# Bytes mantidos entre blocos na varredura de posições (cobre "</sheetData>")
+_SCAN_OVERLAP = 16
+
+# Declarações de namespace do elemento raiz (xmlns="..." e xmlns:x14ac="...")
+_NAMESPACE_DECLARATION = re.compile(rb'\sxmlns(?::[\w.-]+)?="[^"]*"')
+
+
+def iter_row_fragments(
+    file_path: str, sheet_part: str = DEFAULT_SHEET_PART, chunk_size: int = CHUNK_SIZE
+) -> Iterator[bytes]:
+    """
+    Percorre as linhas de uma planilha, uma por vez, em tempo linear
+
+    Args:
+        file_path: Caminho para o arquivo XLSX
+        sheet_part: Caminho da planilha dentro do ZIP
+        chunk_size: Tamanho dos blocos lidos do ZIP
+
+    Yields:
+        Bytes de cada elemento <row> completo, na ordem do arquivo
+    """
+    with zipfile.ZipFile(file_path, "r") as zip_ref:
+        with zip_ref.open(sheet_part) as stream:
+            buffer = b""
+            while True:
+                chunk = stream.read(chunk_size)
+                buffer += chunk
+                position = 0
+
+                while True:
+                    match = _ROW_START.search(buffer, position)
+                    if match is None:
+                        # Preservar um possível "<row" cortado no fim do bloco
+                        position = max(position, len(buffer) - 4)
+                        break
+
+                    start = match.start()
+                    tag_end = buffer.find(b">", start)
+                    if tag_end == -1:
+                        position = start
+                        break
+
+                    if buffer[tag_end - 1 : tag_end] == b"/":
+                        end = tag_end + 1
+                    else:
+                        close = buffer.find(b"</row>", tag_end)
+                        if close == -1:
+                            position = start
+                            break
+                        end = close + len(b"</row>")
+
+                    yield buffer[start:end]
+                    position = end
+
+                buffer = buffer[position:]
+                if not chunk:
+                    break
+
+
+def read_sheet_head(file_path: str, sheet_part: str = DEFAULT_SHEET_PART) -> bytes:
+    """
+    Lê apenas o início do XML da planilha, até o começo de <sheetData>
+
+    O trecho contém o elemento raiz, <dimension> e demais metadados.
+
+    Args:
+        file_path: Caminho (ou arquivo aberto) do XLSX
+        sheet_part: Caminho da planilha dentro do ZIP
+
+    Returns:
+        Bytes anteriores a <sheetData>
+    """
+    head = b""
+    with zipfile.ZipFile(file_path, "r") as zip_ref:
+        with zip_ref.open(sheet_part) as stream:
+            while b"<sheetData" not in head:
+                chunk = stream.read(64 * 1024)
+                if not chunk:
+                    break
+                head += chunk
+    return head.split(b"<sheetData", 1)[0]
+
+
+def read_namespace_declarations(
+    file_path: str, sheet_part: str = DEFAULT_SHEET_PART
+) -> bytes:
+    """
+    Lê as declarações de namespace do elemento raiz da planilha
+
+    Fragmentos de linha analisados isoladamente precisam delas: o Excel grava
+    atributos com prefixo (ex. x14ac:dyDescent) declarados apenas na raiz.
+
+    Args:
+        file_path: Caminho para o arquivo XLSX
+        sheet_part: Caminho da planilha dentro do ZIP
+
+    Returns:
+        Bytes com as declarações (cada uma precedida de espaço)
+    """
+    head = read_sheet_head(file_path, sheet_part)
+    return b"".join(_NAMESPACE_DECLARATION.findall(head))
+
+
+def wrap_rows(payload: bytes, declarations: bytes = b"") -> bytes:
+    """
+    Envolve fragmentos de linha em um <sheetData> com as declarações de namespace
+
+    Args:
+        payload: Um ou mais elementos <row> consecutivos
+        declarations: Resultado de read_namespace_declarations
+
+    Returns:
+        Documento XML que pode ser analisado isoladamente
+    """
+    return b"<sheetData" + declarations + b">" + payload + b"</sheetData>"
+
+
+def index_row_offsets(
+    file_path: str, sheet_part: str = DEFAULT_SHEET_PART, chunk_size: int = CHUNK_SIZE
+) -> np.ndarray:
+    """
+    Registra a posição do início de cada linha no XML da planilha
+
+    Args:
+        file_path: Caminho para o arquivo XLSX
+        sheet_part: Caminho da planilha dentro do ZIP
+        chunk_size: Tamanho dos blocos lidos do ZIP
+
+    Returns:
+        Array int64 com as posições de cada <row> seguidas da posição de
+        </sheetData> (tamanho = linhas + 1; vazio se não houver linhas)
+    """
+    offsets: List[int] = []
+    end = None
+    base = 0
+    buffer = b""
+
+    with zipfile.ZipFile(file_path, "r") as zip_ref:
+        with zip_ref.open(sheet_part) as stream:
+            while True:
+                chunk = stream.read(chunk_size)
+                buffer += chunk
+                # Só o trecho com espaço suficiente depois é varrido agora
+                limit = len(buffer) if not chunk else len(buffer) - _SCAN_OVERLAP
+                if limit > 0:
+                    offsets.extend(
+                        base + match.start()
+                        for match in _ROW_START.finditer(buffer)
+                        if match.start() < limit
+                    )
+                    close = buffer.find(b"</sheetData>", 0, limit + 12)
+                    if close != -1 and end is None:
+                        end = base + close
+                    buffer = buffer[limit:]
+                    base += limit
+                if not chunk:
+                    break
+
+    if not offsets:
+        return np.zeros(0, dtype=np.int64)
+    offsets.append(end if end is not None else base + len(buffer))
+    return np.array(offsets, dtype=np.int64)
+
+
+def row_content_hash(
+    fragment: bytes, shared_strings: Optional[np.ndarray] = None
+) -> int:
+    """
+    Calcula o hash de conteúdo de uma linha, ignorando as referências de célula
+
+    Linhas que apenas mudaram de posição (r="12" -> r="13") mantêm o hash.
+    Com a tabela de textos compartilhados, os índices das células t="s" são
+    trocados pelos textos, de modo que a linha mantém o hash quando o Excel
+    regrava a tabela (ex. ao incluir um contato) e os índices mudam.
+
+    Args:
+        fragment: Bytes do elemento <row>
+        shared_strings: Tabela de textos compartilhados (ver read_shared_strings)
+
+    Returns:
+        Hash de 64 bits (inteiro sem sinal)
+    """
+    content = _REFERENCE_ATTRIBUTE.sub(b"", fragment)
+    if shared_strings is not None and len(shared_strings):
+
+        def resolve(match: "re.Match") -> bytes:
+            index = int(match.group(2))
+            if index >= len(shared_strings):
+                return match.group(0)
+            text = str(shared_strings[index]).encode("utf-8")
+            return match.group(1) + text + match.group(3)
+
+        content = _SHARED_STRING_VALUE.sub(resolve, content)
+    return int.from_bytes(hashlib.blake2b(content, digest_size=8).digest(), "little")
+
+
+def iter_hashed_rows(
+    file_path: str,
+    sheet_part: str = DEFAULT_SHEET_PART,
+    shared_strings: Optional[np.ndarray] = None,
+) -> Iterator[Tuple[int, bytes]]:
+    """
+    Percorre as linhas de uma planilha junto com o hash de conteúdo de cada uma
+
+    Args:
+        file_path: Caminho para o arquivo XLSX
+        sheet_part: Caminho da planilha dentro do ZIP
+        shared_strings: Tabela de textos compartilhados; se informada, o hash
+            usa os textos das células t="s" em vez dos índices
+
+    Yields:
+        Tuplas (hash de conteúdo, bytes do elemento <row>)
+    """
+    for fragment in iter_row_fragments(file_path, sheet_part):
+        yield row_content_hash(fragment, shared_strings), fragment
+
+
+def local_name(tag: str) -> str:
+    """Remove o namespace de uma tag XML ("{ns}row" -> "row")"""
+    return tag.rsplit("}", 1)[-1]
+
+
+def read_shared_strings(file_path: str, limit: Optional[int] = None) -> np.ndarray:
+    """
+    Carrega a tabela de textos compartilhados (xl/sharedStrings.xml) uma única vez
+
+    Células com t="s" guardam apenas o índice do texto nesta tabela.
+
+    Args:
+        file_path: Caminho para o arquivo XLSX
+        limit: Quantidade máxima de textos a ler (prévias só precisam dos
+            primeiros índices)
+
+    Returns:
+        Array de objetos com os textos, na ordem dos índices (vazio se a
+        pasta de trabalho não tiver a tabela)
+    """
+    strings = []
+    with zipfile.ZipFile(file_path, "r") as zip_ref:
+        if SHARED_STRINGS_PART not in zip_ref.namelist():
+            return np.array([], dtype=object)
+
+        with zip_ref.open(SHARED_STRINGS_PART) as stream:
+            for _, element in ElementTree.iterparse(stream, events=("end",)):
+                if local_name(element.tag) != "si":
+                    continue
+                strings.append(item_text(element))
+                element.clear()
+                if limit is not None and len(strings) >= limit:
+                    break
+
+    logger.debug(f"Carregados {len(strings)} textos compartilhados de {file_path}")
+    return np.array(strings, dtype=object)
+
+
+def item_text(item) -> str:
+    """
+    Texto de um item <si> ou <is>, concatenando trechos formatados (<r><t>)
+
+    Anotações fonéticas (<rPh>) são ignoradas.
+    """
+    parts = []
+    for child in item:
+        name = local_name(child.tag)
+        if name == "t":
+            parts.append(child.text or "")
+        elif name == "r":
+            parts.extend(
+                node.text or "" for node in child if local_name(node.tag) == "t"
+            )
+    return "".join(parts)
+
+
+def column_index(column: str) -> int:
+    """Converte a letra da coluna em índice a partir de zero ("A" -> 0, "AA" -> 26)"""
+    index = 0
+    for letter in column:
+        index = index * 26 + ord(letter) - ord("A") + 1
+    return index - 1
+
+
+def column_letter(index: int) -> str:
+    """Converte o índice da coluna (a partir de zero) na letra ("A", ..., "AA")"""
+    letters = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(ord("A") + remainder) + letters
+    return letters
@@ -0,0 +1,231 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Sondagem dos metadados de uma pasta de trabalho XLSX
+
+Este módulo lê apenas workbook.xml, as relações da pasta de trabalho e, de
+cada planilha, a tag <dimension> e a primeira linha. Com isso obtém os nomes
+das planilhas, o arquivo de cada uma dentro do ZIP, a quantidade de linhas e
+colunas e o cabeçalho em milissegundos, para planejar e validar a leitura
+antes de qualquer carregamento completo.
+"""
+
+import re
+import posixpath
+import zipfile
+import numpy as np
+from defusedxml import ElementTree
+from typing import Dict, List, Optional, Tuple
+
+from src.utils.logger import get_logger
+from src.utils.file_handlers.column_builders import RowDecoder, iter_cells
+from src.utils.file_handlers.sheet_stream import (
+    DEFAULT_SHEET_PART,
+    column_index,
+    iter_row_fragments,
+    local_name,
+    read_namespace_declarations,
+    read_shared_strings,
+    read_sheet_head,
+    wrap_rows,
+)
+
+# Obtendo o logger para este módulo
+logger = get_logger("utils.file_handlers.workbook_probe")
+
+# Área usada da planilha (<dimension ref="A1:E1000"/>)
+_DIMENSION = re.compile(
+    rb'<dimension\s+ref="\$?([A-Z]+)\$?(\d+)(?::\$?([A-Z]+)\$?(\d+))?"'
+)
+
+# Blocos pequenos: o cabeçalho costuma estar nos primeiros kilobytes
+_HEADER_CHUNK_SIZE = 64 * 1024
+
+
+def sheet_parts(file_path) -> Dict[str, str]:
+    """
+    Relaciona o nome de cada planilha ao seu arquivo dentro do ZIP
+
+    Usa workbook.xml e as relações da pasta de trabalho; o sheetId não é
+    usado para adivinhar o arquivo, pois não corresponde a ele depois que
+    planilhas são reordenadas ou excluídas.
+
+    Args:
+        file_path: Caminho (ou arquivo aberto) do XLSX
+
+    Returns:
+        Dicionário nome da planilha -> caminho no ZIP, na ordem da pasta
+    """
+    with zipfile.ZipFile(file_path, "r") as zip_ref:
+        names = set(zip_ref.namelist())
+        if "xl/workbook.xml" not in names:
+            return {"Sheet1": DEFAULT_SHEET_PART} if DEFAULT_SHEET_PART in names else {}
+
+        targets = {}
+        if "xl/_rels/workbook.xml.rels" in names:
+            rels = ElementTree.fromstring(zip_ref.read("xl/_rels/workbook.xml.rels"))
+            for rel in rels:
+                target = rel.get("Target", "")
+                if target.startswith("/"):
+                    target = target.lstrip("/")
+                else:
+                    target = posixpath.normpath(posixpath.join("xl", target))
+                targets[rel.get("Id")] = target
+
+        workbook = ElementTree.fromstring(zip_ref.read("xl/workbook.xml"))
+
+    parts = {}
+    for element in workbook.iter():
+        if local_name(element.tag) != "sheet":
+            continue
+        rel_id = next(
+            (v for k, v in element.attrib.items() if local_name(k) == "id"), None
+        )
+        parts[element.get("name")] = targets.get(
+            rel_id, f"xl/worksheets/sheet{element.get('sheetId')}.xml"
+        )
+    return parts
+
+
+def read_dimension(
+    file_path, sheet_part: str = DEFAULT_SHEET_PART
+) -> Optional[Tuple[int, int]]:
+    """
+    Lê a área usada declarada na planilha (<dimension>)
+
+    Args:
+        file_path: Caminho (ou arquivo aberto) do XLSX
+        sheet_part: Caminho da planilha dentro do ZIP
+
+    Returns:
+        Tupla (linhas, colunas) incluindo o cabeçalho, ou None se a planilha
+        não declarar a dimensão
+    """
+    match = _DIMENSION.search(read_sheet_head(file_path, sheet_part))
+    if not match:
+        return None
+    first_col, first_row, last_col, last_row = (
+        group.decode("ascii") if group else None for group in match.groups()
+    )
+    if last_col is None:
+        last_col, last_row = first_col, first_row
+    rows = int(last_row) - int(first_row) + 1
+    columns = column_index(last_col) - column_index(first_col) + 1
+    return rows, columns
+
+
+def read_header(file_path, sheet_part: str = DEFAULT_SHEET_PART) -> List[str]:
+    """
+    Lê o cabeçalho (primeira linha) de uma planilha
+
+    Só a primeira linha é localizada no XML, e a tabela de textos
+    compartilhados é lida apenas até o maior índice usado nela.
+
+    Args:
+        file_path: Caminho (ou arquivo aberto) do XLSX
+        sheet_part: Caminho da planilha dentro do ZIP
+
+    Returns:
+        Rótulos do cabeçalho na ordem das colunas (vazia se a planilha não
+        tiver linhas)
+    """
+    fragments = iter_row_fragments(file_path, sheet_part, _HEADER_CHUNK_SIZE)
+    try:
+        fragment = next(fragments, None)
+    finally:
+        fragments.close()
+    if fragment is None:
+        return []
+
+    declarations = read_namespace_declarations(file_path, sheet_part)
+    row = ElementTree.fromstring(wrap_rows(fragment, declarations))[0]
+    shared_indexes = [
+        int(value)
+        for _, kind, value, _ in iter_cells(row)
+        if kind == "s" and value is not None
+    ]
+    shared_strings = (
+        read_shared_strings(file_path, limit=max(shared_indexes) + 1)
+        if shared_indexes
+        else np.array([], dtype=object)
+    )
+    headers = RowDecoder(shared_strings, set(), "").header(row)
+    return [str(headers[column]) for column in sorted(headers)]
+
+
+def probe_workbook(file_path) -> List[Dict]:
+    """
+    Descreve as planilhas de um XLSX sem carregar os dados
+
+    Args:
+        file_path: Caminho (ou arquivo aberto) do XLSX
+
+    Returns:
+        Lista, na ordem da pasta, de dicionários com "name", "part" (arquivo
+        no ZIP), "rows" (linhas de dados segundo <dimension>, ou None se a
+        planilha não a declarar), "columns" (quantidade de colunas) e
+        "headers" (rótulos do cabeçalho)
+
+    Raises:
+        ValueError: Se o arquivo não for um XLSX válido
+    """
+    try:
+        parts = sheet_parts(file_path)
+        with zipfile.ZipFile(file_path, "r") as zip_ref:
+            existing = set(zip_ref.namelist())
+    except zipfile.BadZipFile as e:
+        raise ValueError(f"Arquivo XLSX inválido: {str(e)}")
+
+    sheets = []
+    for name, part in parts.items():
+        if part not in existing:
+            logger.warning(f"Planilha '{name}' aponta para {part}, ausente no arquivo")
+            sheets.append(
+                {"name": name, "part": part, "rows": None, "columns": 0, "headers": []}
+            )
+            continue
+
+        headers = read_header(file_path, part)
+        dimension = read_dimension(file_path, part)
+        sheets.append(
+            {
+                "name": name,
+                "part": part,
+                "rows": max(dimension[0] - 1, 0) if dimension else None,
+                "columns": dimension[1] if dimension else len(headers),
+                "headers": headers,
+            }
+        )
+
+    logger.info(
+        f"Planilhas encontradas: {', '.join(sheet['name'] for sheet in sheets)}"
+    )
+    return sheets
+
+
+def find_sheet_part(file_path, sheet_name: Optional[str] = None) -> str:
+    """
+    Localiza o arquivo de uma planilha dentro do ZIP
+
+    Args:
+        file_path: Caminho (ou arquivo aberto) do XLSX
+        sheet_name: Nome da planilha (se None, usa a primeira)
+
+    Returns:
+        Caminho da planilha dentro do ZIP
+
+    Raises:
+        ValueError: Se a planilha não existir na pasta de trabalho
+    """
+    parts = sheet_parts(file_path)
+    if sheet_name is None:
+        if not parts:
+            raise ValueError("A pasta de trabalho não contém planilhas")
+        return next(iter(parts.values()))
+    if sheet_name not in parts:
+        raise ValueError(
+            f"Planilha '{sheet_name}' não encontrada. "
+            f"Planilhas disponíveis: {', '.join(parts)}"
+        )
+    return parts[sheet_name]
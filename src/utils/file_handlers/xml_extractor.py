@@ -8,13 +8,27 @@ Este módulo contém a classe para extrair dados de planilhas corrompidas via XM
 """
 
 import os
-import re
-import zipfile
-import shutil
+import itertools
+import numpy as np
 import pandas as pd
 from typing import Dict, List, Optional, Tuple
 
 from src.utils.logger import get_logger
+from src.utils.phone_directory import PhoneDirectory, hash_names, normalize_names
+from src.utils.phone_normalizer import PHONE_FORMAT
+from src.utils.file_handlers.column_builders import read_sheet_frame
+from src.utils.file_handlers.parallel_reader import read_sheet_parallel
+from src.utils.file_handlers.phone_extraction import (
+    PhoneRowParser,
+    extract_phones,
+    log_failures,
+)
+from src.utils.file_handlers.sheet_stream import (
+    iter_hashed_rows,
+    read_namespace_declarations,
+    read_shared_strings,
+)
+from src.utils.file_handlers.workbook_probe import find_sheet_part
 
 # Obtendo o logger para este módulo
 logger = get_logger("utils.file_handlers.xml_extractor")
@@ -25,11 +39,11 @@ class XMLExtractor:
 
     def __init__(self):
         """Inicializa o extrator XML"""
-        self.temp_dir = "xlsx_extraido"
+        self.phone_row_failures: List[Tuple[int, str]] = []
         logger.info("XMLExtractor inicializado")
 
     def extract_data_from_xlsx(
-        self, file_path: str, sheet_name: Optional[str] = None
+        self, file_path: str, sheet_name: Optional[str] = None, max_workers: int = 1
     ) -> pd.DataFrame:
         """
         Extrai dados de um arquivo XLSX via XML
@@ -37,106 +51,41 @@ class XMLExtractor:
         Args:
             file_path: Caminho para o arquivo XLSX
             sheet_name: Nome da planilha (se None, usa a primeira)
+            max_workers: Processos usados para decodificar a planilha; com mais
+                de um, faixas de linhas são lidas em paralelo (0 usa todos os
+                núcleos)
 
         Returns:
             DataFrame com os dados extraídos
         """
         logger.info(f"Extraindo dados de {file_path} via XML")
 
-        # Limpar diretório temporário
-        if os.path.exists(self.temp_dir):
-            shutil.rmtree(self.temp_dir)
-        os.makedirs(self.temp_dir)
-
         try:
-            # Extrair conteúdo do XLSX
-            with zipfile.ZipFile(file_path, "r") as zip_ref:
-                zip_ref.extractall(self.temp_dir)
-
-            # Ler o workbook.xml para obter informações sobre as sheets
-            workbook_path = os.path.join(self.temp_dir, "xl", "workbook.xml")
-            sheet_id = 1  # Default para primeira sheet
-
-            if os.path.exists(workbook_path):
-                with open(workbook_path, "r", encoding="utf-8") as f:
-                    workbook_content = f.read()
-
-                # Encontrar todas as sheets
-                sheet_matches = re.findall(
-                    r'<sheet name="([^"]+)"[^>]*sheetId="(\d+)"', workbook_content
-                )
-
-                if sheet_matches:
-                    logger.info(f"Planilhas encontradas: {sheet_matches}")
-
-                # Se sheet_name foi especificado, encontrar o id correspondente
-                if sheet_name and sheet_matches:
-                    for name, id in sheet_matches:
-                        if name == sheet_name:
-                            sheet_id = int(id)
-                            logger.info(
-                                f"Planilha '{sheet_name}' encontrada com ID {sheet_id}"
-                            )
-                            break
-
-            # Ler o arquivo sheet{sheet_id}.xml
-            sheet_path = os.path.join(
-                self.temp_dir, "xl", "worksheets", f"sheet{sheet_id}.xml"
-            )
-
-            if not os.path.exists(sheet_path):
-                logger.error(f"Arquivo de planilha não encontrado: {sheet_path}")
-                return pd.DataFrame()
-
-            with open(sheet_path, "r", encoding="utf-8") as f:
-                sheet_content = f.read()
-
-            # Extrair dados usando expressões regulares
-            # Encontrar cabeçalhos
-            header_match = re.search(r"<row[^>]*>(.*?)</row>", sheet_content)
-            headers = []
-
-            if header_match:
-                header_row = header_match.group(1)
-                header_cells = re.findall(
-                    r"<c[^>]*><v>(.*?)</v></c>|<c[^>]*><is><t>(.*?)</t></is></c>",
-                    header_row,
-                )
-                headers = [h[0] or h[1] for h in header_cells]
-                logger.info(f"Cabeçalhos encontrados: {headers}")
-
-            # Encontrar dados
-            rows = []
-            row_matches = re.findall(r"<row[^>]*>(.*?)</row>", sheet_content)
-
-            for row_xml in row_matches[1:]:  # Pular o cabeçalho
-                cell_values = re.findall(
-                    r"<c[^>]*><v>(.*?)</v></c>|<c[^>]*><is><t>(.*?)</t></is></c>",
-                    row_xml,
-                )
-                row_data = [c[0] or c[1] for c in cell_values]
-                rows.append(row_data)
-
-            logger.info(f"Extraídas {len(rows)} linhas de dados")
-
-            # Limpar diretório temporário
-            shutil.rmtree(self.temp_dir)
-
-            # Criar DataFrame
-            df = pd.DataFrame(rows, columns=headers)
+            # O arquivo da planilha vem das relações da pasta, não do sheetId
+            sheet_part = find_sheet_part(file_path, sheet_name)
+            logger.info(f"Lendo a planilha {sheet_part}")
+
+            # Textos compartilhados são carregados uma vez; as células vão
+            # direto para colunas tipadas (textos compartilhados viram categóricas)
+            if max_workers == 1:
+                df = read_sheet_frame(file_path, sheet_part)
+            else:
+                df = read_sheet_parallel(file_path, sheet_part, max_workers or None)
+            logger.info(f"Extraídas {len(df)} linhas de dados")
             return df
 
         except Exception as e:
             logger.error(f"Erro ao extrair dados via XML: {str(e)}")
-            # Limpar diretório temporário se ocorrer erro
-            if os.path.exists(self.temp_dir):
-                shutil.rmtree(self.temp_dir)
             return pd.DataFrame()
 
     def extract_phones_from_xlsx(self, file_path: str) -> Dict[str, str]:
         """
         Extrai números de telefone do arquivo Excel, acessando diretamente o XML interno
 
+        As colunas de nome, fixo e celular são identificadas pelo cabeçalho e
+        cada linha é lida uma única vez; as linhas que não puderem ser lidas
+        ficam em self.phone_row_failures.
+
         Args:
             file_path: Caminho para o arquivo Excel com os números de telefone
 
@@ -144,103 +93,191 @@ class XMLExtractor:
             Dicionário mapeando nomes de clientes (em lowercase) para seus números de telefone
         """
         logger.info(f"Extraindo telefones de {file_path}...")
-
-        # Remover diretório de extração se existir
-        if os.path.exists(self.temp_dir):
-            shutil.rmtree(self.temp_dir)
-        os.makedirs(self.temp_dir)
-
         dict_telefones = {}
+        self.phone_row_failures = []
 
         try:
-            # Extrair conteúdo do arquivo XLSX (que é um ZIP)
-            with zipfile.ZipFile(file_path, "r") as zip_ref:
-                zip_ref.extractall(self.temp_dir)
-
-            # Ler o arquivo sheet1.xml que contém os dados da planilha
-            sheet_path = os.path.join(self.temp_dir, "xl", "worksheets", "sheet1.xml")
-
-            if os.path.exists(sheet_path):
-                logger.info("Lendo dados de clientes e telefones do arquivo XML...")
-
-                # Ler o conteúdo do arquivo XML
-                with open(sheet_path, "r", encoding="utf-8") as f:
-                    content = f.read()
-
-                # Padrão para encontrar linhas com dados de cliente e telefone
-                pattern = r"<row>.*?<c[^>]*><is><t>(.*?)</t></is></c>.*?<c[^>]*>(?:<is><t>(.*?)</t></is>|<v>(.*?)</v>)</c>.*?<c[^>]*>(?:<is><t>.*?</t></is>|<v>.*?</v>)</c>.*?<c[^>]*>(?:<is><t>(.*?)</t></is>|<v>(.*?)</v>)</c>.*?<c[^>]*>(?:<is><t>(.*?)</t></is>|<v>(.*?)</v>)</c>"
-
-                matches = re.findall(pattern, content, re.DOTALL)
-                logger.info(
-                    f"Encontradas {len(matches)} linhas com dados de cliente e telefone."
-                )
-
-                for match in matches:
-                    nome = match[0]
-                    telefone_fixo = match[3] or match[4] or ""
-                    telefone_celular = match[5] or match[6] or ""
-
-                    # Usar o telefone celular se disponível, senão usar o fixo
-                    telefone = telefone_celular if telefone_celular else telefone_fixo
-
-                    if nome and telefone:
-                        dict_telefones[nome.strip().lower()] = telefone
-
-                logger.info(f"Extraídos {len(dict_telefones)} contatos com telefones.")
-
-                # Se não conseguimos extrair telefones com o padrão acima, tentar um padrão mais simples
-                if len(dict_telefones) == 0:
-                    dict_telefones = self._extract_phones_alternative_method(content)
-            else:
-                logger.error(f"O arquivo {sheet_path} não existe.")
-
+            dict_telefones, self.phone_row_failures = extract_phones(file_path)
         except Exception as e:
             logger.error(f"Erro ao extrair ou analisar o arquivo: {str(e)}")
 
-        # Limpar o diretório de extração
-        if os.path.exists(self.temp_dir):
-            shutil.rmtree(self.temp_dir)
-
         return dict_telefones
 
-    def _extract_phones_alternative_method(self, content: str) -> Dict[str, str]:
+    def extract_phone_directory(self, file_path: str) -> PhoneDirectory:
         """
-        Método alternativo para extrair telefones usando um padrão mais simples
+        Extrai os telefones do arquivo Excel como um diretório compacto
 
         Args:
-            content: Conteúdo XML da planilha
+            file_path: Caminho para o arquivo Excel com os números de telefone
 
         Returns:
-            Dicionário mapeando nomes para telefones
+            PhoneDirectory com os contatos extraídos (pode ser salvo com save e
+            compartilhado entre processos com PhoneDirectory.load)
         """
-        logger.info("Tentando um método alternativo de extração...")
-        dict_telefones = {}
+        return PhoneDirectory.from_dict(self.extract_phones_from_xlsx(file_path))
 
-        # Extrair manualmente
-        rows = content.split("<row>")
-        for row in rows[1:]:  # Pular o primeiro elemento que é o cabeçalho XML
+    def refresh_phone_directory(
+        self, file_path: str, snapshot_path: str
+    ) -> PhoneDirectory:
+        """
+        Atualiza incrementalmente o diretório de telefones salvo em snapshot_path
+
+        Junto ao diretório é salvo um índice com o hash de conteúdo de cada
+        linha da planilha ({snapshot_path}.rows.npz). Na atualização, a planilha
+        é lida em streaming e apenas as linhas com hash desconhecido são
+        analisadas; contatos de linhas que desapareceram são removidos. Nomes
+        repetidos ficam com o telefone da última linha, como na extração
+        completa. Se o
+        arquivo não mudou (tamanho e data de modificação), o snapshot é usado
+        diretamente. Sem snapshot, todas as linhas são analisadas.
+
+        Args:
+            file_path: Caminho para o arquivo Excel com os números de telefone
+            snapshot_path: Caminho do diretório de telefones persistido
+
+        Returns:
+            PhoneDirectory atualizado (também salvo em snapshot_path)
+        """
+        rows_path = f"{snapshot_path}.rows.npz"
+        stat = os.stat(file_path)
+        signature = np.array([stat.st_size, stat.st_mtime_ns], dtype=np.int64)
+        has_snapshot = os.path.exists(snapshot_path) and os.path.exists(rows_path)
+
+        old_rows = np.zeros(0, dtype=np.uint64)
+        old_names = np.zeros(0, dtype=np.uint64)
+        old_layout = None
+        directory = PhoneDirectory.from_series([], [])
+
+        if has_snapshot:
+            with np.load(rows_path) as snapshot:
+                old_rows = snapshot["row_hashes"]
+                old_names = snapshot["name_hashes"]
+                old_layout = str(snapshot["layout"])
+                unchanged = np.array_equal(snapshot["signature"], signature)
+            # Snapshots de outra forma canônica são refeitos mesmo sem alterações
+            if unchanged and old_layout.endswith(f"|{PHONE_FORMAT}"):
+                logger.info(f"{file_path} sem alterações desde o último snapshot")
+                return PhoneDirectory.load(snapshot_path)
+
+        # O significado das linhas depende das colunas e da forma canônica dos
+        # telefones; os textos compartilhados entram no hash de cada linha
+        shared_strings = read_shared_strings(file_path)
+        parser = PhoneRowParser(shared_strings, read_namespace_declarations(file_path))
+        rows = iter_hashed_rows(file_path, shared_strings=shared_strings)
+        first = next(rows, None)
+        header_hash = None
+        if first is not None:
             try:
-                # Extrair o nome (primeira coluna)
-                nome_match = re.search(r"<c[^>]*><is><t>(.*?)</t></is></c>", row)
-                if nome_match:
-                    nome = nome_match.group(1)
-
-                    # Extrair o telefone celular (quinta coluna)
-                    celular_match = re.search(
-                        r"<c[^>]*>(?:<is><t>(.*?)</t></is>|<v>(.*?)</v>)</c>.*?<c[^>]*>(?:<is><t>(.*?)</t></is>|<v>(.*?)</v>)</c>.*?<c[^>]*>(?:<is><t>(.*?)</t></is>|<v>(.*?)</v>)</c>.*?<c[^>]*>(?:<is><t>(.*?)</t></is>|<v>(.*?)</v>)</c>",
-                        row,
-                    )
-                    if celular_match:
-                        # Pegar o primeiro valor não nulo dos grupos
-                        celular = next((g for g in celular_match.groups() if g), "")
-
-                        if nome and celular:
-                            dict_telefones[nome.strip().lower()] = celular
+                if parser.resolve_columns(first[1]):
+                    header_hash = first[0]
             except Exception as e:
-                logger.debug(f"Erro ao processar linha: {str(e)}")
+                logger.warning(f"Cabeçalho da planilha de telefones inválido: {e}")
+        # ("textos": hashes calculados sobre os textos resolvidos)
+        layout = f"{sorted(parser.columns.items())}|textos|{PHONE_FORMAT}"
+
+        if old_layout == layout:
+            directory = PhoneDirectory.load(snapshot_path, mmap=False)
+        elif has_snapshot:
+            logger.info(
+                "Layout da planilha de telefones mudou; reconstruindo o snapshot"
+            )
+            old_rows, old_names = old_rows[:0], old_names[:0]
+        else:
+            logger.info(f"Snapshot não encontrado; analisando {file_path} por completo")
+
+        # Linhas já conhecidas (e o cabeçalho) não são analisadas novamente
+        known = set(old_rows.tolist())
+        row_hashes = []
+        added_rows, added_names, added_phones = [], [], []
+        failures = []
+        if first is not None:
+            rows = itertools.chain([first], rows)
+
+        for number, (row_hash, fragment) in enumerate(rows, 1):
+            row_hashes.append(row_hash)
+            if row_hash in known:
                 continue
+            known.add(row_hash)
+            contact = None
+            if row_hash != header_hash:
+                try:
+                    contact = parser.parse_row(fragment)
+                except Exception as e:
+                    failures.append((number, str(e)))
+            added_rows.append(row_hash)
+            added_names.append(contact[0] if contact else None)
+            added_phones.append(contact[1] if contact else None)
+
+        row_hashes = np.array(row_hashes, dtype=np.uint64)
+        added_rows = np.array(added_rows, dtype=np.uint64)
+        normalized = normalize_names(added_names)
+        added_name_hashes = np.where(normalized.notna(), hash_names(normalized), 0)
+
+        # Hash do nome de cada linha atual (0 para linhas sem contato)
+        row_table = np.concatenate([old_rows, added_rows])
+        name_table = np.concatenate([old_names, added_name_hashes])
+        table_order = np.argsort(row_table, kind="stable")
+        positions = np.searchsorted(row_table[table_order], row_hashes)
+        name_hashes = name_table[table_order][positions]
+
+        # Nomes de linhas novas ou que sumiram; os que não aparecem em nenhuma
+        # outra linha são removidos
+        vanished = old_names[~np.isin(old_rows, row_hashes)]
+        affected = np.union1d(added_name_hashes, vanished)
+        affected = affected[affected != 0]
+        removed = np.setdiff1d(affected, name_hashes)
+
+        # Como na extração completa, cada nome fica com a sua última linha
+        unique_names, first = np.unique(name_hashes[::-1], return_index=True)
+        last_rows = len(name_hashes) - 1 - first
+        winners = np.sort(last_rows[np.isin(unique_names, affected)])
+
+        # A última linha pode ser uma linha já conhecida (nome repetido); essas
+        # são lidas de novo para obter o telefone
+        added_index = {row_hash: i for i, row_hash in enumerate(added_rows.tolist())}
+        contacts = {}
+        reread = set()
+        for position, row_hash in zip(winners.tolist(), row_hashes[winners].tolist()):
+            if row_hash in added_index:
+                i = added_index[row_hash]
+                contacts[position] = (added_names[i], added_phones[i])
+            else:
+                reread.add(position)
+        if reread:
+            logger.info(f"Relendo {len(reread)} linhas de nomes repetidos")
+            for position, (_, fragment) in enumerate(
+                iter_hashed_rows(file_path, shared_strings=shared_strings)
+            ):
+                if position in reread:
+                    try:
+                        contact = parser.parse_row(fragment)
+                    except Exception as e:
+                        failures.append((position + 1, str(e)))
+                        contact = None
+                    contacts[position] = contact or (None, None)
+
+        log_failures(failures)
+        additions = PhoneDirectory.from_series(
+            [contacts[position][0] for position in winners.tolist()],
+            [contacts[position][1] for position in winners.tolist()],
+        )
+        changed = int(np.isin(additions.hashes, directory.hashes).sum())
+        new = len(additions) - changed
+        deleted = int(np.isin(removed, directory.hashes).sum())
+
+        directory = directory.updated(removed, additions)
+        directory.save(snapshot_path)
+        np.savez(
+            rows_path,
+            row_hashes=row_hashes,
+            name_hashes=name_hashes,
+            signature=signature,
+            layout=np.array(layout),
+        )
 
         logger.info(
-            f"Extraídos {len(dict_telefones)} contatos com telefones após extração alternativa."
+            f"Telefones atualizados: +{new} novos, ~{changed} alterados, "
+            f"-{deleted} removidos ({len(added_rows)} de {len(row_hashes)} "
+            f"linhas analisadas)"
         )
-        return dict_telefones
+        return directory
@@ -0,0 +1,235 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Manifesto dos arquivos já processados
+
+Este módulo registra, para cada arquivo de entrada processado, o tamanho, a
+data de modificação e o hash do conteúdo, além da planilha da saída
+consolidada que o representa. Com isso uma execução incremental identifica
+apenas os arquivos novos, alterados ou removidos: o hash só é calculado
+quando o tamanho ou a data mudam, e um arquivo apenas "tocado" (mesmo
+conteúdo) não é processado de novo.
+"""
+
+import os
+import json
+import hashlib
+from typing import Dict, List, Optional
+
+from src.utils.logger import get_logger
+
+# Obtendo o logger para este módulo
+logger = get_logger("utils.manifest")
+
+# Versão do formato do arquivo de manifesto
+_VERSAO = 1
+
+# Tamanho dos blocos lidos para o hash
+_BLOCO_HASH = 1024 * 1024
+
+
+def file_hash(path: str) -> str:
+    """
+    Calcula o hash do conteúdo de um arquivo
+
+    Args:
+        path: Caminho do arquivo
+
+    Returns:
+        Hash BLAKE2b (16 bytes) em hexadecimal
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(_BLOCO_HASH), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ProcessingManifest:
+    """
+    Registro dos arquivos processados e das planilhas de saída correspondentes
+    """
+
+    def __init__(self, path: str):
+        """
+        Inicializa o manifesto, carregando-o se o arquivo existir
+
+        Args:
+            path: Caminho do arquivo JSON do manifesto
+        """
+        self.path = path
+        self.entries: Dict[str, Dict] = {}
+        self.phones: Optional[Dict] = None
+
+        if os.path.exists(path):
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                if data.get("versao") == _VERSAO:
+                    self.entries = data.get("arquivos", {})
+                    self.phones = data.get("telefones")
+                else:
+                    logger.warning(f"Manifesto {path} em formato antigo; ignorado")
+            except (OSError, ValueError) as e:
+                logger.warning(f"Manifesto {path} ilegível ({str(e)}); ignorado")
+
+    @staticmethod
+    def _stat(path: str) -> Dict:
+        """Tamanho e data de modificação de um arquivo"""
+        stat = os.stat(path)
+        return {"tamanho": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    @classmethod
+    def signature(cls, path: str, previous: Optional[Dict] = None) -> Dict:
+        """
+        Assinatura de um arquivo (tamanho, data de modificação e hash)
+
+        Args:
+            path: Caminho do arquivo
+            previous: Assinatura anterior; se tamanho e data forem iguais, o
+                hash é reaproveitado sem ler o arquivo
+
+        Returns:
+            Dicionário com "tamanho", "mtime_ns" e "hash"
+        """
+        current = cls._stat(path)
+        if previous and all(previous.get(k) == v for k, v in current.items()):
+            current["hash"] = previous.get("hash")
+        else:
+            current["hash"] = file_hash(path)
+        return current
+
+    @staticmethod
+    def _same_content(signature: Dict, previous: Optional[Dict]) -> bool:
+        """Indica se a assinatura tem o mesmo conteúdo da anterior"""
+        return bool(previous) and signature["hash"] == previous.get("hash")
+
+    def is_changed(self, name: str, path: str) -> bool:
+        """
+        Indica se um arquivo é novo ou teve o conteúdo alterado
+
+        Arquivos apenas "tocados" (mesmo hash) têm a assinatura atualizada no
+        manifesto e não são considerados alterados.
+
+        Args:
+            name: Nome do arquivo no manifesto
+            path: Caminho do arquivo
+
+        Returns:
+            True se o arquivo precisa ser processado
+        """
+        previous = self.entries.get(name)
+        signature = self.signature(path, previous)
+        if not self._same_content(signature, previous):
+            return True
+        previous.update(signature)
+        return False
+
+    def phones_changed(self, path: str) -> bool:
+        """
+        Indica se a planilha de telefones mudou desde o último processamento
+
+        Args:
+            path: Caminho da planilha de telefones
+
+        Returns:
+            True se a planilha é nova ou teve o conteúdo alterado
+        """
+        signature = self.signature(path, self.phones)
+        changed = not self._same_content(signature, self.phones)
+        if not changed:
+            self.phones.update(signature)
+        return changed
+
+    def sheet_for(self, name: str) -> str:
+        """
+        Planilha da saída consolidada que representa um arquivo
+
+        Arquivos já registrados mantêm a sua planilha; novos recebem a
+        próxima numeração livre, que fica reservada para eles.
+
+        Args:
+            name: Nome do arquivo no manifesto
+
+        Returns:
+            Nome da planilha (ex. "Planilha3")
+        """
+        if name in self.entries and self.entries[name].get("planilha"):
+            return self.entries[name]["planilha"]
+        used = [
+            int(entry["planilha"][len("Planilha") :])
+            for entry in self.entries.values()
+            if str(entry.get("planilha", "")).startswith("Planilha")
+            and entry["planilha"][len("Planilha") :].isdigit()
+        ]
+        sheet_name = f"Planilha{max(used, default=0) + 1}"
+        self.entries.setdefault(name, {})["planilha"] = sheet_name
+        return sheet_name
+
+    def record(self, name: str, path: str, sheet_name: str) -> None:
+        """
+        Registra um arquivo processado
+
+        Args:
+            name: Nome do arquivo no manifesto
+            path: Caminho do arquivo
+            sheet_name: Planilha da saída consolidada que o representa
+        """
+        signature = self.signature(path, self.entries.get(name))
+        self.entries[name] = {**signature, "planilha": sheet_name}
+
+    def record_phones(self, path: str) -> None:
+        """
+        Registra a planilha de telefones usada no processamento
+
+        Args:
+            path: Caminho da planilha de telefones
+        """
+        self.phones = self.signature(path, self.phones)
+
+    def remove(self, name: str) -> Optional[str]:
+        """
+        Remove um arquivo do manifesto
+
+        Args:
+            name: Nome do arquivo no manifesto
+
+        Returns:
+            Planilha que o representava, ou None
+        """
+        entry = self.entries.pop(name, None)
+        return entry.get("planilha") if entry else None
+
+    def removed(self, names: List[str]) -> List[str]:
+        """
+        Arquivos registrados que não estão mais entre os arquivos atuais
+
+        Args:
+            names: Nomes dos arquivos atuais
+
+        Returns:
+            Nomes registrados ausentes de `names`
+        """
+        current = set(names)
+        return sorted(name for name in self.entries if name not in current)
+
+    def clear(self) -> None:
+        """Esquece todos os arquivos registrados (reprocessamento completo)"""
+        self.entries = {}
+        self.phones = None
+
+    def save(self) -> None:
+        """Grava o manifesto de forma atômica"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"versao": _VERSAO, "telefones": self.phones, "arquivos": self.entries},
+                f,
+                ensure_ascii=False,
+                indent=2,
+            )
+        os.replace(temp_path, self.path)
@@ -0,0 +1,433 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Diretório compacto de telefones do Lilica Excel
+
+Este módulo contém uma estrutura compacta para a tabela nome -> telefone.
+Em vez de um dicionário Python com uma string por nome e por telefone, os
+nomes são guardados como hashes de 64 bits ordenados (busca binária) e os
+telefones como inteiros canônicos (E.164, ver src.utils.phone_normalizer),
+em arrays NumPy. Telefones fora do formato brasileiro (0800, ramais, dois
+números na mesma célula etc.) não têm forma canônica e são guardados como o
+texto original. O diretório pode ser salvo em um único arquivo e aberto via
+memory-map, de forma que vários processos compartilhem as mesmas páginas sem
+copiar nem serializar os dados.
+"""
+
+import os
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, Optional
+
+from src.utils.logger import get_logger
+from src.utils.phone_normalizer import format_national, normalize_phones
+
+# Obtendo o logger para este módulo
+logger = get_logger("utils.phone_directory")
+
+# Identificação e tamanho do cabeçalho do arquivo do diretório
+_MAGIC = b"LILTEL02"
+_HEADER_SIZE = 32
+
+
+def normalize_names(names: Iterable) -> pd.Series:
+    """
+    Normaliza nomes de contatos para a chave do diretório (vetorizado)
+
+    Args:
+        names: Nomes originais
+
+    Returns:
+        Série do tipo "string" com os nomes sem espaços nas pontas e em minúsculas
+    """
+    return pd.Series(names, dtype=object).astype("string").str.strip().str.lower()
+
+
+def hash_names(names: pd.Series) -> np.ndarray:
+    """
+    Calcula o hash de 64 bits de cada nome normalizado (vetorizado)
+
+    Args:
+        names: Nomes já normalizados (ver normalize_names)
+
+    Returns:
+        Array uint64 com os hashes
+    """
+    return pd.util.hash_array(names.fillna("").to_numpy(dtype=object))
+
+
+def _pack_texts(texts: Iterable) -> tuple:
+    """Concatena textos em offsets (n + 1) e bytes UTF-8"""
+    encoded = [text.encode("utf-8") for text in texts]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.uint64)
+    np.cumsum([len(text) for text in encoded], out=offsets[1:])
+    return offsets, np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+
+def _take_texts(offsets: np.ndarray, blob: np.ndarray, positions: np.ndarray):
+    """Seleciona textos concatenados nas posições indicadas (vetorizado)"""
+    starts = offsets[positions].astype(np.int64)
+    lengths = offsets[positions + 1].astype(np.int64) - starts
+
+    new_offsets = np.zeros(len(positions) + 1, dtype=np.uint64)
+    np.cumsum(lengths, out=new_offsets[1:])
+    # Índice de cada byte: início do texto + deslocamento dentro dele
+    gather = np.repeat(starts - new_offsets[:-1].astype(np.int64), lengths)
+    gather += np.arange(int(new_offsets[-1]), dtype=np.int64)
+    return new_offsets, blob[gather]
+
+
+def _unpack_texts(offsets: np.ndarray, blob: np.ndarray) -> list:
+    """Separa textos concatenados com _pack_texts"""
+    data = np.asarray(blob).tobytes()
+    bounds = np.asarray(offsets).tolist()
+    return [
+        data[bounds[i] : bounds[i + 1]].decode("utf-8") for i in range(len(bounds) - 1)
+    ]
+
+
+class PhoneDirectory:
+    """
+    Tabela nome -> telefone em arrays NumPy ordenados por hash do nome
+    """
+
+    def __init__(
+        self,
+        hashes: np.ndarray,
+        phones: np.ndarray,
+        name_offsets: Optional[np.ndarray] = None,
+        name_blob: Optional[np.ndarray] = None,
+        text_offsets: Optional[np.ndarray] = None,
+        text_blob: Optional[np.ndarray] = None,
+    ):
+        """
+        Inicializa o diretório a partir de arrays já ordenados por hash
+
+        Prefira os construtores from_dict, from_series e load.
+
+        Args:
+            hashes: Hashes uint64 dos nomes, em ordem crescente e sem repetição
+            phones: Telefones int64 alinhados a `hashes` (0 para telefones
+                fora do formato, guardados como texto)
+            name_offsets: Posições (n + 1) de cada nome em `name_blob`
+            name_blob: Bytes UTF-8 dos nomes normalizados, concatenados
+            text_offsets: Posições (n + 1) de cada telefone original em
+                `text_blob` (vazio para telefones com forma canônica)
+            text_blob: Bytes UTF-8 dos telefones fora do formato, concatenados
+        """
+        self.hashes = hashes
+        self.phones = phones
+        self.name_offsets = name_offsets
+        self.name_blob = name_blob
+        self.text_offsets = text_offsets
+        self.text_blob = text_blob
+
+    @classmethod
+    def from_series(cls, names: Iterable, phones: Iterable) -> "PhoneDirectory":
+        """
+        Cria o diretório a partir de colunas de nomes e telefones
+
+        Nomes repetidos (após a normalização) ficam com o último telefone.
+        Fixos e celulares válidos são guardados na forma canônica; os demais
+        telefones preenchidos, como o texto original.
+
+        Args:
+            names: Nomes dos contatos
+            phones: Telefones dos contatos
+
+        Returns:
+            Novo PhoneDirectory
+        """
+        normalized = normalize_names(names)
+        originals = pd.Series(phones, dtype=object)
+        normalizados = normalize_phones(originals)
+        validos = normalizados["tipo"].isin(["fixo", "celular"]).to_numpy()
+        texts = originals.where(~validos & originals.notna(), "").astype(str)
+        frame = pd.DataFrame(
+            {
+                "hash": hash_names(normalized),
+                "phone": np.where(validos, normalizados["e164"].to_numpy(), 0),
+                "name": normalized.fillna("").to_numpy(dtype=object),
+                "text": texts.to_numpy(dtype=object),
+            }
+        )
+        frame = frame[normalized.notna().to_numpy()]
+        frame = frame.drop_duplicates("hash", keep="last").sort_values("hash")
+
+        name_offsets, name_blob = _pack_texts(frame["name"])
+        text_offsets, text_blob = _pack_texts(frame["text"])
+        return cls(
+            frame["hash"].to_numpy(dtype=np.uint64),
+            frame["phone"].to_numpy(dtype=np.int64),
+            name_offsets,
+            name_blob,
+            text_offsets,
+            text_blob,
+        )
+
+    @classmethod
+    def from_dict(cls, dict_telefones: Dict[str, str]) -> "PhoneDirectory":
+        """
+        Cria o diretório a partir do dicionário nome -> telefone
+
+        Args:
+            dict_telefones: Dicionário como o de XMLExtractor.extract_phones_from_xlsx
+
+        Returns:
+            Novo PhoneDirectory
+        """
+        return cls.from_series(list(dict_telefones.keys()), dict_telefones.values())
+
+    def __len__(self) -> int:
+        return len(self.hashes)
+
+    def __contains__(self, name: str) -> bool:
+        return self.lookup(name) is not None
+
+    def _find(self, hashes: np.ndarray) -> np.ndarray:
+        """Retorna a posição de cada hash no diretório, ou -1 se ausente"""
+        positions = np.searchsorted(self.hashes, hashes)
+        positions = np.minimum(positions, max(len(self.hashes) - 1, 0))
+        found = len(self.hashes) > 0
+        if found:
+            found = self.hashes[positions] == hashes
+        return np.where(found, positions, -1)
+
+    def lookup_codes(self, names: Iterable) -> np.ndarray:
+        """
+        Busca os telefones de uma coluna inteira de nomes (vetorizado)
+
+        Args:
+            names: Nomes dos clientes
+
+        Returns:
+            Array int64 com os telefones; 0 para nomes não encontrados e para
+            telefones fora do formato (ver lookup_many)
+        """
+        normalized = normalize_names(names)
+        positions = self._find(hash_names(normalized))
+        positions[normalized.isna().to_numpy()] = -1
+        phones = np.zeros(len(positions), dtype=np.int64)
+        found = positions >= 0
+        phones[found] = self.phones[positions[found]]
+        return phones
+
+    def lookup_many(self, names: Iterable) -> pd.Series:
+        """
+        Busca os telefones de uma coluna inteira de nomes, como texto
+
+        Args:
+            names: Nomes dos clientes
+
+        Returns:
+            Série com o telefone (dígitos, ou o texto original se fora do
+            formato) de cada nome, ou None se ausente
+        """
+        normalized = normalize_names(names)
+        positions = self._find(hash_names(normalized))
+        positions[normalized.isna().to_numpy()] = -1
+        return self._phone_texts(positions)
+
+    def _phone_texts(self, positions: np.ndarray) -> pd.Series:
+        """Telefones como texto nas posições indicadas (None para -1)"""
+        found = positions >= 0
+        codes = np.zeros(len(positions), dtype=np.int64)
+        codes[found] = np.asarray(self.phones)[positions[found]]
+        result = format_national(codes)
+
+        offsets, blob = self._text_arrays()
+        originals = _unpack_texts(*_take_texts(offsets, blob, positions[found]))
+        originals = pd.Series(originals, index=np.flatnonzero(found), dtype=object)
+        originals = originals[originals != ""]
+        result[originals.index] = originals
+        return result
+
+    def lookup(self, name: str) -> Optional[str]:
+        """
+        Busca o telefone de um único nome
+
+        Args:
+            name: Nome do cliente
+
+        Returns:
+            Telefone (dígitos) ou None se o nome não estiver no diretório
+        """
+        return self.lookup_many([name]).iloc[0]
+
+    def _name_arrays(self):
+        """Retorna offsets e bytes dos nomes (vazios se o diretório não tem nomes)"""
+        if self.name_offsets is None or self.name_blob is None:
+            return np.zeros(len(self) + 1, dtype=np.uint64), np.zeros(0, np.uint8)
+        return np.asarray(self.name_offsets), np.asarray(self.name_blob)
+
+    def _text_arrays(self):
+        """Retorna offsets e bytes dos telefones originais (vazios se não houver)"""
+        if self.text_offsets is None or self.text_blob is None:
+            return np.zeros(len(self) + 1, dtype=np.uint64), np.zeros(0, np.uint8)
+        return np.asarray(self.text_offsets), np.asarray(self.text_blob)
+
+    def take(self, positions: np.ndarray) -> "PhoneDirectory":
+        """
+        Cria um diretório com as entradas nas posições indicadas (vetorizado)
+
+        Args:
+            positions: Posições das entradas, na ordem desejada
+
+        Returns:
+            Novo PhoneDirectory (cabe ao chamador manter a ordem por hash)
+        """
+        positions = np.asarray(positions, dtype=np.int64)
+        name_offsets, name_blob = _take_texts(*self._name_arrays(), positions)
+        text_offsets, text_blob = _take_texts(*self._text_arrays(), positions)
+        return PhoneDirectory(
+            np.asarray(self.hashes)[positions],
+            np.asarray(self.phones)[positions],
+            name_offsets,
+            name_blob,
+            text_offsets,
+            text_blob,
+        )
+
+    def updated(
+        self, removed_hashes: np.ndarray, additions: "PhoneDirectory"
+    ) -> "PhoneDirectory":
+        """
+        Aplica um conjunto de alterações, sem reconstruir o diretório do zero
+
+        Args:
+            removed_hashes: Hashes dos nomes a remover
+            additions: Contatos novos ou alterados (substituem os existentes)
+
+        Returns:
+            Novo PhoneDirectory com as alterações aplicadas
+        """
+        dropped = np.concatenate(
+            [np.asarray(removed_hashes, dtype=np.uint64), additions.hashes]
+        )
+        kept = self.take(np.flatnonzero(~np.isin(self.hashes, dropped)))
+
+        kept_offsets, kept_blob = kept._name_arrays()
+        added_offsets, added_blob = additions._name_arrays()
+        kept_texts, kept_text_blob = kept._text_arrays()
+        added_texts, added_text_blob = additions._text_arrays()
+        merged = PhoneDirectory(
+            np.concatenate([kept.hashes, additions.hashes]),
+            np.concatenate([kept.phones, additions.phones]),
+            np.concatenate([kept_offsets[:-1], added_offsets + kept_offsets[-1]]),
+            np.concatenate([kept_blob, added_blob]),
+            np.concatenate([kept_texts[:-1], added_texts + kept_texts[-1]]),
+            np.concatenate([kept_text_blob, added_text_blob]),
+        )
+        return merged.take(np.argsort(merged.hashes, kind="stable"))
+
+    def names(self) -> list:
+        """
+        Retorna os nomes normalizados, na ordem interna do diretório
+
+        Returns:
+            Lista de nomes (vazia se o diretório foi criado sem nomes)
+        """
+        if self.name_offsets is None or self.name_blob is None:
+            return []
+        return _unpack_texts(self.name_offsets, self.name_blob)
+
+    def to_dict(self) -> Dict[str, str]:
+        """
+        Converte o diretório de volta para o dicionário nome -> telefone
+
+        Returns:
+            Dicionário com os telefones em dígitos, ou com o texto original se
+            fora do formato (apenas contatos com telefone)
+        """
+        phones = self._phone_texts(np.arange(len(self), dtype=np.int64))
+        return {
+            name: phone
+            for name, phone in zip(self.names(), phones)
+            if phone is not None
+        }
+
+    def save(self, path: str) -> None:
+        """
+        Salva o diretório em um único arquivo binário
+
+        Layout: cabeçalho (assinatura, quantidade, tamanho dos nomes e dos
+        telefones originais), hashes uint64, telefones int64, offsets uint64 e
+        bytes dos nomes, offsets uint64 e bytes dos telefones originais.
+
+        Args:
+            path: Caminho do arquivo de saída
+        """
+        output_dir = os.path.dirname(path)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+
+        name_offsets, name_blob = self._name_arrays()
+        text_offsets, text_blob = self._text_arrays()
+
+        header = np.zeros(_HEADER_SIZE, dtype=np.uint8)
+        header[:8] = np.frombuffer(_MAGIC, dtype=np.uint8)
+        sizes = np.array([len(self), len(name_blob), len(text_blob)], dtype="<u8")
+        header[8:32] = sizes.view(np.uint8)
+
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(header.tobytes())
+            f.write(np.ascontiguousarray(self.hashes, dtype="<u8").tobytes())
+            f.write(np.ascontiguousarray(self.phones, dtype="<i8").tobytes())
+            f.write(np.ascontiguousarray(name_offsets, dtype="<u8").tobytes())
+            f.write(np.ascontiguousarray(name_blob, dtype=np.uint8).tobytes())
+            f.write(np.ascontiguousarray(text_offsets, dtype="<u8").tobytes())
+            f.write(np.ascontiguousarray(text_blob, dtype=np.uint8).tobytes())
+        os.replace(temp_path, path)
+        logger.info(f"Diretório de telefones salvo em {path} ({len(self)} contatos)")
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "PhoneDirectory":
+        """
+        Abre um diretório salvo com save
+
+        Args:
+            path: Caminho do arquivo
+            mmap: Se True, os arrays são mapeados em memória (somente leitura)
+                e compartilhados entre processos; se False, são lidos para a RAM
+
+        Returns:
+            PhoneDirectory com os arrays do arquivo
+
+        Raises:
+            ValueError: Se o arquivo não for um diretório de telefones
+        """
+        with open(path, "rb") as f:
+            header = f.read(_HEADER_SIZE)
+        if len(header) < _HEADER_SIZE or header[:8] != _MAGIC:
+            raise ValueError(f"Arquivo não é um diretório de telefones: {path}")
+        count, blob_size, text_size = np.frombuffer(header[8:32], dtype="<u8").tolist()
+
+        def _array(dtype: str, length: int, offset: int) -> np.ndarray:
+            if length == 0:
+                return np.zeros(0, dtype=dtype)
+            if mmap:
+                return np.memmap(
+                    path, dtype=dtype, mode="r", offset=offset, shape=(length,)
+                )
+            with open(path, "rb") as f:
+                f.seek(offset)
+                data = f.read(length * np.dtype(dtype).itemsize)
+            return np.frombuffer(data, dtype=dtype)
+
+        offset = _HEADER_SIZE
+        hashes = _array("<u8", count, offset)
+        offset += count * 8
+        phones = _array("<i8", count, offset)
+        offset += count * 8
+        name_offsets = _array("<u8", count + 1, offset)
+        offset += (count + 1) * 8
+        name_blob = _array("u1", blob_size, offset)
+        offset += blob_size
+        text_offsets = _array("<u8", count + 1, offset)
+        offset += (count + 1) * 8
+        text_blob = _array("u1", text_size, offset)
+
+        logger.info(f"Diretório de telefones carregado de {path} ({count} contatos)")
+        return cls(hashes, phones, name_offsets, name_blob, text_offsets, text_blob)
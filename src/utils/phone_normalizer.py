@@ -0,0 +1,298 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Normalização de telefones brasileiros
+
+Este módulo converte colunas inteiras de telefones em texto livre ("(11) 9
+8765-4321", "11987654321", "1.1987654321E10", "+55 11 3333-4444") para uma
+forma canônica: o inteiro E.164 (5511987654321), classificado como celular
+ou fixo. Toda a conversão é vetorizada, e os valores já vistos ficam em um
+cache por valor bruto, já que os mesmos telefones se repetem entre planilhas
+e execuções. Assim, toda comparação de telefones é uma comparação exata de
+inteiros.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Iterable
+
+from src.utils.logger import get_logger
+
+# Obtendo o logger para este módulo
+logger = get_logger("utils.phone_normalizer")
+
+# Códigos de área (DDD) em uso no Brasil
+DDDS_VALIDOS = frozenset(
+    [11, 12, 13, 14, 15, 16, 17, 18, 19, 21, 22, 24, 27, 28]
+    + [31, 32, 33, 34, 35, 37, 38, 41, 42, 43, 44, 45, 46, 47, 48, 49]
+    + [51, 53, 54, 55, 61, 62, 63, 64, 65, 66, 67, 68, 69, 71, 73, 74, 75, 77, 79]
+    + [81, 82, 83, 84, 85, 86, 87, 88, 89, 91, 92, 93, 94, 95, 96, 97, 98, 99]
+)
+
+# Código do Brasil (+55)
+CODIGO_PAIS = 55
+
+# Classificação dos telefones, na ordem dos códigos usados internamente
+TIPOS = ("ausente", "invalido", "fixo", "celular")
+_AUSENTE, _INVALIDO, _FIXO, _CELULAR = range(len(TIPOS))
+
+# Versão da forma canônica; snapshots gravados com outra versão são refeitos
+PHONE_FORMAT = "e164-v2"
+
+# Quantidade máxima de valores brutos guardados no cache
+MAX_CACHE_SIZE = 1_000_000
+
+# Potências de 10 para contar os dígitos de inteiros sem converter em texto
+_POTENCIAS = 10 ** np.arange(19, dtype=np.int64)
+
+
+def pack_phones(phones: Iterable) -> np.ndarray:
+    """
+    Converte telefones em texto para inteiros (apenas os dígitos)
+
+    Args:
+        phones: Telefones originais
+
+    Returns:
+        Array int64 com os telefones; 0 indica telefone ausente ou inválido
+    """
+    text = pd.Series(phones, dtype=object).astype("string").str.strip()
+
+    # Números exportados como float ("11987654321.0", "1.1987654321E10"); os
+    # inteiros ("11987654321", "11987654321.0") não passam pelo float, que só
+    # representa 15 dígitos com exatidão
+    integral = text.str.fullmatch(r"\d+(?:\.0*)?").fillna(False)
+    numeric = text.str.fullmatch(r"\d+(?:\.\d*)?(?:[eE][+-]?\d+)?").fillna(False)
+    scientific = numeric & ~integral
+    values = pd.to_numeric(text.where(scientific), errors="coerce")
+    values = values.where(values < _POTENCIAS[-1])
+
+    digits = text.where(~scientific).str.replace(r"\.0*$", "", regex=True)
+    digits = digits.str.replace(r"\D", "", regex=True).str.slice(0, 18)
+    # Metades de até 9 dígitos são convertidas sem perda e depois combinadas
+    high = pd.to_numeric(digits.str.slice(0, -9), errors="coerce").fillna(0)
+    low = pd.to_numeric(digits.str.slice(-9), errors="coerce").fillna(0)
+    exact = high.to_numpy(dtype=np.int64) * _POTENCIAS[9] + low.to_numpy(np.int64)
+    return np.where(scientific, values.fillna(0).to_numpy(dtype=np.int64), exact)
+
+
+def count_digits(values: np.ndarray) -> np.ndarray:
+    """
+    Conta os dígitos de inteiros não negativos (vetorizado)
+
+    Args:
+        values: Array int64
+
+    Returns:
+        Array com a quantidade de dígitos (0 para o valor 0)
+    """
+    return np.searchsorted(_POTENCIAS, values, side="right")
+
+
+def split_phones(phones: Iterable) -> pd.DataFrame:
+    """
+    Decompõe telefones em número nacional, DDD e tipo (vetorizado)
+
+    O código do país (55) é removido quando presente.
+
+    Args:
+        phones: Telefones originais
+
+    Returns:
+        DataFrame alinhado à entrada com "preenchido", "nacional" (int64, 0 se
+        ausente), "digitos", "ddd" e "formato_valido" (fixo com 10 dígitos e
+        assinante iniciando em 2-5, ou celular com 11 dígitos iniciando em 9)
+    """
+    texto = pd.Series(phones, dtype=object).astype("string").str.strip()
+    preenchido = (texto.fillna("") != "").to_numpy()
+
+    nacional = pack_phones(texto)
+    digitos = count_digits(nacional)
+
+    # +55 na frente de um número nacional (12 ou 13 dígitos)
+    expoente = np.clip(digitos - 2, 0, None)
+    com_pais = ((digitos == 12) | (digitos == 13)) & (
+        nacional // _POTENCIAS[expoente] == CODIGO_PAIS
+    )
+    nacional = np.where(com_pais, nacional % _POTENCIAS[expoente], nacional)
+    digitos = np.where(com_pais, digitos - 2, digitos)
+
+    expoente = np.clip(digitos - 2, 0, None)
+    ddd = np.where(digitos >= 10, nacional // _POTENCIAS[expoente], 0)
+    assinante = np.where(digitos >= 10, (nacional // _POTENCIAS[expoente - 1]) % 10, 0)
+    formato_valido = ((digitos == 10) & (assinante >= 2) & (assinante <= 5)) | (
+        (digitos == 11) & (assinante == 9)
+    )
+
+    return pd.DataFrame(
+        {
+            "preenchido": preenchido,
+            "nacional": nacional,
+            "digitos": digitos,
+            "ddd": ddd,
+            "formato_valido": formato_valido,
+        }
+    )
+
+
+def _classify(phones: Iterable):
+    """Número canônico (int64) e código do tipo de cada telefone"""
+    partes = split_phones(phones)
+    nacional = partes["nacional"].to_numpy()
+    digitos = partes["digitos"].to_numpy()
+    valido = partes["formato_valido"].to_numpy()
+
+    # Números fora do formato ficam só com os dígitos nacionais
+    e164 = np.where(
+        valido, CODIGO_PAIS * _POTENCIAS[np.clip(digitos, 0, 16)] + nacional, nacional
+    )
+    tipo = np.select(
+        [~partes["preenchido"].to_numpy(), ~valido, digitos == 11],
+        [_AUSENTE, _INVALIDO, _CELULAR],
+        default=_FIXO,
+    ).astype(np.int8)
+    return e164.astype(np.int64), tipo
+
+
+class PhoneNormalizer:
+    """
+    Normalizador de colunas de telefones com cache por valor bruto
+    """
+
+    def __init__(self, max_cache_size: int = MAX_CACHE_SIZE):
+        """
+        Inicializa o normalizador com o cache vazio
+
+        Args:
+            max_cache_size: Quantidade máxima de valores brutos no cache; ao
+                ser atingida, o cache é esvaziado
+        """
+        self.max_cache_size = max_cache_size
+        self._keys = pd.Index([], dtype=object)
+        self._e164 = np.zeros(0, dtype=np.int64)
+        self._tipos = np.zeros(0, dtype=np.int8)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _lookup(self, keys: pd.Index):
+        """Resolve valores distintos pelo cache, classificando só os novos"""
+        positions = self._keys.get_indexer(keys)
+        missing = positions < 0
+        if missing.any():
+            if len(self._keys) + int(missing.sum()) > self.max_cache_size:
+                self._keys = self._keys[:0]
+                self._e164, self._tipos = self._e164[:0], self._tipos[:0]
+            novos = keys[missing].unique()
+            e164, tipos = _classify(novos.to_numpy(dtype=object))
+            self._keys = self._keys.append(novos)
+            self._e164 = np.concatenate([self._e164, e164])
+            self._tipos = np.concatenate([self._tipos, tipos])
+            positions = self._keys.get_indexer(keys)
+        return self._e164[positions], self._tipos[positions]
+
+    def normalize(self, phones: Iterable) -> pd.DataFrame:
+        """
+        Normaliza uma coluna de telefones (vetorizado)
+
+        Args:
+            phones: Telefones originais (texto, números ou floats exportados)
+
+        Returns:
+            DataFrame alinhado à entrada com "e164" (int64 como 5511987654321;
+            números fora do formato brasileiro ficam só com os dígitos e
+            ausentes são 0) e "tipo" (categórica: ausente, invalido, fixo ou
+            celular)
+        """
+        values = pd.Series(phones, dtype=object)
+        codes, uniques = pd.factorize(values.to_numpy())
+        keys = pd.Index(pd.Series(uniques, dtype=object).astype(str), dtype=object)
+        e164, tipos = self._lookup(keys.append(pd.Index([""], dtype=object)))
+
+        # Valores ausentes apontam para a última posição ("")
+        codes = np.where(codes < 0, len(uniques), codes)
+        return pd.DataFrame(
+            {
+                "e164": e164[codes],
+                "tipo": pd.Categorical.from_codes(tipos[codes], categories=TIPOS),
+            },
+            index=values.index,
+        )
+
+    def to_e164(self, phones: Iterable) -> np.ndarray:
+        """
+        Converte uma coluna de telefones para os inteiros canônicos
+
+        Args:
+            phones: Telefones originais
+
+        Returns:
+            Array int64 (0 para telefones ausentes ou sem dígitos)
+        """
+        return self.normalize(phones)["e164"].to_numpy()
+
+
+def format_national(e164: Iterable) -> pd.Series:
+    """
+    Formata inteiros canônicos como dígitos nacionais (DDD + número)
+
+    Args:
+        e164: Inteiros canônicos (ver PhoneNormalizer.to_e164)
+
+    Returns:
+        Série de texto como "11987654321"; None para 0
+    """
+    values = np.asarray(e164, dtype=np.int64)
+    digitos = count_digits(values)
+    expoente = np.clip(digitos - 2, 0, None)
+    com_pais = ((digitos == 12) | (digitos == 13)) & (
+        values // _POTENCIAS[expoente] == CODIGO_PAIS
+    )
+    nacional = np.where(com_pais, values % _POTENCIAS[expoente], values)
+    return pd.Series(np.where(values > 0, nacional.astype(str), None), dtype=object)
+
+
+def format_e164(e164: Iterable) -> pd.Series:
+    """
+    Formata inteiros canônicos no padrão E.164 ("+5511987654321")
+
+    Args:
+        e164: Inteiros canônicos (ver PhoneNormalizer.to_e164)
+
+    Returns:
+        Série de texto; None para 0
+    """
+    values = np.asarray(e164, dtype=np.int64)
+    texto = np.char.add("+", values.astype(str))
+    return pd.Series(np.where(values > 0, texto, None), dtype=object)
+
+
+# Normalizador compartilhado pelo processo (o cache vale entre chamadas)
+_NORMALIZER = PhoneNormalizer()
+
+
+def normalize_phones(phones: Iterable) -> pd.DataFrame:
+    """
+    Normaliza uma coluna de telefones com o normalizador compartilhado
+
+    Args:
+        phones: Telefones originais
+
+    Returns:
+        DataFrame com "e164" e "tipo" (ver PhoneNormalizer.normalize)
+    """
+    return _NORMALIZER.normalize(phones)
+
+
+def to_e164(phones: Iterable) -> np.ndarray:
+    """
+    Converte uma coluna de telefones para os inteiros canônicos
+
+    Args:
+        phones: Telefones originais
+
+    Returns:
+        Array int64 (0 para telefones ausentes ou sem dígitos)
+    """
+    return _NORMALIZER.to_e164(phones)
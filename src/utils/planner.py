@@ -0,0 +1,390 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Planejamento do uso de memória a partir dos metadados das planilhas
+
+Antes de qualquer leitura completa, este módulo mede cada planilha pelo
+diretório do ZIP (tamanhos compactado e descompactado do XML da planilha e
+dos textos compartilhados) e pela tag <dimension> (linhas e colunas). Com
+essas medidas e a memória disponível estima o pico de memória da leitura
+(pandas/openpyxl em memória ou leitura XML em fluxo), da consulta e da
+gravação da saída, e escolhe o motor de leitura, a quantidade de processos,
+o tamanho das faixas e o modo do processador que cabem no orçamento.
+
+As constantes de bytes por célula são aproximações conservadoras, medidas
+em planilhas típicas de clientes (poucas colunas de texto).
+"""
+
+import os
+import sys
+import zipfile
+from typing import Dict, List, Optional
+
+from src.utils.logger import get_logger
+from src.utils.file_handlers.parallel_reader import (
+    CHUNKS_PER_WORKER,
+    MIN_ROWS_PER_CHUNK,
+)
+from src.utils.file_handlers.sheet_stream import SHARED_STRINGS_PART
+from src.utils.file_handlers.workbook_probe import find_sheet_part, read_dimension
+
+# Obtendo o logger para este módulo
+logger = get_logger("utils.planner")
+
+# Bytes por célula: objetos do openpyxl + DataFrame de objetos (pd.read_excel)
+BYTES_CELULA_MEMORIA = 1000
+
+# Bytes por célula: construtores de colunas da leitura XML em fluxo
+BYTES_CELULA_STREAMING = 120
+
+# Bytes por célula do DataFrame resultante
+BYTES_CELULA_DATAFRAME = 60
+
+# Bytes por célula mantidos pelo openpyxl até a saída ser salva
+BYTES_CELULA_ESCRITA = 600
+
+# Bytes por linha de cada chave canônica (índices e cache dos critérios)
+BYTES_CHAVE_CONSULTA = 90
+
+# Textos compartilhados: objetos str ocupam cerca de 3x o XML
+FATOR_TEXTOS = 3
+
+# Bytes de arquivo por célula, para estimar células sem <dimension>
+BYTES_XML_POR_CELULA = 40
+BYTES_ARQUIVO_POR_CELULA = 12
+
+# Fração da memória disponível usada como orçamento padrão
+FRACAO_MEMORIA_DISPONIVEL = 0.6
+
+# Orçamento usado quando a memória disponível não pode ser obtida (2 GB)
+ORCAMENTO_PADRAO = 2 * 1024**3
+
+
+def available_memory() -> Optional[int]:
+    """
+    Memória física disponível no momento
+
+    Returns:
+        Bytes disponíveis, ou None se o sistema não informar
+    """
+    try:
+        if sys.platform == "win32":
+            import ctypes
+
+            class _MemoryStatus(ctypes.Structure):
+                _fields_ = [
+                    ("dwLength", ctypes.c_ulong),
+                    ("dwMemoryLoad", ctypes.c_ulong),
+                    ("ullTotalPhys", ctypes.c_ulonglong),
+                    ("ullAvailPhys", ctypes.c_ulonglong),
+                    ("ullTotalPageFile", ctypes.c_ulonglong),
+                    ("ullAvailPageFile", ctypes.c_ulonglong),
+                    ("ullTotalVirtual", ctypes.c_ulonglong),
+                    ("ullAvailVirtual", ctypes.c_ulonglong),
+                    ("ullAvailExtendedVirtual", ctypes.c_ulonglong),
+                ]
+
+            status = _MemoryStatus()
+            status.dwLength = ctypes.sizeof(_MemoryStatus)
+            if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+                return int(status.ullAvailPhys)
+            return None
+
+        if os.path.exists("/proc/meminfo"):
+            with open("/proc/meminfo", "r") as f:
+                for line in f:
+                    if line.startswith("MemAvailable:"):
+                        return int(line.split()[1]) * 1024
+
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def default_budget() -> int:
+    """
+    Orçamento de memória padrão
+
+    Returns:
+        FRACAO_MEMORIA_DISPONIVEL da memória disponível, ou ORCAMENTO_PADRAO
+        se ela não puder ser obtida
+    """
+    memory = available_memory()
+    if memory is None:
+        return ORCAMENTO_PADRAO
+    return int(memory * FRACAO_MEMORIA_DISPONIVEL)
+
+
+def format_bytes(size: float) -> str:
+    """
+    Formata uma quantidade de bytes para o log
+
+    Args:
+        size: Quantidade de bytes
+
+    Returns:
+        Texto como "512.0 MB"
+    """
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(size) < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} TB"
+
+
+def measure_sheet(file_path: str, sheet_name: Optional[str] = None) -> Dict:
+    """
+    Mede uma planilha pelos metadados, sem lê-la
+
+    Args:
+        file_path: Caminho do arquivo (.xlsx, .xls ou .csv)
+        sheet_name: Nome da planilha (None usa a primeira)
+
+    Returns:
+        Dicionário com "arquivo", "linhas", "colunas", "celulas",
+        "bytes_compactados", "bytes_xml" e "bytes_textos" (XML dos textos
+        compartilhados); em .xls e .csv as células são estimadas pelo
+        tamanho do arquivo
+
+    Raises:
+        ValueError: Se o XLSX for inválido ou a planilha não existir
+    """
+    size = os.path.getsize(file_path)
+    measure = {
+        "arquivo": file_path,
+        "linhas": None,
+        "colunas": None,
+        "celulas": size // BYTES_ARQUIVO_POR_CELULA,
+        "bytes_compactados": size,
+        "bytes_xml": size,
+        "bytes_textos": 0,
+    }
+    if not file_path.lower().endswith(".xlsx"):
+        return measure
+
+    try:
+        sheet_part = find_sheet_part(file_path, sheet_name)
+        with zipfile.ZipFile(file_path, "r") as zip_ref:
+            info = zip_ref.getinfo(sheet_part)
+            names = set(zip_ref.namelist())
+            textos = (
+                zip_ref.getinfo(SHARED_STRINGS_PART).file_size
+                if SHARED_STRINGS_PART in names
+                else 0
+            )
+    except (zipfile.BadZipFile, KeyError) as e:
+        raise ValueError(f"Arquivo XLSX inválido: {str(e)}")
+
+    measure.update(
+        bytes_compactados=info.compress_size,
+        bytes_xml=info.file_size,
+        bytes_textos=textos,
+        celulas=info.file_size // BYTES_XML_POR_CELULA,
+    )
+    dimension = read_dimension(file_path, sheet_part)
+    if dimension:
+        rows, columns = dimension
+        measure.update(linhas=rows, colunas=columns, celulas=rows * columns)
+    return measure
+
+
+def _linhas(measure: Dict) -> int:
+    """Linhas da planilha (estimadas pelas células se não declaradas)"""
+    if measure["linhas"] is not None:
+        return measure["linhas"]
+    return measure["celulas"] // max(measure["colunas"] or 5, 1)
+
+
+def estimate_dataframe(measure: Dict) -> int:
+    """Bytes do DataFrame carregado de uma planilha medida"""
+    return measure["celulas"] * BYTES_CELULA_DATAFRAME
+
+
+def estimate_load(measure: Dict, engine: str = "memoria", workers: int = 1) -> int:
+    """
+    Estima o pico de memória da leitura de uma planilha
+
+    Args:
+        measure: Resultado de measure_sheet
+        engine: 'memoria' (pd.read_excel) ou 'streaming' (leitura XML)
+        workers: Processos da leitura em fluxo
+
+    Returns:
+        Bytes estimados no pico da leitura
+    """
+    textos = measure["bytes_textos"] * FATOR_TEXTOS
+    dataframe = estimate_dataframe(measure)
+    if engine == "memoria":
+        return measure["celulas"] * BYTES_CELULA_MEMORIA + textos + dataframe
+    if workers <= 1:
+        return measure["celulas"] * BYTES_CELULA_STREAMING + textos + dataframe
+
+    # Cada processo recebe os textos e decodifica uma faixa por vez; o
+    # processo principal envia o XML das faixas e junta as colunas
+    chunk_cells = measure["celulas"] / (workers * CHUNKS_PER_WORKER)
+    return int(
+        measure["bytes_xml"]
+        + textos * (workers + 1)
+        + workers * chunk_cells * BYTES_CELULA_STREAMING
+        + 2 * dataframe
+    )
+
+
+def estimate_query(measure: Dict, n_criteria: int = 1) -> int:
+    """
+    Estima o pico de memória de execute_query sobre uma planilha fonte
+
+    Args:
+        measure: Resultado de measure_sheet (planilha fonte)
+        n_criteria: Quantidade de critérios
+
+    Returns:
+        Bytes estimados (fonte, chaves dos critérios e resultado completo)
+    """
+    dataframe = estimate_dataframe(measure)
+    return 2 * dataframe + _linhas(measure) * max(n_criteria, 1) * BYTES_CHAVE_CONSULTA
+
+
+def estimate_output(
+    measures: List[Dict], pipeline: bool = False, depth: int = 2
+) -> int:
+    """
+    Estima o pico de memória do processador ao gravar a saída consolidada
+
+    Args:
+        measures: Medidas das planilhas de clientes
+        pipeline: Se True, só as planilhas nas filas ficam em memória
+        depth: Profundidade das filas do pipeline
+
+    Returns:
+        Bytes estimados (células mantidas pelo openpyxl e DataFrames retidos)
+    """
+    # A saída tem uma coluna a mais (Telefone)
+    cells = sum(m["celulas"] + _linhas(m) for m in measures)
+    dataframes = sorted((estimate_dataframe(m) for m in measures), reverse=True)
+    if pipeline:
+        dataframes = dataframes[: 2 * depth + 1]
+    return cells * BYTES_CELULA_ESCRITA + sum(dataframes)
+
+
+def plan_load(
+    measure: Dict, budget: Optional[int] = None, cpu_count: Optional[int] = None
+) -> Dict:
+    """
+    Escolhe como ler uma planilha dentro do orçamento de memória
+
+    A leitura em memória (pd.read_excel) é mantida sempre que cabe; senão um
+    XLSX é lido em fluxo, em paralelo com o maior número de processos que
+    caiba, ou sequencialmente.
+
+    Args:
+        measure: Resultado de measure_sheet
+        budget: Orçamento em bytes (None usa default_budget)
+        cpu_count: Núcleos disponíveis (None usa os.cpu_count)
+
+    Returns:
+        Dicionário com "motor" ('memoria' ou 'streaming'), "processos",
+        "linhas_por_faixa", "pico_estimado", "orcamento" e "cabe"
+    """
+    budget = budget or default_budget()
+    cpu_count = cpu_count or os.cpu_count() or 1
+    rows = _linhas(measure)
+    plan = {
+        "motor": "memoria",
+        "processos": 1,
+        "linhas_por_faixa": MIN_ROWS_PER_CHUNK,
+        "pico_estimado": estimate_load(measure, "memoria"),
+        "orcamento": budget,
+    }
+
+    # Só o XLSX tem leitura em fluxo; os demais formatos ficam em memória
+    streamable = measure["arquivo"].lower().endswith(".xlsx")
+    if streamable and plan["pico_estimado"] > budget:
+        plan.update(
+            motor="streaming", pico_estimado=estimate_load(measure, "streaming")
+        )
+
+        # Paralelismo só compensa com ao menos duas faixas de MIN_ROWS_PER_CHUNK
+        max_workers = min(cpu_count, rows // (2 * MIN_ROWS_PER_CHUNK))
+        for workers in range(max_workers, 1, -1):
+            peak = estimate_load(measure, "streaming", workers)
+            if peak <= budget:
+                plan.update(
+                    processos=workers,
+                    linhas_por_faixa=max(
+                        MIN_ROWS_PER_CHUNK, rows // (workers * CHUNKS_PER_WORKER)
+                    ),
+                    pico_estimado=peak,
+                )
+                break
+
+    plan["cabe"] = plan["pico_estimado"] <= budget
+    return plan
+
+
+def plan_batch(
+    measures: List[Dict],
+    budget: Optional[int] = None,
+    pipeline: bool = False,
+    depth: int = 2,
+) -> Dict:
+    """
+    Escolhe o modo do processador para um lote de planilhas de clientes
+
+    Args:
+        measures: Medidas das planilhas de clientes
+        budget: Orçamento em bytes (None usa default_budget)
+        pipeline: Se o pipeline já foi pedido (nunca é desligado)
+        depth: Profundidade das filas pedida
+
+    Returns:
+        Dicionário com "motores" (arquivo -> plano de plan_load),
+        "pipeline", "profundidade_fila", "pico_estimado", "orcamento" e
+        "cabe"
+    """
+    budget = budget or default_budget()
+    motores = {m["arquivo"]: plan_load(m, budget, cpu_count=1) for m in measures}
+    maior_leitura = max((p["pico_estimado"] for p in motores.values()), default=0)
+
+    def pico(pipeline_: bool, depth_: int) -> int:
+        return estimate_output(measures, pipeline_, depth_) + maior_leitura
+
+    if not pipeline and pico(False, depth) > budget:
+        pipeline = True
+    if pipeline:
+        while depth > 1 and pico(True, depth) > budget:
+            depth -= 1
+
+    peak = pico(pipeline, depth)
+    return {
+        "motores": motores,
+        "pipeline": pipeline,
+        "profundidade_fila": depth,
+        "pico_estimado": peak,
+        "orcamento": budget,
+        "cabe": peak <= budget,
+    }
+
+
+def log_plan(descricao: str, plan: Dict) -> None:
+    """
+    Registra no log o plano escolhido
+
+    Args:
+        descricao: O que está sendo planejado (ex. "Leitura de fonte.xlsx")
+        plan: Resultado de plan_load ou plan_batch
+    """
+    detalhes = ", ".join(
+        f"{key}={value}"
+        for key, value in plan.items()
+        if key not in ("motores", "pico_estimado", "orcamento", "cabe")
+    )
+    message = (
+        f"Plano de memória - {descricao}: {detalhes}; pico estimado "
+        f"{format_bytes(plan['pico_estimado'])} de {format_bytes(plan['orcamento'])}"
+    )
+    if plan["cabe"]:
+        logger.info(message)
+    else:
+        logger.warning(f"{message} (acima do orçamento)")
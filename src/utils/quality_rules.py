@@ -0,0 +1,168 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Regras de qualidade para as colunas de telefone e de cliente
+
+Cada regra é aplicada à coluna inteira com operações vetorizadas (NumPy e
+métodos .str do pandas), sem laços Python por linha: telefones são
+convertidos em inteiros, e repetições e conflitos entre linhas são
+encontrados por hash. O resultado de cada regra é a quantidade de
+ocorrências e os identificadores (índice do DataFrame) das linhas afetadas.
+"""
+
+import re
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, Optional
+
+from src.utils.logger import get_logger
+from src.utils.phone_directory import hash_names, normalize_names
+from src.utils.phone_normalizer import DDDS_VALIDOS, split_phones
+
+# Obtendo o logger para este módulo
+logger = get_logger("utils.quality_rules")
+
+# Nomes usados como preenchimento, e não como nome de cliente
+_NOMES_GENERICOS = frozenset(
+    {"teste", "cliente", "nome", "sem nome", "nao informado", "nao sei", "x", "xx"}
+)
+
+# Descrição de cada regra, na ordem do relatório
+REGRAS = {
+    "telefone_malformado": "Telefone fora do formato brasileiro (DDD + 8 ou 9 dígitos)",
+    "ddd_invalido": "Telefone com DDD inexistente",
+    "telefone_duplicado": "Telefone repetido em mais de uma linha",
+    "telefone_compartilhado": "Mesmo telefone para clientes diferentes",
+    "cliente_com_telefones_diferentes": "Mesmo cliente com telefones diferentes",
+    "nome_suspeito": "Nome de cliente vazio, genérico, curto ou com dígitos",
+}
+
+
+def _nomes_sem_acento(nomes: pd.Series) -> pd.Series:
+    """Nomes normalizados sem acentos, para comparar com os nomes genéricos"""
+    return (
+        nomes.astype(object)
+        .str.normalize("NFKD")
+        .str.encode("ascii", "ignore")
+        .str.decode("ascii")
+    )
+
+
+def _valores_distintos(values: np.ndarray):
+    """
+    Fatora uma coluna em códigos e valores distintos (o último é o ausente)
+
+    As regras são avaliadas só nos valores distintos e levadas às linhas
+    pelos códigos, pois nomes e telefones se repetem muito nas planilhas.
+    """
+    codes, uniques = pd.factorize(values)
+    codes[codes < 0] = len(uniques)
+    return codes, np.append(np.asarray(uniques, dtype=object), None)
+
+
+def _conflitos(chaves: np.ndarray, valores: np.ndarray, validos: np.ndarray):
+    """Linhas cuja chave aparece associada a mais de um valor distinto"""
+    pares = pd.DataFrame({"chave": chaves[validos], "valor": valores[validos]})
+    contagem = pares.drop_duplicates()["chave"].value_counts()
+    em_conflito = contagem.index[contagem > 1].to_numpy()
+    return validos & np.isin(chaves, em_conflito)
+
+
+def find_name_column(columns: Iterable) -> Optional[str]:
+    """
+    Identifica a coluna de nome do cliente pelo cabeçalho
+
+    Args:
+        columns: Rótulos das colunas
+
+    Returns:
+        Primeiro rótulo que contenha "nome" ou "cliente"; sem nenhum, a
+        terceira coluna (coluna C, layout das planilhas de clientes); ou None
+    """
+    columns = list(columns)
+    for column in columns:
+        if re.search(r"nome|cliente", str(column), flags=re.IGNORECASE):
+            return column
+    return columns[2] if len(columns) > 2 else None
+
+
+def run_quality_rules(
+    df: pd.DataFrame,
+    phone_column: str = "Telefone",
+    name_column: Optional[str] = None,
+) -> Dict[str, Dict]:
+    """
+    Aplica as regras de qualidade às colunas de telefone e de cliente
+
+    Regras de telefone são aplicadas só se a coluna existir; as de conflito
+    entre linhas exigem as duas colunas.
+
+    Args:
+        df: Planilha a verificar
+        phone_column: Coluna de telefones
+        name_column: Coluna de nomes (None usa find_name_column)
+
+    Returns:
+        Dicionário regra -> {"descricao", "ocorrencias", "linhas"}, em que
+        "linhas" é um array com o índice das linhas afetadas
+    """
+    if name_column is None:
+        name_column = find_name_column(c for c in df.columns if c != phone_column)
+
+    masks = {}
+    telefones = None
+    if phone_column in df.columns:
+        codes, distintos = _valores_distintos(df[phone_column].to_numpy())
+        telefones = split_phones(distintos)
+        preenchido = telefones["preenchido"].to_numpy()[codes]
+        formato_valido = telefones["formato_valido"].to_numpy()[codes]
+        nacional = telefones["nacional"].to_numpy()[codes]
+        ddd_valido = np.isin(telefones["ddd"].to_numpy(), list(DDDS_VALIDOS))[codes]
+
+        masks["telefone_malformado"] = preenchido & ~formato_valido
+        masks["ddd_invalido"] = formato_valido & ~ddd_valido
+        masks["telefone_duplicado"] = formato_valido & (
+            pd.Series(np.where(formato_valido, nacional, -1))
+            .duplicated(keep=False)
+            .to_numpy()
+        )
+
+    if name_column is not None and name_column in df.columns:
+        codes, distintos = _valores_distintos(df[name_column].to_numpy())
+        nomes = normalize_names(distintos)
+        nome_preenchido = (nomes.fillna("") != "").to_numpy()
+        hashes = hash_names(nomes)[codes]
+
+        if telefones is not None:
+            validos = formato_valido & nome_preenchido[codes]
+            masks["telefone_compartilhado"] = _conflitos(nacional, hashes, validos)
+            masks["cliente_com_telefones_diferentes"] = _conflitos(
+                hashes, nacional, validos
+            )
+
+        suspeito = (
+            ~nome_preenchido
+            | (nomes.str.len() < 3).fillna(False).to_numpy()
+            | nomes.str.contains(r"\d", regex=True).fillna(False).to_numpy()
+            | ~nomes.str.contains(r"[^\W\d_]", regex=True).fillna(False).to_numpy()
+            | _nomes_sem_acento(nomes).isin(_NOMES_GENERICOS).to_numpy()
+        )
+        masks["nome_suspeito"] = suspeito[codes]
+
+    resultados = {}
+    for regra, descricao in REGRAS.items():
+        if regra not in masks:
+            continue
+        linhas = df.index.to_numpy()[masks[regra]]
+        resultados[regra] = {
+            "descricao": descricao,
+            "ocorrencias": int(len(linhas)),
+            "linhas": linhas,
+        }
+
+    logger.info(
+        "Regras de qualidade: "
+        + ", ".join(f"{r} {v['ocorrencias']}" for r, v in resultados.items())
+    )
+    return resultados
@@ -9,20 +9,51 @@ validar os dados extraídos e gerar relatórios de validação.
 """
 
 import os
+import csv
+import glob
+import json
+import zipfile
+import numpy as np
 import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
 from typing import Dict, List, Tuple, Optional
 
+from src.utils.file_handlers.column_builders import (
+    RowDecoder,
+    assemble_frame,
+    iter_cells,
+    iter_row_elements,
+    read_date_context,
+)
+from src.utils.file_handlers.sheet_stream import read_shared_strings
+from src.utils.file_handlers.workbook_probe import probe_workbook
+from src.utils.quality_rules import find_name_column, run_quality_rules
+
+# Formatos considerados na verificação em lote
+EXTENSOES_VERIFICADAS = (".xlsx", ".xls", ".csv")
+
+# Linhas listadas por regra de qualidade (a contagem considera todas)
+MAX_LINHAS_QUALIDADE = 1000
+
 
 def verificar_planilha(
-    arquivo: str, mostrar_linhas: int = 5, verificar_telefones: bool = True
+    arquivo: str,
+    mostrar_linhas: int = 5,
+    verificar_telefones: bool = True,
+    verificar_qualidade: bool = True,
 ) -> Dict:
     """
     Verifica o conteúdo de uma planilha Excel e retorna informações sobre ela
 
+    Todas as estatísticas (linhas, telefones preenchidos, nulos e repetidos
+    por coluna) são calculadas em uma única leitura de cada planilha.
+
     Args:
-        arquivo: Caminho para o arquivo Excel
+        arquivo: Caminho para o arquivo Excel (ou CSV)
         mostrar_linhas: Número de linhas a serem mostradas no relatório
         verificar_telefones: Se deve verificar a coluna de telefones
+        verificar_qualidade: Se deve aplicar as regras de qualidade às colunas
+            de telefone e de cliente (ver src.utils.quality_rules)
 
     Returns:
         Dicionário com informações sobre a planilha
@@ -42,29 +73,59 @@ def verificar_planilha(
     resultados["existe"] = True
 
     try:
-        # Abrir o arquivo Excel
-        xls = pd.ExcelFile(arquivo)
-        resultados["planilhas"] = xls.sheet_names
-
-        # Para cada planilha, mostrar informações
-        for sheet_name in xls.sheet_names:
-            df = pd.read_excel(arquivo, sheet_name=sheet_name)
-
-            info_planilha = {
-                "linhas": len(df),
-                "colunas": df.columns.tolist(),
-                "primeiras_linhas": df.head(mostrar_linhas).to_dict(orient="records"),
-            }
-
-            # Verificar quantas linhas têm telefone preenchido
-            if verificar_telefones and "Telefone" in df.columns:
-                telefones_preenchidos = df["Telefone"].notna().sum()
-                info_planilha["telefones_preenchidos"] = telefones_preenchidos
-                info_planilha["percentual_preenchido"] = (
-                    (telefones_preenchidos / len(df)) * 100 if len(df) > 0 else 0
+        if arquivo.lower().endswith(".xlsx"):
+            # Metadados de todas as planilhas, sem carregar os dados
+            planilhas = probe_workbook(arquivo)
+            resultados["planilhas"] = [planilha["name"] for planilha in planilhas]
+            textos = read_shared_strings(arquivo)
+            with zipfile.ZipFile(arquivo, "r") as zip_ref:
+                contexto_datas = read_date_context(zip_ref)
+
+            for planilha in planilhas:
+                linhas, primeiras_linhas, estatisticas, qualidade = (
+                    _varrer_planilha_xlsx(
+                        arquivo,
+                        planilha["part"],
+                        textos,
+                        contexto_datas,
+                        mostrar_linhas,
+                        verificar_qualidade,
+                    )
+                )
+                resultados["dados"][planilha["name"]] = _info_planilha(
+                    linhas,
+                    primeiras_linhas,
+                    estatisticas,
+                    verificar_telefones,
+                    qualidade,
+                )
+        else:
+            if arquivo.lower().endswith(".csv"):
+                nome = os.path.splitext(os.path.basename(arquivo))[0]
+                planilhas = {nome: pd.read_csv(arquivo)}
+            else:
+                # Uma única abertura do arquivo para todas as planilhas
+                planilhas = pd.read_excel(arquivo, sheet_name=None)
+            resultados["planilhas"] = list(planilhas)
+
+            for sheet_name, df in planilhas.items():
+                preenchidos = df.notna().sum()
+                estatisticas = {
+                    str(coluna): {
+                        "preenchidos": int(preenchidos[coluna]),
+                        "nulos": int(len(df) - preenchidos[coluna]),
+                        "duplicados": int(preenchidos[coluna] - distintos),
+                    }
+                    for coluna, distintos in df.nunique().items()
+                }
+                resultados["dados"][sheet_name] = _info_planilha(
+                    len(df),
+                    df.head(mostrar_linhas),
+                    estatisticas,
+                    verificar_telefones,
+                    # Linhas identificadas pelo número na planilha (cabeçalho = 1)
+                    df.set_axis(df.index + 2) if verificar_qualidade else None,
                 )
-
-            resultados["dados"][sheet_name] = info_planilha
 
     except Exception as e:
         resultados["erro"] = str(e)
@@ -72,8 +133,157 @@ def verificar_planilha(
     return resultados
 
 
+def _varrer_planilha_xlsx(
+    arquivo: str,
+    parte: str,
+    textos: np.ndarray,
+    contexto_datas: Tuple,
+    mostrar_linhas: int,
+    verificar_qualidade: bool = True,
+) -> Tuple[int, pd.DataFrame, Dict[str, Dict[str, int]], Optional[pd.DataFrame]]:
+    """
+    Percorre uma planilha XLSX uma única vez, sem montar o DataFrame completo
+
+    Args:
+        arquivo: Caminho para o arquivo XLSX
+        parte: Caminho da planilha dentro do ZIP
+        textos: Tabela de textos compartilhados
+        contexto_datas: Resultado de read_date_context
+        mostrar_linhas: Número de linhas decodificadas para o relatório
+        verificar_qualidade: Se deve guardar as colunas de telefone e de
+            cliente para as regras de qualidade
+
+    Returns:
+        Tupla (linhas de dados, primeiras linhas, estatísticas por coluna,
+        colunas de telefone e cliente indexadas pelo número da linha, ou None)
+    """
+    decoder = RowDecoder(textos, *contexto_datas)
+    cabecalho = None
+    linha_cabecalho = 0
+    linhas = 0
+    preenchidos: Dict[int, int] = {}
+    vistos: Dict[int, set] = {}
+    selecionadas: Dict[int, list] = {}
+    numeros = []
+
+    with zipfile.ZipFile(arquivo, "r") as zip_ref:
+        with zip_ref.open(parte) as stream:
+            for posicao, row in enumerate(iter_row_elements(stream), 1):
+                # Linhas vazias não aparecem no XML; o número vem do atributo r
+                numero = int(row.get("r") or posicao)
+                if cabecalho is None:
+                    cabecalho = decoder.header(row)
+                    linha_cabecalho = numero
+                    if verificar_qualidade:
+                        selecionadas = _colunas_qualidade(cabecalho)
+                    continue
+                linhas = numero - linha_cabecalho
+                if decoder.n_rows < mostrar_linhas:
+                    decoder.add_row(row)
+
+                valores = {}
+                for coluna, tipo, valor, _ in iter_cells(row):
+                    if valor is None or valor == "":
+                        continue
+                    preenchidos[coluna] = preenchidos.get(coluna, 0) + 1
+                    # Só o hash do valor bruto é guardado, para limitar a memória
+                    vistos.setdefault(coluna, set()).add(hash((tipo, valor)))
+                    if coluna in selecionadas:
+                        valores[coluna] = textos[int(valor)] if tipo == "s" else valor
+
+                if selecionadas:
+                    numeros.append(numero)
+                    for coluna, lista in selecionadas.items():
+                        lista.append(valores.get(coluna))
+
+    colunas = decoder.build_columns()
+    for coluna in preenchidos:
+        colunas.setdefault(
+            coluna, pd.Series(np.full(decoder.n_rows, None, dtype=object))
+        )
+    primeiras_linhas = assemble_frame(cabecalho or {}, colunas, decoder.n_rows)
+    indices = sorted(set(cabecalho or {}) | set(colunas))
+
+    estatisticas = {}
+    for indice, rotulo in zip(indices, primeiras_linhas.columns):
+        total = preenchidos.get(indice, 0)
+        estatisticas[rotulo] = {
+            "preenchidos": total,
+            "nulos": linhas - total,
+            "duplicados": total - len(vistos.get(indice, ())),
+        }
+
+    qualidade = None
+    if selecionadas:
+        qualidade = pd.DataFrame(
+            {str(cabecalho[coluna]): lista for coluna, lista in selecionadas.items()},
+            index=numeros,
+        )
+    return linhas, primeiras_linhas, estatisticas, qualidade
+
+
+def _colunas_qualidade(cabecalho: Dict[int, str]) -> Dict[int, list]:
+    """Colunas de telefone e de cliente da planilha, pelo cabeçalho"""
+    rotulos = {str(rotulo): coluna for coluna, rotulo in sorted(cabecalho.items())}
+    if "Telefone" not in rotulos:
+        return {}
+    nome = find_name_column(r for r in rotulos if r != "Telefone")
+    colunas = [rotulos["Telefone"]] + ([rotulos[nome]] if nome else [])
+    return {coluna: [] for coluna in colunas}
+
+
+def _info_planilha(
+    linhas: int,
+    primeiras_linhas: pd.DataFrame,
+    estatisticas: Dict[str, Dict[str, int]],
+    verificar_telefones: bool,
+    qualidade: Optional[pd.DataFrame] = None,
+) -> Dict:
+    """
+    Monta as informações de uma planilha para o relatório
+
+    Args:
+        linhas: Quantidade de linhas de dados
+        primeiras_linhas: Primeiras linhas da planilha
+        estatisticas: Preenchidos, nulos e repetidos por coluna
+        verificar_telefones: Se deve verificar a coluna de telefones
+        qualidade: Colunas às quais aplicar as regras de qualidade
+
+    Returns:
+        Dicionário com as informações da planilha
+    """
+    info_planilha = {
+        "linhas": linhas,
+        "colunas": list(estatisticas),
+        "primeiras_linhas": primeiras_linhas.to_dict(orient="records"),
+        "estatisticas": estatisticas,
+    }
+
+    # Verificar quantas linhas têm telefone preenchido
+    if verificar_telefones and "Telefone" in estatisticas:
+        telefones_preenchidos = estatisticas["Telefone"]["preenchidos"]
+        info_planilha["telefones_preenchidos"] = telefones_preenchidos
+        info_planilha["percentual_preenchido"] = (
+            (telefones_preenchidos / linhas) * 100 if linhas > 0 else 0
+        )
+
+    if qualidade is not None and "Telefone" in qualidade.columns:
+        info_planilha["qualidade"] = {
+            regra: {
+                "descricao": resultado["descricao"],
+                "ocorrencias": resultado["ocorrencias"],
+                "linhas": resultado["linhas"][:MAX_LINHAS_QUALIDADE].tolist(),
+            }
+            for regra, resultado in run_quality_rules(qualidade).items()
+        }
+
+    return info_planilha
+
+
 def gerar_relatorio_verificacao(
-    arquivo: str, diretorio_saida: str = "dados/saida"
+    arquivo: str,
+    diretorio_saida: str = "dados/saida",
+    resultados: Optional[Dict] = None,
 ) -> str:
     """
     Gera um relatório de verificação em formato texto
@@ -81,11 +291,13 @@ def gerar_relatorio_verificacao(
     Args:
         arquivo: Caminho para o arquivo Excel a ser verificado
         diretorio_saida: Diretório onde o relatório será salvo
+        resultados: Resultado de verificar_planilha, se já calculado
 
     Returns:
         Caminho para o arquivo de relatório gerado
     """
-    resultados = verificar_planilha(arquivo)
+    if resultados is None:
+        resultados = verificar_planilha(arquivo)
 
     # Garantir que o diretório de saída existe
     os.makedirs(diretorio_saida, exist_ok=True)
@@ -116,7 +328,7 @@ def gerar_relatorio_verificacao(
             f.write(f"PLANILHA: {sheet_name}\n")
             f.write("-" * 40 + "\n")
             f.write(f"Total de linhas: {info['linhas']}\n")
-            f.write(f"Colunas: {', '.join(info['colunas'])}\n")
+            f.write(f"Colunas: {', '.join(map(str, info['colunas']))}\n")
 
             if "telefones_preenchidos" in info:
                 f.write(
@@ -124,6 +336,22 @@ def gerar_relatorio_verificacao(
                 )
                 f.write(f"({info['percentual_preenchido']:.1f}%)\n")
 
+            f.write("\nNulos e repetidos por coluna:\n")
+            for coluna, estatistica in info["estatisticas"].items():
+                f.write(
+                    f"  {coluna}: {estatistica['nulos']} nulos, "
+                    f"{estatistica['duplicados']} repetidos\n"
+                )
+
+            if "qualidade" in info:
+                f.write("\nRegras de qualidade:\n")
+                for resultado in info["qualidade"].values():
+                    f.write(f"  {resultado['descricao']}: {resultado['ocorrencias']}")
+                    if resultado["linhas"]:
+                        exemplos = ", ".join(map(str, resultado["linhas"][:10]))
+                        f.write(f" (linhas {exemplos})")
+                    f.write("\n")
+
             f.write("\nPrimeiras linhas:\n")
             for i, linha in enumerate(info["primeiras_linhas"]):
                 f.write(f"{i+1}. {linha}\n")
@@ -134,7 +362,160 @@ def gerar_relatorio_verificacao(
     return arquivo_relatorio
 
 
+def listar_arquivos(origem: str) -> List[str]:
+    """
+    Lista os arquivos de dados de um diretório ou de um padrão glob
+
+    Args:
+        origem: Diretório (não recursivo) ou padrão como "dados/saida/*.xlsx"
+
+    Returns:
+        Caminhos dos arquivos em ordem alfabética (arquivos temporários do
+        Excel, "~$...", são ignorados)
+    """
+    if os.path.isdir(origem):
+        candidatos = [os.path.join(origem, nome) for nome in os.listdir(origem)]
+    else:
+        candidatos = glob.glob(origem)
+    return sorted(
+        caminho
+        for caminho in candidatos
+        if os.path.isfile(caminho)
+        and caminho.lower().endswith(EXTENSOES_VERIFICADAS)
+        and not os.path.basename(caminho).startswith("~$")
+    )
+
+
+def _verificar_e_relatar(
+    arquivo: str, diretorio_saida: str, mostrar_linhas: int
+) -> Dict:
+    """Verifica um arquivo do lote e grava seu relatório em texto"""
+    resultados = verificar_planilha(arquivo, mostrar_linhas=mostrar_linhas)
+    resultados["relatorio"] = gerar_relatorio_verificacao(
+        arquivo, diretorio_saida, resultados
+    )
+    return resultados
+
+
+def verificar_lote(
+    origem: str,
+    diretorio_saida: str = "dados/saida",
+    max_workers: Optional[int] = None,
+    mostrar_linhas: int = 5,
+) -> Dict[str, str]:
+    """
+    Verifica em paralelo todos os arquivos de um diretório ou padrão glob
+
+    Cada arquivo recebe seu relatório em texto, e um relatório consolidado é
+    gravado em JSON (completo) e em CSV (uma linha por planilha).
+
+    Args:
+        origem: Diretório ou padrão glob dos arquivos a verificar
+        diretorio_saida: Diretório onde os relatórios serão salvos
+        max_workers: Quantidade de processos (None usa todos os núcleos)
+        mostrar_linhas: Número de linhas mostradas em cada relatório
+
+    Returns:
+        Dicionário com os caminhos "json" e "csv" do relatório consolidado
+        (vazio se nenhum arquivo for encontrado)
+    """
+    arquivos = listar_arquivos(origem)
+    if not arquivos:
+        print(f"Nenhum arquivo para verificar em {origem}")
+        return {}
+
+    os.makedirs(diretorio_saida, exist_ok=True)
+    workers = min(max_workers or os.cpu_count() or 1, len(arquivos))
+    if workers <= 1:
+        lote = [
+            _verificar_e_relatar(arquivo, diretorio_saida, mostrar_linhas)
+            for arquivo in arquivos
+        ]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(
+                    _verificar_e_relatar, arquivo, diretorio_saida, mostrar_linhas
+                )
+                for arquivo in arquivos
+            ]
+            lote = [future.result() for future in futures]
+
+    caminho_json = os.path.join(diretorio_saida, "verificacao_lote.json")
+    with open(caminho_json, "w", encoding="utf-8") as f:
+        json.dump(lote, f, ensure_ascii=False, indent=2, default=str)
+
+    caminho_csv = os.path.join(diretorio_saida, "verificacao_lote.csv")
+    with open(caminho_csv, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(
+            [
+                "arquivo",
+                "planilha",
+                "linhas",
+                "colunas",
+                "telefones_preenchidos",
+                "percentual_preenchido",
+                "nulos",
+                "duplicados",
+                "problemas_qualidade",
+                "erro",
+            ]
+        )
+        for resultados in lote:
+            if not resultados["dados"]:
+                writer.writerow(
+                    [
+                        resultados["arquivo"],
+                        "",
+                        "",
+                        "",
+                        "",
+                        "",
+                        "",
+                        "",
+                        "",
+                        resultados["erro"],
+                    ]
+                )
+            for sheet_name, info in resultados["dados"].items():
+                estatisticas = info["estatisticas"].values()
+                writer.writerow(
+                    [
+                        resultados["arquivo"],
+                        sheet_name,
+                        info["linhas"],
+                        len(info["colunas"]),
+                        info.get("telefones_preenchidos", ""),
+                        (
+                            f"{info['percentual_preenchido']:.1f}"
+                            if "percentual_preenchido" in info
+                            else ""
+                        ),
+                        sum(e["nulos"] for e in estatisticas),
+                        sum(e["duplicados"] for e in estatisticas),
+                        sum(
+                            r["ocorrencias"] for r in info.get("qualidade", {}).values()
+                        ),
+                        resultados["erro"] or "",
+                    ]
+                )
+
+    print(
+        f"{len(lote)} arquivos verificados; relatório consolidado em {caminho_json} "
+        f"e {caminho_csv}"
+    )
+    return {"json": caminho_json, "csv": caminho_csv}
+
+
 if __name__ == "__main__":
+    import sys
+
+    # Verificação em lote: python -m src.utils.verificador "dados/saida/*.xlsx"
+    if len(sys.argv) > 1:
+        verificar_lote(sys.argv[1])
+        sys.exit(0)
+
     # Exemplo de uso
     arquivo_para_verificar = "dados/saida/Clientes_Com_Telefones.xlsx"
     if os.path.exists(arquivo_para_verificar):
@@ -5,6 +5,7 @@ Configuração global dos testes do Lilica Excel
 import os
 import sys
 import pytest
+from openpyxl import Workbook
 
 # Adicionar diretório raiz ao path para importações
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
@@ -18,3 +19,18 @@ def setup_test_env():
     yield
     # Limpar variáveis de ambiente após os testes
     os.environ.pop("LILICA_TEST_MODE", None)
+
+
+@pytest.fixture
+def arquivo_grande(tmp_path):
+    """Fixture que cria uma pasta com duas planilhas, a segunda com 100 clientes"""
+    caminho = str(tmp_path / "clientes.xlsx")
+    planilha = Workbook()
+    planilha.active.title = "Resumo"
+    planilha.active.append(["Total"])
+    aba = planilha.create_sheet("Clientes")
+    aba.append(["Codigo", "Nome", "Telefone"])
+    for i in range(100):
+        aba.append([i, f"Cliente {i}", f"119{i:08d}" if i % 4 else None])
+    planilha.save(caminho)
+    return caminho
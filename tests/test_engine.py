@@ -0,0 +1,326 @@
+"""
+Testes para o motor de consulta (DataFinder)
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core.cache import EvaluationCache
+from src.core.engine import DataFinder
+from src.core.fuzzy import SymSpellIndex, edit_distance, normalize_text, normalize_texts
+from src.core.tokens import TokenIndex
+from src.core.keys import canonicalize_keys
+
+
+# Fixtures
+@pytest.fixture
+def finder():
+    """Fixture que cria um DataFinder com dados fonte e de consulta em memória"""
+    finder = DataFinder()
+    finder.source_data = pd.DataFrame(
+        {
+            "ID": ["00123", "456", "789", "123.0"],
+            "Nome": ["Ana Souza", "Bruno Lima", "Carla Dias", "Ana Maria"],
+        }
+    )
+    finder.query_data = pd.DataFrame({"Codigo": [123, 789.0]})
+    return finder
+
+
+# Testes
+def test_canonicalize_keys_unifica_formatos_numericos():
+    """Testa se inteiros, floats, notação científica e zeros à esquerda se unificam"""
+    valores = pd.Series([123, 123.0, "00123", " 123.00 ", "1.23E2", None], dtype=object)
+    chaves = canonicalize_keys(valores)
+    assert chaves.iloc[:5].tolist() == ["123"] * 5
+    assert pd.isna(chaves.iloc[5])
+
+
+def test_canonicalize_keys_float_column_and_case():
+    """Testa colunas float e a conversão para minúsculas"""
+    assert canonicalize_keys(pd.Series([1.1987654321e10, 2.5])).tolist() == [
+        "11987654321",
+        "2.5",
+    ]
+    assert canonicalize_keys(pd.Series(["  Ana   SOUZA "])).tolist() == ["ana souza"]
+    assert canonicalize_keys(pd.Series(["Ana"]), case_sensitive=True).tolist() == [
+        "Ana"
+    ]
+
+
+def test_execute_query_equals_com_tipos_diferentes(finder):
+    """Testa 'equals' entre consulta numérica e coluna fonte textual"""
+    finder.add_criteria("Codigo", "ID", operation="equals")
+    assert finder.execute_query()
+    assert sorted(finder.results["Nome"]) == ["Ana Maria", "Ana Souza", "Carla Dias"]
+
+
+def test_execute_query_reaproveita_cache_de_avaliacao(finder):
+    """Testa se valores repetidos e execuções seguidas usam o cache"""
+    finder.query_data = pd.DataFrame({"Nome": ["ana", "ana", "ANA"]})
+    finder.add_criteria("Nome", "Nome", operation="contains")
+    assert finder.execute_query()
+    stats = finder.evaluation_cache.get_stats()
+    assert stats["misses"] == 2 and stats["hits"] == 1
+
+    assert finder.execute_query()
+    assert finder.evaluation_cache.get_stats()["hits"] == 4
+
+    # Uma nova fonte invalida as entradas anteriores
+    finder.source_data = finder.source_data.copy()
+    assert finder.execute_query()
+    assert finder.evaluation_cache.get_stats()["misses"] == 4
+
+
+def test_evaluation_cache_respeita_limite_de_memoria():
+    """Testa a remoção LRU quando o limite de memória é atingido"""
+    cache = EvaluationCache(max_bytes=16 * 8)
+    cache.put("a", np.arange(8))
+    cache.put("b", np.arange(8))
+    cache.get("a")
+    cache.put("c", np.arange(8))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.get_stats()["evictions"] == 1
+
+
+def test_execute_query_mantem_linhas_fonte_duplicadas(finder):
+    """Testa se linhas fonte realmente duplicadas não são perdidas no resultado"""
+    finder.source_data = pd.DataFrame(
+        {"ID": ["1", "1", "2"], "Nome": ["Ana", "Ana", "Bia"]}
+    )
+    finder.query_data = pd.DataFrame({"Codigo": [1, 2, 1]})
+    finder.add_criteria("Codigo", "ID", operation="equals")
+    assert finder.execute_query(columns_to_include=["Nome", "Inexistente"])
+
+    # O resultado é materializado apenas no primeiro acesso
+    assert finder.result_count == 3
+    assert finder.get_summary()["results"]["columns"] == ["Nome"]
+    assert finder.results["Nome"].tolist() == ["Ana", "Ana", "Bia"]
+
+
+def test_execute_query_com_proveniencia(finder):
+    """Testa o mapeamento linha de consulta -> linhas fonte"""
+    finder.query_data = pd.DataFrame({"Codigo": [123, 999, 456]})
+    finder.add_criteria("Codigo", "ID", operation="equals")
+    assert finder.execute_query(track_provenance=True)
+
+    provenance = finder.provenance
+    assert provenance["query_rows"].tolist() == [0, 0, 2]
+    assert provenance["source_rows"].tolist() == [0, 3, 1]
+    assert provenance["match_counts"].tolist() == [2, 0, 1]
+    assert provenance["unmatched_query_rows"] == [1]
+
+
+@pytest.mark.parametrize(
+    "strategy, expected",
+    [
+        ("first", ["Ana Souza", None, "Carla Dias"]),
+        ("last", ["Ana Maria", None, "Carla Dias"]),
+        ("concat", ["Ana Souza; Ana Maria", None, "Carla Dias"]),
+    ],
+)
+def test_execute_enrichment_estrategias(finder, strategy, expected):
+    """Testa o left join de colunas fonte sobre a planilha de consulta"""
+    finder.query_data = pd.DataFrame({"Codigo": [123, 555, "0789"]})
+    finder.add_criteria("Codigo", "ID", operation="equals")
+    assert finder.execute_enrichment(["Nome"], strategy=strategy, separator="; ")
+
+    nomes = [None if pd.isna(v) or v == "" else v for v in finder.results["Nome"]]
+    assert nomes == expected
+    assert finder.results["Codigo"].tolist() == [123, 555, "0789"]
+
+
+def test_execute_enrichment_all_repete_linhas_de_consulta(finder):
+    """Testa a estratégia 'all', com uma linha por correspondência"""
+    finder.add_criteria("Codigo", "ID", operation="equals")
+    assert finder.execute_enrichment(["Nome"], strategy="all")
+    assert finder.results["Codigo"].tolist() == [123, 123, 789.0]
+    assert finder.results["Nome"].tolist() == ["Ana Souza", "Ana Maria", "Carla Dias"]
+
+
+def test_symspell_index_encontra_erros_de_digitacao():
+    """Testa a busca aproximada com acentos e erros de digitação"""
+    valores = normalize_texts(pd.Series(["João Silva", "Sílvia Souza", "Marcos"]))
+    index = SymSpellIndex(valores, max_distance=2)
+    assert normalize_text("  JOAO   silva") == "joao silva"
+    assert index.lookup("joao silv") == [(0, 1)]
+    assert index.lookup("silvai souza") == [(1, 1)]
+    assert index.lookup("xyz", 1) == []
+    assert edit_distance("maria", "mraia", 2) == 1
+
+
+def test_execute_query_similar_com_coluna_de_similaridade(finder):
+    """Testa a operação 'similar' e a coluna de similaridade no resultado"""
+    finder.query_data = pd.DataFrame({"Cliente": ["ana sousa", "Carla Diaz"]})
+    finder.add_criteria("Cliente", "Nome", operation="similar", max_distance=1)
+    assert finder.execute_query()
+    assert finder.results["Nome"].tolist() == ["Ana Souza", "Carla Dias"]
+    assert finder.results["Similaridade"].round(2).tolist() == [0.89, 0.9]
+
+
+def test_token_index_independe_da_ordem_dos_nomes():
+    """Testa as buscas por tokens com nomes em ordens e formatos diferentes"""
+    index = TokenIndex(pd.Series(["Maria da Silva", "MARIA SILVA", "Silva, João"]))
+    assert index.all_tokens("Silva, Maria").tolist() == [0, 1]
+    assert index.all_tokens("Maria Souza").tolist() == []
+    assert index.overlap("Joao Maria Silva", 2).tolist() == [0, 1, 2]
+    assert index.token_counts.tolist() == [2, 2, 2]
+
+
+def test_execute_query_all_tokens(finder):
+    """Testa a operação 'all_tokens' no DataFinder"""
+    finder.query_data = pd.DataFrame({"Cliente": ["souza, ana"]})
+    finder.add_criteria("Cliente", "Nome", operation="all_tokens")
+    assert finder.execute_query()
+    assert finder.results["Nome"].tolist() == ["Ana Souza"]
+
+
+def test_get_summary_traz_plano_e_estatisticas_por_etapa(finder, tmp_path):
+    """Testa a estratégia, os candidatos e as etapas registradas no resumo"""
+    finder.query_data = pd.DataFrame({"Codigo": [123, 789.0, 123], "Nome": ["ana"] * 3})
+    finder.add_criteria("Codigo", "ID", operation="equals")
+    finder.add_criteria("Nome", "Nome", operation="contains")
+    assert finder.execute_query()
+    assert finder.export_results(str(tmp_path / "saida.csv"), "csv")
+
+    stats = finder.get_summary()["stats"]
+    equals, contains = stats["criteria"]
+    assert equals["strategy"] == "hash join"
+    assert equals["index_entries"] == 3
+    assert equals["actual_candidates"] == 5
+    assert equals["cache_hits"] == 1
+    assert contains["strategy"] == "scan"
+    assert contains["estimated_candidates"] == 12
+    # 'equals' lê só os candidatos do índice (cache na terceira linha);
+    # 'contains' varre a coluna uma vez e soma as interseções de cada linha
+    assert equals["rows_scanned"] == 2 + 1
+    assert contains["rows_scanned"] == 4 + (2 + 2) + (1 + 2) + (2 + 2)
+
+    assert list(stats["stages"]) == ["normalization", "query", "export"]
+    assert stats["stages"]["query"]["cache_hits"] == 3
+    assert stats["stages"]["query"]["cache_misses"] == 3
+    assert stats["stages"]["query"]["results"] == 2
+    assert stats["stages"]["export"]["bytes_written"] > 0
+    assert stats["stages"]["query"]["memory"] is None
+
+
+def test_estatisticas_medem_memoria_e_formatam_plano(tmp_path):
+    """Testa a medição de memória com trace_memory e o texto do --explain"""
+    from src.core.explain import format_explain
+
+    fonte = tmp_path / "fonte.csv"
+    consulta = tmp_path / "consulta.csv"
+    pd.DataFrame({"Nome": ["Maria Silva", "Ana Souza"]}).to_csv(fonte, index=False)
+    pd.DataFrame({"Nome": ["Silva Maria"]}).to_csv(consulta, index=False)
+
+    finder = DataFinder({"trace_memory": True})
+    assert finder.load_source_data(str(fonte))
+    assert finder.load_query_data(str(consulta))
+    finder.add_criteria("Nome", "Nome", operation="all_tokens")
+    assert finder.execute_query()
+
+    stats = finder.get_summary()["stats"]
+    assert stats["stages"]["load_source"]["bytes_read"] == fonte.stat().st_size
+    assert stats["stages"]["load_source"]["memory"] > 0
+    assert stats["criteria"][0]["strategy"] == "index lookup"
+    assert stats["criteria"][0]["actual_candidates"] == 1
+    texto = format_explain(stats)
+    assert "Nome all_tokens Nome: index lookup" in texto
+    assert "leitura da fonte" in texto
+
+
+def test_execute_query_nao_intersecta_com_a_fonte_inteira(finder, monkeypatch):
+    """Testa se só os critérios seguintes ao primeiro são intersectados"""
+    tamanhos = []
+    intersect1d = np.intersect1d
+
+    def espiao(primeiro, segundo, **kwargs):
+        tamanhos.append(len(primeiro) + len(segundo))
+        return intersect1d(primeiro, segundo, **kwargs)
+
+    monkeypatch.setattr(np, "intersect1d", espiao)
+    finder.add_criteria("Codigo", "ID", operation="equals")
+    assert finder.execute_query()
+    assert tamanhos == []
+
+    finder.query_data["Nome"] = ["ana", "carla"]
+    finder.add_criteria("Nome", "Nome", operation="contains")
+    assert finder.execute_query()
+    assert sorted(finder.results["Nome"]) == ["Ana Maria", "Ana Souza", "Carla Dias"]
+    assert tamanhos == [2 + 2, 1 + 1]
+
+
+def test_execute_query_equals_independe_do_tamanho_da_fonte():
+    """Testa se consultas 'equals' em cache não custam uma varredura por linha"""
+    import time
+
+    finder = DataFinder()
+    finder.source_data = pd.DataFrame({"ID": np.arange(300_000).astype(str)})
+    finder.query_data = pd.DataFrame({"Codigo": np.arange(0, 300_000, 150)})
+    finder.add_criteria("Codigo", "ID", operation="equals")
+    assert finder.execute_query()
+
+    inicio = time.perf_counter()
+    assert finder.execute_query()
+    assert time.perf_counter() - inicio < 2.0
+    assert finder.result_count == 2000
+
+
+def test_estatisticas_medem_memoria_sem_reset_peak(monkeypatch):
+    """Testa a medição de memória no Python 3.8, que não tem reset_peak"""
+    import tracemalloc
+
+    from src.core.explain import ExecutionStats
+
+    monkeypatch.delattr(tracemalloc, "reset_peak", raising=False)
+    stats = ExecutionStats(trace_memory=True)
+    tracemalloc.start()
+    try:
+        for nome in ("load_source", "query"):
+            with stats.stage(nome):
+                dados = np.ones(1_000_000)
+            del dados
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+    assert all(s["memory"] >= 8_000_000 for s in stats.stages.values())
+
+
+def test_load_source_data_so_le_em_fluxo_fora_do_orcamento():
+    """Testa que a leitura em fluxo só substitui a leitura em memória sem orçamento"""
+    caminho = "dados/exemplos/vendas.xlsx"
+
+    finder = DataFinder({"memory_budget": 10**12})
+    assert finder.load_source_data(caminho)
+    assert finder.get_summary()["stats"]["stages"]["load_source"]["engine"] == "memoria"
+    pd.testing.assert_frame_equal(finder.source_data, pd.read_excel(caminho))
+
+    finder = DataFinder({"memory_budget": 1})
+    assert finder.load_source_data(caminho)
+    assert finder.get_summary()["stats"]["stages"]["load_source"]["engine"] == (
+        "streaming"
+    )
+    assert len(finder.source_data) == 5000
+
+
+def test_execute_query_falha_ao_criar_indices(finder, monkeypatch):
+    """Testa que erros na criação dos índices fazem a consulta retornar False"""
+
+    def falhar(*args, **kwargs):
+        raise MemoryError("sem memória")
+
+    monkeypatch.setattr(finder, "_source_key_index", falhar)
+    finder.add_criteria(query_column="Codigo", source_column="ID", operation="equals")
+    assert finder.execute_query() is False
+
+
+def test_execute_query_sem_nenhuma_coluna_pedida_existente(finder):
+    """Testa que colunas pedidas e ausentes da fonte não trazem todas as colunas"""
+    finder.add_criteria(query_column="Codigo", source_column="ID", operation="equals")
+
+    assert finder.execute_query(columns_to_include=["Inexistente"])
+    assert finder.get_summary()["results"]["columns"] == []
+    assert finder.results.columns.tolist() == []
+    assert len(finder.results) == 3
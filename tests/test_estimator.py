@@ -0,0 +1,74 @@
+"""
+Testes para a estimativa de tempo e memória
+"""
+
+import pandas as pd
+
+from src.core.estimator import estimate_query_run, format_estimate
+from src.core.processador import ProcessadorPlanilhas
+
+
+# Testes
+def test_estimar_consulta_lendo_apenas_amostras(tmp_path, monkeypatch):
+    """Testa que a estimativa lê só a amostra e projeta para o total de linhas"""
+    fonte = str(tmp_path / "fonte.xlsx")
+    consulta = str(tmp_path / "consulta.xlsx")
+    pd.DataFrame({"Cliente": [f"Cliente {i}" for i in range(50)]}).to_excel(
+        fonte, index=False
+    )
+    pd.DataFrame({"Nome": ["Cliente 1", "Cliente 2"]}).to_excel(consulta, index=False)
+
+    leituras = []
+    read_excel = pd.read_excel
+
+    def read_excel_registrando(*args, **kwargs):
+        leituras.append(kwargs.get("nrows"))
+        return read_excel(*args, **kwargs)
+
+    monkeypatch.setattr(pd, "read_excel", read_excel_registrando)
+    estimativa = estimate_query_run(
+        fonte,
+        consulta,
+        [{"query_column": "Nome", "source_column": "Cliente", "operation": "equals"}],
+        n_rows=10,
+    )
+
+    assert leituras == [10, 10]
+    assert [etapa["etapa"] for etapa in estimativa["etapas"]] == [
+        "leitura da fonte",
+        "leitura da consulta",
+        "consulta",
+        "exportação",
+    ]
+    assert estimativa["etapas"][0]["detalhe"].startswith("50 linhas")
+    assert estimativa["total_segundos"] > 0
+    assert "Plano: motor=memoria" in format_estimate(estimativa)
+
+
+def test_estimar_processamento(tmp_path):
+    """Testa a estimativa do processador sem gravar a saída"""
+    entrada, saida = tmp_path / "entrada", tmp_path / "saida"
+    entrada.mkdir()
+    pd.DataFrame({"Nome": ["Maria Silva"], "Telefone": ["11999990000"]}).to_excel(
+        str(entrada / "telefones.xlsx"), index=False
+    )
+    pd.DataFrame(
+        {"Data": ["01/01"] * 30, "Serviço": ["Corte"] * 30, "Cliente": ["Ana"] * 30}
+    ).to_excel(str(entrada / "clientes.xlsx"), index=False)
+
+    processador = ProcessadorPlanilhas(
+        diretorio_entrada=str(entrada), diretorio_saida=str(saida)
+    )
+    estimativa = processador.estimar(["clientes.xlsx"], "telefones.xlsx", amostra=5)
+
+    etapas = {etapa["etapa"]: etapa for etapa in estimativa["etapas"]}
+    assert list(etapas) == [
+        "extração de telefones",
+        "leitura dos clientes",
+        "cruzamento",
+        "gravação da saída",
+    ]
+    assert "30 linhas" in etapas["leitura dos clientes"]["detalhe"]
+    assert estimativa["pico_memoria"] == estimativa["plano"]["pico_estimado"]
+    assert processador.dict_telefones == {}
+    assert not (saida / processador.nome_arquivo_saida).exists()
@@ -0,0 +1,112 @@
+"""
+Testes para os arquivos de lote de consultas
+"""
+
+import json
+import pytest
+import pandas as pd
+
+from src.core.engine import DataFinder
+from src.core.jobs import load_job_file, run_job
+
+
+@pytest.fixture
+def planilhas(tmp_path):
+    """Cria uma fonte e duas planilhas de consulta"""
+    pd.DataFrame(
+        {
+            "Cliente": ["Ana Souza", "Bruno Lima", "Carla Dias", "Ana Souza"],
+            "Cidade": ["Recife", "Natal", "Recife", "Olinda"],
+        }
+    ).to_excel(str(tmp_path / "fonte.xlsx"), index=False)
+    pd.DataFrame({"Nome": ["ana souza"]}).to_excel(
+        str(tmp_path / "c1.xlsx"), index=False
+    )
+    pd.DataFrame({"Local": ["Recife"]}).to_excel(str(tmp_path / "c2.xlsx"), index=False)
+    return tmp_path
+
+
+# Testes
+def test_lote_compartilha_fonte_e_indices(planilhas, monkeypatch):
+    """Testa que a fonte é carregada uma vez e as consultas geram as suas saídas"""
+    lote = {
+        "source": "fonte.xlsx",
+        "queries": [
+            {
+                "name": "nomes",
+                "query": "c1.xlsx",
+                "criteria": [
+                    {
+                        "query_column": "Nome",
+                        "source_column": "Cliente",
+                        "operation": "equals",
+                    }
+                ],
+                "columns": "Cliente, Cidade",
+                "output": "saida/nomes.csv",
+            },
+            {
+                "name": "cidades",
+                "query": "c2.xlsx",
+                "criteria": [{"query_column": "Local", "source_column": "Cidade"}],
+                "output": "saida/cidades.xlsx",
+            },
+            {
+                "name": "quebrada",
+                "query": "c2.xlsx",
+                "criteria": [
+                    {"query_column": "Inexistente", "source_column": "Cidade"}
+                ],
+                "output": "saida/quebrada.xlsx",
+            },
+        ],
+    }
+    caminho = planilhas / "lote.json"
+    caminho.write_text(json.dumps(lote), encoding="utf-8")
+
+    cargas = []
+    carregar = DataFinder.load_source_data
+
+    def carregar_registrando(self, *args, **kwargs):
+        cargas.append(args[0])
+        return carregar(self, *args, **kwargs)
+
+    monkeypatch.setattr(DataFinder, "load_source_data", carregar_registrando)
+    resumo = run_job(load_job_file(str(caminho)), max_workers=3)
+
+    assert cargas == [str(planilhas / "fonte.xlsx")]
+    status = {q["name"]: (q["status"], q["results"]) for q in resumo["queries"]}
+    assert status == {
+        "nomes": ("ok", 2),
+        "cidades": ("ok", 2),
+        "quebrada": ("erro", 0),
+    }
+    assert resumo["failed"] == 1
+    nomes = pd.read_csv(str(planilhas / "saida" / "nomes.csv"))
+    assert nomes.columns.tolist() == ["Cliente", "Cidade"]
+    assert nomes["Cidade"].tolist() == ["Recife", "Olinda"]
+    assert (planilhas / "saida" / "cidades.xlsx").exists()
+
+
+def test_lote_yaml_e_validacao(planilhas):
+    """Testa a leitura de YAML e os erros de um lote inválido"""
+    pytest.importorskip("yaml")
+    (planilhas / "lote.yaml").write_text(
+        "source: fonte.xlsx\n"
+        "queries:\n"
+        "  - query: c1.xlsx\n"
+        "    criteria:\n"
+        "      - {query_column: Nome, source_column: Cliente, operation: similar}\n"
+        "    output: saida/similar.xlsx\n",
+        encoding="utf-8",
+    )
+    lote = load_job_file(str(planilhas / "lote.yaml"))
+    assert lote["queries"][0]["name"] == "consulta1"
+    assert lote["queries"][0]["output"] == str(planilhas / "saida" / "similar.xlsx")
+
+    (planilhas / "ruim.json").write_text(
+        json.dumps({"source": "fonte.xlsx", "queries": [{"query": "c1.xlsx"}]}),
+        encoding="utf-8",
+    )
+    with pytest.raises(ValueError, match="output"):
+        load_job_file(str(planilhas / "ruim.json"))
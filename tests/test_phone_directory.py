@@ -0,0 +1,72 @@
+"""
+Testes para o diretório compacto de telefones
+"""
+
+import numpy as np
+import pytest
+
+from src.utils.phone_directory import PhoneDirectory
+
+
+# Fixtures
+@pytest.fixture
+def diretorio():
+    """Fixture que cria um diretório a partir de um dicionário de telefones"""
+    return PhoneDirectory.from_dict(
+        {
+            "maria silva": "(11) 9 8765-4321",
+            "joão souza": "1133334444",
+            "sem telefone": "",
+        }
+    )
+
+
+# Testes
+def test_lookup_vetorizado(diretorio):
+    """Testa a busca de uma coluna inteira de nomes"""
+    telefones = diretorio.lookup_many([" Maria Silva ", "JOÃO SOUZA", "Outro", None])
+    assert telefones.tolist() == ["11987654321", "1133334444", None, None]
+    assert diretorio.lookup_codes(["maria silva"]).tolist() == [5511987654321]
+    assert "joão souza" in diretorio
+    assert len(diretorio) == 3
+
+
+def test_salvar_e_carregar_com_mmap(diretorio, tmp_path):
+    """Testa a persistência em arquivo único e a abertura via memory-map"""
+    caminho = str(tmp_path / "telefones.lteldir")
+    diretorio.save(caminho)
+
+    carregado = PhoneDirectory.load(caminho)
+    assert isinstance(carregado.hashes, np.memmap)
+    assert carregado.lookup("Maria Silva") == "11987654321"
+    assert carregado.to_dict() == {
+        "maria silva": "11987654321",
+        "joão souza": "1133334444",
+    }
+
+
+def test_carregar_arquivo_invalido(tmp_path):
+    """Testa a rejeição de arquivos que não são diretórios de telefones"""
+    caminho = tmp_path / "invalido.bin"
+    caminho.write_bytes(b"nada a ver")
+    with pytest.raises(ValueError):
+        PhoneDirectory.load(str(caminho))
+
+
+def test_telefones_fora_do_formato_mantem_o_texto(tmp_path):
+    """Testa que telefones sem forma canônica voltam como o texto original"""
+    originais = {
+        "ana": "0800 123 4567",
+        "bia": "(11) 3333-4444 / 3333-5555",
+        "cris": "(11) 9 8765-4321",
+    }
+    diretorio = PhoneDirectory.from_dict(originais)
+    assert diretorio.lookup_codes(["ana", "cris"]).tolist() == [0, 5511987654321]
+
+    caminho = str(tmp_path / "telefones.lteldir")
+    diretorio.updated(np.zeros(0, dtype=np.uint64), diretorio.take([0])).save(caminho)
+    assert PhoneDirectory.load(caminho).to_dict() == {
+        "ana": "0800 123 4567",
+        "bia": "(11) 3333-4444 / 3333-5555",
+        "cris": "11987654321",
+    }
@@ -0,0 +1,70 @@
+"""
+Testes para a normalização de telefones
+"""
+
+from src.utils.phone_normalizer import (
+    PhoneNormalizer,
+    format_e164,
+    format_national,
+    pack_phones,
+    split_phones,
+)
+
+
+# Testes
+def test_split_phones_remove_codigo_do_pais():
+    """Testa a decomposição vetorizada dos telefones"""
+    partes = split_phones(["5511987654321", "(21) 3333-4444", "abc", None])
+    assert partes["nacional"].tolist() == [11987654321, 2133334444, 0, 0]
+    assert partes["ddd"].tolist() == [11, 21, 0, 0]
+    assert partes["formato_valido"].tolist() == [True, True, False, False]
+    assert partes["preenchido"].tolist() == [True, True, True, False]
+
+
+def test_pack_phones_sem_perda_de_digitos():
+    """Testa que números com mais de 15 dígitos não perdem precisão"""
+    assert pack_phones(
+        ["(11) 3333-4444 / 3333-5555", "999999999999999999", "11987654321.0"]
+    ).tolist() == [113333444433335555, 999999999999999999, 11987654321]
+
+
+def test_forma_canonica_e_tipo():
+    """Testa que grafias diferentes do mesmo número viram o mesmo inteiro"""
+    normalizador = PhoneNormalizer()
+    resultado = normalizador.normalize(
+        [
+            "(11) 9 8765-4321",
+            "11987654321",
+            "1.1987654321E10",
+            11987654321.0,
+            "+55 11 3333-4444",
+            "123",
+            None,
+        ]
+    )
+    assert resultado["e164"].tolist() == [5511987654321] * 4 + [551133334444, 123, 0]
+    assert resultado["tipo"].tolist() == ["celular"] * 4 + [
+        "fixo",
+        "invalido",
+        "ausente",
+    ]
+    assert format_national(resultado["e164"]).tolist()[-3:] == [
+        "1133334444",
+        "123",
+        None,
+    ]
+    assert format_e164([5511987654321, 0]).tolist() == ["+5511987654321", None]
+
+
+def test_cache_por_valor_bruto():
+    """Testa que só valores novos são classificados e o limite do cache"""
+    normalizador = PhoneNormalizer(max_cache_size=4)
+    normalizador.normalize(["11987654321", "11987654321", None])
+    assert len(normalizador) == 2  # o telefone e o valor ausente
+
+    normalizador.normalize(["1133334444", "11987654321"])
+    assert len(normalizador) == 3
+
+    resultado = normalizador.normalize(["21987654321", "31987654321", "1"])
+    assert len(normalizador) == 3
+    assert resultado["e164"].tolist() == [5521987654321, 5531987654321, 1]
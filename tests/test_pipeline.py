@@ -0,0 +1,49 @@
+"""
+Testes para os estágios de pipeline
+"""
+
+import pytest
+
+from src.core.pipeline import BackgroundWriter, PrefetchReader
+
+
+# Testes
+def test_leitor_antecipado_mantem_ordem_e_propaga_erros():
+    """Testa a ordem dos itens e o erro no item em que ocorreu"""
+
+    def carregar(item):
+        if item == 3:
+            raise ValueError("item inválido")
+        return item * 10
+
+    with PrefetchReader(carregar, range(5), depth=1) as leitor:
+        vistos = []
+        with pytest.raises(ValueError):
+            for item, resultado in leitor:
+                vistos.append((item, resultado))
+    assert vistos == [(0, 0), (1, 10), (2, 20)]
+
+
+def test_leitor_cancelado_antes_do_fim():
+    """Testa que o leitor pode ser encerrado sem consumir todos os itens"""
+    leitor = PrefetchReader(lambda item: item, range(100), depth=2)
+    assert next(iter(leitor)) == (0, 0)
+    leitor.close()
+
+
+def test_gravador_em_segundo_plano():
+    """Testa a gravação em ordem e a propagação de erros de gravação"""
+    gravados = []
+    gravador = BackgroundWriter(gravados.append, depth=1)
+    for item in range(5):
+        gravador.put(item)
+    gravador.close()
+    assert gravados == [0, 1, 2, 3, 4]
+
+    def falhar(item):
+        raise OSError("disco cheio")
+
+    gravador = BackgroundWriter(falhar, depth=1)
+    gravador.put(1)
+    with pytest.raises(OSError):
+        gravador.close()
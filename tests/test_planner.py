@@ -0,0 +1,79 @@
+"""
+Testes para o planejador de memória
+"""
+
+import pandas as pd
+
+from src.core.engine import DataFinder
+from src.utils.planner import measure_sheet, plan_batch, plan_load
+
+
+def _medida(linhas, colunas=5, arquivo="grande.xlsx"):
+    return {
+        "arquivo": arquivo,
+        "linhas": linhas,
+        "colunas": colunas,
+        "celulas": linhas * colunas,
+        "bytes_compactados": linhas * colunas * 8,
+        "bytes_xml": linhas * colunas * 40,
+        "bytes_textos": linhas * 20,
+    }
+
+
+# Testes
+def test_medir_planilha(tmp_path):
+    """Testa a medida pelos metadados (dimensão e tamanhos no ZIP)"""
+    caminho = str(tmp_path / "fonte.xlsx")
+    pd.DataFrame({"Nome": ["Ana", "Bia", "Caio"], "Idade": [1, 2, 3]}).to_excel(
+        caminho, index=False
+    )
+    medida = measure_sheet(caminho)
+    assert (medida["linhas"], medida["colunas"], medida["celulas"]) == (4, 2, 8)
+    assert 0 < medida["bytes_compactados"] <= medida["bytes_xml"]
+
+
+def test_plano_de_leitura_pelo_orcamento():
+    """Testa a escolha entre leitura em memória, em fluxo e em paralelo"""
+    medida = _medida(1_000_000)
+    assert plan_load(medida, budget=64 * 1024**3)["motor"] == "memoria"
+
+    paralelo = plan_load(medida, budget=2 * 1024**3, cpu_count=4)
+    assert (paralelo["motor"], paralelo["processos"], paralelo["cabe"]) == (
+        "streaming",
+        4,
+        True,
+    )
+    assert paralelo["linhas_por_faixa"] >= 20000
+
+    apertado = plan_load(medida, budget=1024**2, cpu_count=4)
+    assert (apertado["motor"], apertado["processos"], apertado["cabe"]) == (
+        "streaming",
+        1,
+        False,
+    )
+
+    # CSV não tem leitura em fluxo
+    assert (
+        plan_load(_medida(1_000_000, arquivo="a.csv"), budget=1)["motor"] == "memoria"
+    )
+
+
+def test_plano_do_lote_liga_pipeline():
+    """Testa que o pipeline é ligado (com filas menores) quando a saída não cabe"""
+    medidas = [_medida(200_000, arquivo=f"c{i}.xlsx") for i in range(6)]
+    assert not plan_batch(medidas, budget=64 * 1024**3)["pipeline"]
+    plano = plan_batch(medidas, budget=1024**2, depth=3)
+    assert (plano["pipeline"], plano["profundidade_fila"]) == (True, 1)
+
+
+def test_fonte_lida_em_fluxo_quando_nao_cabe(tmp_path):
+    """Testa que a fonte acima do orçamento é lida em fluxo com o mesmo conteúdo"""
+    caminho = str(tmp_path / "fonte.xlsx")
+    pd.DataFrame({"Nome": ["Ana", "Bia"], "Idade": [30, 40]}).to_excel(
+        caminho, index=False
+    )
+    finder = DataFinder(config={"memory_budget": 1})
+    assert finder.load_source_data(caminho)
+    assert finder.memory_plan["motor"] == "streaming"
+    assert finder.source_data["Nome"].astype(str).tolist() == ["Ana", "Bia"]
+    assert finder.source_data["Idade"].tolist() == [30, 40]
@@ -0,0 +1,71 @@
+"""
+Testes para a prévia de planilhas
+"""
+
+import zipfile
+
+import pytest
+
+from src.core.engine import DataFinder
+from src.utils.file_handlers import XMLExtractor
+from src.utils.file_handlers.preview import peek_file, peek_sheet, sheet_parts
+from src.utils.file_handlers.workbook_probe import probe_workbook
+
+
+# Fixtures
+@pytest.fixture
+def arquivo_renomeado(arquivo_grande, tmp_path):
+    """Fixture com os arquivos das planilhas fora da ordem do sheetId"""
+    caminho = str(tmp_path / "renomeado.xlsx")
+    trocas = {
+        "xl/worksheets/sheet1.xml": "xl/worksheets/resumo.xml",
+        "xl/worksheets/sheet2.xml": "xl/worksheets/sheet1.xml",
+    }
+    with zipfile.ZipFile(arquivo_grande) as origem, zipfile.ZipFile(
+        caminho, "w"
+    ) as destino:
+        for item in origem.infolist():
+            conteudo = origem.read(item.filename)
+            if item.filename == "xl/_rels/workbook.xml.rels":
+                conteudo = conteudo.replace(
+                    b"worksheets/sheet1.xml", b"worksheets/resumo.xml"
+                ).replace(b"worksheets/sheet2.xml", b"worksheets/sheet1.xml")
+            destino.writestr(trocas.get(item.filename, item.filename), conteudo)
+    return caminho
+
+
+# Testes
+def test_janela_de_linhas(arquivo_grande):
+    """Testa o cabeçalho, a janela de linhas e a contagem aproximada"""
+    parte = sheet_parts(arquivo_grande)["Clientes"]
+
+    previa = peek_sheet(arquivo_grande, parte, start=10, stop=13)
+    assert previa["columns"] == ["Codigo", "Nome", "Telefone"]
+    assert previa["rows"].index.tolist() == [10, 11, 12]
+    assert previa["rows"]["Nome"].tolist() == ["Cliente 10", "Cliente 11", "Cliente 12"]
+    assert previa["row_count"] == 100
+    assert not previa["row_count_exact"]
+
+    assert (
+        peek_sheet(arquivo_grande, parte, stop=1, count_rows=True)["row_count"] == 100
+    )
+    assert peek_file(arquivo_grande, n_rows=2)["columns"] == ["Total"]
+
+
+def test_sondagem_da_pasta(arquivo_renomeado):
+    """Testa os metadados e a localização das planilhas pelas relações"""
+    planilhas = probe_workbook(arquivo_renomeado)
+    assert [p["name"] for p in planilhas] == ["Resumo", "Clientes"]
+
+    clientes = planilhas[1]
+    assert clientes["part"] == "xl/worksheets/sheet1.xml"
+    assert clientes["headers"] == ["Codigo", "Nome", "Telefone"]
+    assert (clientes["rows"], clientes["columns"]) == (100, 3)
+
+    df = XMLExtractor().extract_data_from_xlsx(arquivo_renomeado, "Clientes")
+    assert df.columns.tolist() == ["Codigo", "Nome", "Telefone"]
+    assert len(df) == 100
+
+    finder = DataFinder()
+    assert not finder.load_query_data(arquivo_renomeado, sheet_name="Vendas")
+    assert finder.load_query_data(arquivo_renomeado, sheet_name="Clientes")
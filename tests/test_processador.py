@@ -62,3 +62,398 @@ def test_processar_planilhas_sem_arquivos(processador):
     """Testa processamento sem arquivos de entrada"""
     resultado = processador.processar_planilhas([], "nao_existe.xlsx")
     assert resultado is False
+
+
+def test_processar_planilhas_adiciona_telefones(setup_test_dirs, monkeypatch):
+    """Testa o cruzamento dos clientes (coluna C) com a tabela de telefones"""
+    entrada, saida = setup_test_dirs
+    pd.DataFrame(
+        {
+            "Data": ["01/01", "02/01", "03/01"],
+            "Serviço": ["Corte", "Escova", "Corte"],
+            "Cliente": [" Maria  Silva ", "JOÃO SOUZA", "Sem Cadastro"],
+        }
+    ).to_excel(str(entrada / "clientes.xlsx"), index=False)
+
+    processador = ProcessadorPlanilhas(
+        diretorio_entrada=str(entrada), diretorio_saida=str(saida)
+    )
+    monkeypatch.setattr(
+        processador.xml_extractor,
+        "extract_phones_from_xlsx",
+        lambda caminho: {"maria silva": "11999990000", "joão souza": "1133334444"},
+    )
+
+    assert processador.processar_planilhas(["clientes.xlsx"], "telefones.xlsx")
+    resultado = pd.read_excel(
+        str(saida / processador.nome_arquivo_saida), dtype={"Telefone": str}
+    )
+    assert resultado["Telefone"].tolist()[:2] == ["11999990000", "1133334444"]
+    assert pd.isna(resultado["Telefone"].iloc[2])
+
+
+def test_processar_planilhas_mantem_telefones_invalidos(setup_test_dirs, monkeypatch):
+    """Testa se 0800 e dois números na mesma célula são gravados como vieram"""
+    entrada, saida = setup_test_dirs
+    pd.DataFrame(
+        {
+            "Data": ["01/01", "02/01", "03/01"],
+            "Serviço": ["Corte", "Escova", "Corte"],
+            "Cliente": ["Ana", "Bia", "Carla"],
+        }
+    ).to_excel(str(entrada / "clientes.xlsx"), index=False)
+
+    processador = ProcessadorPlanilhas(
+        diretorio_entrada=str(entrada), diretorio_saida=str(saida)
+    )
+    monkeypatch.setattr(
+        processador.xml_extractor,
+        "extract_phones_from_xlsx",
+        lambda caminho: {
+            "ana": "0800 123 4567",
+            "bia": "(11) 3333-4444 / 3333-5555",
+            "carla": "+55 (11) 98765-4321",
+        },
+    )
+
+    assert processador.processar_planilhas(["clientes.xlsx"], "telefones.xlsx")
+    resultado = pd.read_excel(
+        str(saida / processador.nome_arquivo_saida), dtype={"Telefone": str}
+    )
+    assert resultado["Telefone"].tolist() == [
+        "0800 123 4567",
+        "(11) 3333-4444 / 3333-5555",
+        "11987654321",
+    ]
+
+
+def test_processar_planilhas_estrategia_tokens(setup_test_dirs, monkeypatch):
+    """Testa a correspondência por tokens para nomes em outra ordem"""
+    entrada, saida = setup_test_dirs
+    pd.DataFrame(
+        {
+            "Data": ["01/01", "02/01"],
+            "Serviço": ["Corte", "Escova"],
+            "Cliente": ["Silva, Maria", "Pedro"],
+        }
+    ).to_excel(str(entrada / "clientes.xlsx"), index=False)
+
+    processador = ProcessadorPlanilhas(
+        diretorio_entrada=str(entrada),
+        diretorio_saida=str(saida),
+        estrategia_correspondencia="tokens",
+    )
+    monkeypatch.setattr(
+        processador.xml_extractor,
+        "extract_phones_from_xlsx",
+        lambda caminho: {
+            "maria da silva": "11999990000",
+            "maria da silva santos": "11888880000",
+        },
+    )
+
+    assert processador.processar_planilhas(["clientes.xlsx"], "telefones.xlsx")
+    resultado = pd.read_excel(
+        str(saida / processador.nome_arquivo_saida), dtype={"Telefone": str}
+    )
+    assert resultado["Telefone"].iloc[0] == "11999990000"
+    assert pd.isna(resultado["Telefone"].iloc[1])
+
+
+def test_processar_planilhas_estrategia_fonetica(setup_test_dirs, monkeypatch):
+    """Testa a correspondência fonética e a coluna de qualidade"""
+    entrada, saida = setup_test_dirs
+    pd.DataFrame(
+        {
+            "Data": ["01/01", "02/01", "03/01"],
+            "Serviço": ["Corte", "Escova", "Corte"],
+            "Cliente": ["Sylvia Sousa", "Guilerme Conseição", "Pedro Alves"],
+        }
+    ).to_excel(str(entrada / "clientes.xlsx"), index=False)
+
+    processador = ProcessadorPlanilhas(
+        diretorio_entrada=str(entrada),
+        diretorio_saida=str(saida),
+        estrategia_correspondencia="fonetica",
+        limiar_similaridade=0.8,
+    )
+    monkeypatch.setattr(
+        processador.xml_extractor,
+        "extract_phones_from_xlsx",
+        lambda caminho: {
+            "sílvia souza": "11999990000",
+            "guilherme conceição": "11888880000",
+            "pedro alvares cabral": "11777770000",
+        },
+    )
+
+    assert processador.processar_planilhas(["clientes.xlsx"], "telefones.xlsx")
+    resultado = pd.read_excel(
+        str(saida / processador.nome_arquivo_saida), dtype={"Telefone": str}
+    )
+    assert resultado["Telefone"].tolist()[:2] == ["11999990000", "11888880000"]
+    assert pd.isna(resultado["Telefone"].iloc[2])
+    assert resultado["Qualidade_Correspondencia"].iloc[0] >= 0.8
+
+
+def test_estrategia_correspondencia_invalida():
+    """Testa a rejeição de estratégias desconhecidas"""
+    with pytest.raises(ValueError):
+        ProcessadorPlanilhas(estrategia_correspondencia="exata+magica")
+
+
+def test_processar_planilhas_em_pipeline(setup_test_dirs, monkeypatch):
+    """Testa que o modo pipeline grava o mesmo resultado do sequencial"""
+    entrada, saida = setup_test_dirs
+    for i in range(3):
+        pd.DataFrame(
+            {
+                "Data": ["01/01", "02/01"],
+                "Serviço": ["Corte", "Escova"],
+                "Cliente": [f"Cliente {i}", "Maria Silva"],
+            }
+        ).to_excel(str(entrada / f"clientes{i}.xlsx"), index=False)
+    arquivos = ["clientes0.xlsx", "nao_existe.xlsx", "clientes1.xlsx", "clientes2.xlsx"]
+
+    resultados = []
+    for pipeline in (False, True):
+        processador = ProcessadorPlanilhas(
+            diretorio_entrada=str(entrada),
+            diretorio_saida=str(saida),
+            nome_arquivo_saida=f"saida_{pipeline}.xlsx",
+            pipeline=pipeline,
+            profundidade_fila=1,
+        )
+        monkeypatch.setattr(
+            processador.xml_extractor,
+            "extract_phones_from_xlsx",
+            lambda caminho: {"maria silva": "11999990000", "cliente 1": "1133334444"},
+        )
+        assert processador.processar_planilhas(arquivos, "telefones.xlsx")
+        resultados.append(
+            pd.read_excel(
+                str(saida / processador.nome_arquivo_saida),
+                sheet_name=None,
+                dtype={"Telefone": str},
+            )
+        )
+
+    sequencial, pipeline = resultados
+    assert list(pipeline) == list(sequencial) == ["Planilha1", "Planilha3", "Planilha4"]
+    for nome in sequencial:
+        pd.testing.assert_frame_equal(pipeline[nome], sequencial[nome])
+    assert pipeline["Planilha3"]["Telefone"].tolist() == ["1133334444", "11999990000"]
+
+
+def test_processar_incremental(setup_test_dirs, monkeypatch):
+    """Testa que o modo incremental processa só as planilhas novas ou alteradas"""
+    entrada, saida = setup_test_dirs
+    pd.DataFrame({"Nome": ["Maria Silva"], "Telefone": ["11999990000"]}).to_excel(
+        str(entrada / "telefones.xlsx"), index=False
+    )
+
+    def gravar_clientes(nome, clientes):
+        pd.DataFrame(
+            {"Data": ["01/01"] * len(clientes), "Serviço": ["Corte"] * len(clientes)}
+            | {"Cliente": clientes}
+        ).to_excel(str(entrada / nome), index=False)
+
+    gravar_clientes("a.xlsx", ["Maria Silva"])
+    gravar_clientes("b.xlsx", ["Cliente B"])
+
+    processador = ProcessadorPlanilhas(
+        diretorio_entrada=str(entrada), diretorio_saida=str(saida)
+    )
+
+    class Diretorio:
+        def to_dict(self):
+            return {"maria silva": "11999990000", "cliente c": "1133334444"}
+
+    monkeypatch.setattr(
+        processador.xml_extractor,
+        "refresh_phone_directory",
+        lambda caminho, snapshot: Diretorio(),
+    )
+    processados = []
+    extrair = processador.extrair_clientes
+
+    def extrair_registrando(arquivo, *args, **kwargs):
+        processados.append(arquivo)
+        return extrair(arquivo, *args, **kwargs)
+
+    monkeypatch.setattr(processador, "extrair_clientes", extrair_registrando)
+    caminho_saida = str(saida / processador.nome_arquivo_saida)
+
+    assert processador.processar_incremental("telefones.xlsx")
+    assert processados == ["a.xlsx", "b.xlsx"]
+    assert pd.ExcelFile(caminho_saida).sheet_names == ["Planilha1", "Planilha2"]
+
+    # Sem alterações nada é lido
+    processados.clear()
+    assert processador.processar_incremental("telefones.xlsx")
+    assert processados == []
+
+    # Só a planilha alterada é substituída; a removida é excluída
+    gravar_clientes("b.xlsx", ["Cliente B", "Cliente C"])
+    os.remove(str(entrada / "a.xlsx"))
+    assert processador.processar_incremental("telefones.xlsx")
+    assert processados == ["b.xlsx"]
+    planilhas = pd.read_excel(caminho_saida, sheet_name=None, dtype={"Telefone": str})
+    assert list(planilhas) == ["Planilha2"]
+    assert planilhas["Planilha2"]["Telefone"].tolist()[1] == "1133334444"
+
+
+def test_processar_incremental_igual_ao_completo(setup_test_dirs):
+    """Testa que o modo incremental grava os mesmos telefones do lote completo"""
+    entrada, saida = setup_test_dirs
+    pd.DataFrame(
+        {
+            "Nome": ["Ana", "Bia", "Carla", "Dora"],
+            "Telefone": [
+                "0800 123 4567",
+                "(11) 3333-4444 / 3333-5555",
+                "+55 (11) 98765-4321",
+                "11 3333-4444 ramal 12",
+            ],
+        }
+    ).to_excel(str(entrada / "telefones.xlsx"), index=False)
+    pd.DataFrame(
+        {
+            "Data": ["01/01"] * 5,
+            "Serviço": ["Corte"] * 5,
+            "Cliente": ["Ana", "Bia", "Carla", "Dora", "Sem Cadastro"],
+        }
+    ).to_excel(str(entrada / "clientes.xlsx"), index=False)
+
+    completo = ProcessadorPlanilhas(
+        diretorio_entrada=str(entrada),
+        diretorio_saida=str(saida / "completo"),
+        nome_arquivo_saida="saida.xlsx",
+    )
+    assert completo.processar_planilhas(["clientes.xlsx"], "telefones.xlsx")
+    incremental = ProcessadorPlanilhas(
+        diretorio_entrada=str(entrada),
+        diretorio_saida=str(saida / "incremental"),
+        nome_arquivo_saida="saida.xlsx",
+    )
+    assert incremental.processar_incremental("telefones.xlsx")
+
+    esperado = pd.read_excel(str(saida / "completo" / "saida.xlsx"), sheet_name=None)
+    obtido = pd.read_excel(str(saida / "incremental" / "saida.xlsx"), sheet_name=None)
+    assert list(obtido) == list(esperado)
+    for planilha, df in esperado.items():
+        pd.testing.assert_frame_equal(obtido[planilha], df)
+    assert esperado["Planilha1"]["Telefone"].tolist()[:2] == [
+        "0800 123 4567",
+        "(11) 3333-4444 / 3333-5555",
+    ]
+
+
+def test_retomar_lote_interrompido(setup_test_dirs, monkeypatch):
+    """Testa que a retomada reaproveita telefones e planilhas já concluídos"""
+    entrada, saida = setup_test_dirs
+    pd.DataFrame({"Nome": ["Maria Silva"], "Telefone": ["11999990000"]}).to_excel(
+        str(entrada / "telefones.xlsx"), index=False
+    )
+    for i in range(3):
+        pd.DataFrame(
+            {"Data": ["01/01"], "Serviço": ["Corte"], "Cliente": ["Maria Silva"]}
+        ).to_excel(str(entrada / f"clientes{i}.xlsx"), index=False)
+    arquivos = [f"clientes{i}.xlsx" for i in range(3)]
+    checkpoint = saida / ".checkpoint"
+
+    def criar_processador():
+        processador = ProcessadorPlanilhas(
+            diretorio_entrada=str(entrada),
+            diretorio_saida=str(saida),
+            diretorio_checkpoint=str(checkpoint),
+        )
+        processados = []
+        extrair = processador.extrair_clientes
+
+        def extrair_registrando(arquivo):
+            processados.append(arquivo)
+            return extrair(arquivo)
+
+        monkeypatch.setattr(processador, "extrair_clientes", extrair_registrando)
+        return processador, processados
+
+    # A gravação da saída falha depois de todas as planilhas concluídas
+    processador, processados = criar_processador()
+    monkeypatch.setattr(
+        processador.xml_extractor,
+        "extract_phones_from_xlsx",
+        lambda caminho: {"maria silva": "11999990000"},
+    )
+    with monkeypatch.context() as m:
+        m.setattr(pd, "ExcelWriter", lambda *args, **kwargs: 1 / 0)
+        assert not processador.processar_planilhas(arquivos, "telefones.xlsx")
+    assert processados == arquivos
+    assert (checkpoint / "estado.json").exists()
+
+    # Na retomada, os telefones não são extraídos e só o arquivo alterado é lido
+    pd.DataFrame(
+        {"Data": ["02/01"], "Serviço": ["Escova"], "Cliente": ["Maria Silva"]}
+    ).to_excel(str(entrada / "clientes1.xlsx"), index=False)
+    processador, processados = criar_processador()
+    monkeypatch.setattr(
+        processador.xml_extractor,
+        "extract_phones_from_xlsx",
+        lambda caminho: pytest.fail("telefones extraídos de novo"),
+    )
+    assert processador.processar_planilhas(arquivos, "telefones.xlsx", retomar=True)
+    assert processados == ["clientes1.xlsx"]
+    assert not checkpoint.exists()
+
+    planilhas = pd.read_excel(
+        str(saida / processador.nome_arquivo_saida),
+        sheet_name=None,
+        dtype={"Telefone": str},
+    )
+    assert list(planilhas) == ["Planilha1", "Planilha2", "Planilha3"]
+    assert planilhas["Planilha2"]["Serviço"].tolist() == ["Escova"]
+    assert all(df["Telefone"].tolist() == ["11999990000"] for df in planilhas.values())
+
+
+def test_checkpoint_guarda_telefones_sem_alteracao(tmp_path):
+    """Testa que a retomada devolve os telefones exatamente como extraídos"""
+    from src.utils.checkpoint import BatchCheckpoint
+
+    planilha = tmp_path / "telefones.xlsx"
+    planilha.write_bytes(b"conteudo")
+    telefones = {"Ana": "não possui", "Bia": "(11) 3333-4444 / 3333-5555"}
+
+    checkpoint = BatchCheckpoint(str(tmp_path / ".checkpoint"))
+    checkpoint.start({"lote": 1})
+    checkpoint.save_phones(str(planilha), telefones)
+
+    retomado = BatchCheckpoint(str(tmp_path / ".checkpoint"))
+    assert retomado.start({"lote": 1}, resume=True)
+    assert retomado.load_phones(str(planilha)) == telefones
+
+
+def test_orcamento_de_memoria_apertado(setup_test_dirs, monkeypatch):
+    """Testa que um orçamento pequeno liga o pipeline e a leitura em fluxo"""
+    entrada, saida = setup_test_dirs
+    pd.DataFrame(
+        {"Data": ["01/01"], "Serviço": ["Corte"], "Cliente": ["Maria Silva"]}
+    ).to_excel(str(entrada / "clientes.xlsx"), index=False)
+    processador = ProcessadorPlanilhas(
+        diretorio_entrada=str(entrada), diretorio_saida=str(saida), orcamento_memoria=1
+    )
+    monkeypatch.setattr(
+        processador.xml_extractor,
+        "extract_phones_from_xlsx",
+        lambda caminho: {"maria silva": "11999990000"},
+    )
+    monkeypatch.setattr(
+        pd, "read_excel", lambda *args, **kwargs: pytest.fail("leitura em memória")
+    )
+    assert processador.processar_planilhas(["clientes.xlsx"], "telefones.xlsx")
+    assert processador.plano_memoria["pipeline"]
+    assert processador.motores_leitura == {"clientes.xlsx": "streaming"}
+    monkeypatch.undo()
+    resultado = pd.read_excel(
+        str(saida / processador.nome_arquivo_saida), dtype={"Telefone": str}
+    )
+    assert resultado["Telefone"].tolist() == ["11999990000"]
@@ -0,0 +1,55 @@
+"""
+Testes para as regras de qualidade de telefones e clientes
+"""
+
+import pandas as pd
+import pytest
+
+from src.utils.quality_rules import find_name_column, run_quality_rules
+
+
+# Fixtures
+@pytest.fixture
+def clientes():
+    """Fixture com telefones e nomes com problemas conhecidos"""
+    return pd.DataFrame(
+        {
+            "Código": [10, 11, 12, 13, 14, 15, 16, 17],
+            "Nome": ["Ana", "Bia", "ana ", "Jo", "Teste", "Carla 2", "Zé", None],
+            "Telefone": [
+                "11987654321",
+                "+55 (11) 98765-4321",
+                "1133334444",
+                "123",
+                "20987654321",
+                "11887654321",
+                None,
+                "21987654321",
+            ],
+        },
+        index=range(2, 10),
+    )
+
+
+# Testes
+def test_regras_de_qualidade(clientes):
+    """Testa contagens e linhas de cada regra"""
+    resultados = run_quality_rules(clientes)
+    linhas = {regra: r["linhas"].tolist() for regra, r in resultados.items()}
+
+    assert linhas["telefone_malformado"] == [5, 7]
+    assert linhas["ddd_invalido"] == [6]
+    assert linhas["telefone_duplicado"] == [2, 3]
+    assert linhas["telefone_compartilhado"] == [2, 3]
+    assert linhas["cliente_com_telefones_diferentes"] == [2, 4]
+    assert linhas["nome_suspeito"] == [5, 6, 7, 8, 9]
+    assert resultados["nome_suspeito"]["ocorrencias"] == 5
+
+
+def test_find_name_column():
+    """Testa a identificação da coluna de clientes"""
+    assert (
+        find_name_column(["Código", "Nome do Cliente", "Telefone"]) == "Nome do Cliente"
+    )
+    assert find_name_column(["A", "B", "C"]) == "C"
+    assert find_name_column(["A"]) is None
@@ -0,0 +1,64 @@
+"""
+Testes para a verificação de planilhas e as regras de qualidade
+"""
+
+import csv
+import json
+
+from src.utils.verificador import verificar_lote, verificar_planilha
+
+
+# Testes
+def test_verificar_planilha_com_previa(arquivo_grande):
+    """Testa a verificação sem carregar as planilhas inteiras"""
+    resultados = verificar_planilha(arquivo_grande, mostrar_linhas=2)
+    assert resultados["erro"] is None
+    assert resultados["planilhas"] == ["Resumo", "Clientes"]
+
+    clientes = resultados["dados"]["Clientes"]
+    assert clientes["linhas"] == 100
+    assert len(clientes["primeiras_linhas"]) == 2
+    assert clientes["telefones_preenchidos"] == 75
+    assert clientes["estatisticas"]["Telefone"]["nulos"] == 25
+    assert clientes["estatisticas"]["Nome"]["duplicados"] == 0
+    assert clientes["qualidade"]["telefone_malformado"]["ocorrencias"] == 0
+    assert clientes["qualidade"]["telefone_duplicado"]["ocorrencias"] == 0
+
+
+def test_verificar_lote(arquivo_grande, tmp_path):
+    """Testa a verificação em paralelo e o relatório consolidado"""
+    (tmp_path / "repetidos.csv").write_text("Nome,Telefone\nAna,1\nAna,\nBia,1\n")
+    saida = tmp_path / "saida"
+
+    caminhos = verificar_lote(str(tmp_path), str(saida), max_workers=2)
+
+    with open(caminhos["json"], encoding="utf-8") as f:
+        lote = json.load(f)
+    assert [r["arquivo"] for r in lote] == [
+        arquivo_grande,
+        str(tmp_path / "repetidos.csv"),
+    ]
+    repetidos = lote[1]["dados"]["repetidos"]
+    assert repetidos["estatisticas"]["Nome"] == {
+        "preenchidos": 3,
+        "nulos": 0,
+        "duplicados": 1,
+    }
+    assert repetidos["telefones_preenchidos"] == 2
+    assert (saida / "clientes_relatorio.txt").exists()
+    assert len(open(caminhos["csv"], encoding="utf-8").readlines()) == 4
+
+
+def test_verificar_lote_com_arquivo_ilegivel(tmp_path):
+    """Testa que o erro de um arquivo ilegível fica na coluna 'erro' do CSV"""
+    (tmp_path / "quebrado.xlsx").write_bytes(b"isto nao e um xlsx")
+    saida = tmp_path / "saida"
+
+    caminhos = verificar_lote(str(tmp_path), str(saida), max_workers=1)
+
+    with open(caminhos["csv"], encoding="utf-8", newline="") as f:
+        linhas = list(csv.DictReader(f))
+    assert len(linhas) == 1
+    assert linhas[0]["arquivo"] == str(tmp_path / "quebrado.xlsx")
+    assert linhas[0]["problemas_qualidade"] == ""
+    assert linhas[0]["erro"]
@@ -0,0 +1,277 @@
+"""
+Testes para o extrator XML
+"""
+
+import os
+import zipfile
+import pytest
+import pandas as pd
+
+from src.utils.file_handlers import XMLExtractor
+from src.utils.file_handlers.phone_extraction import PhoneRowParser
+from src.utils.file_handlers.sheet_stream import iter_row_fragments
+from src.utils.extrator_xml import extrair_telefones
+
+
+def _celula(valor):
+    """Célula inlineStr como as exportadas pelo sistema de telefones"""
+    return f'<c t="inlineStr"><is><t>{valor}</t></is></c>'
+
+
+def _escrever_planilha(caminho, contatos, linhas_extras="", textos=None):
+    """Cria um XLSX mínimo com uma linha (nome, 3 colunas, fixo, celular) por contato"""
+    linhas = "".join(
+        "<row>"
+        + "".join(_celula(v) for v in (nome, "x", "y", fixo, celular))
+        + "</row>"
+        for nome, fixo, celular in contatos
+    )
+    with zipfile.ZipFile(caminho, "w") as zip_ref:
+        zip_ref.writestr(
+            "xl/worksheets/sheet1.xml",
+            f"<worksheet><sheetData>{linhas_extras}{linhas}</sheetData></worksheet>",
+        )
+        if textos is not None:
+            itens = "".join(f"<si><t>{t}</t></si>" for t in textos)
+            zip_ref.writestr("xl/sharedStrings.xml", f"<sst>{itens}</sst>")
+
+
+# Fixtures
+@pytest.fixture
+def extrator(tmp_path, monkeypatch):
+    """Fixture que cria o extrator contando as linhas analisadas"""
+    monkeypatch.chdir(tmp_path)
+    extrator = XMLExtractor()
+    extrator.linhas_analisadas = 0
+    original = PhoneRowParser.parse_row
+
+    def _contar(self, fragment):
+        extrator.linhas_analisadas += 1
+        return original(self, fragment)
+
+    monkeypatch.setattr(PhoneRowParser, "parse_row", _contar)
+    return extrator
+
+
+# Testes
+def test_fragmentos_de_linha_em_blocos(tmp_path):
+    """Testa a leitura de linhas que atravessam o limite dos blocos"""
+    caminho = str(tmp_path / "telefones.xlsx")
+    _escrever_planilha(
+        caminho, [(f"Cliente {i}", "", f"1190000{i:04d}") for i in range(50)]
+    )
+
+    fragmentos = list(iter_row_fragments(caminho, chunk_size=7))
+    assert len(fragmentos) == 50
+    assert all(f.startswith(b"<row>") and f.endswith(b"</row>") for f in fragmentos)
+
+
+def test_atualizacao_incremental(extrator, tmp_path):
+    """Testa que apenas as linhas alteradas são analisadas na atualização"""
+    caminho = str(tmp_path / "telefones.xlsx")
+    snapshot = str(tmp_path / "cache" / "telefones.lteldir")
+    contatos = [(f"Cliente {i}", "113333000{}".format(i % 10), "") for i in range(20)]
+    _escrever_planilha(caminho, contatos)
+
+    diretorio = extrator.refresh_phone_directory(caminho, snapshot)
+    assert len(diretorio) == 20
+    assert extrator.linhas_analisadas == 20
+
+    # Arquivo inalterado: o snapshot é usado sem ler a planilha
+    extrator.linhas_analisadas = 0
+    diretorio = extrator.refresh_phone_directory(caminho, snapshot)
+    assert len(diretorio) == 20
+    assert extrator.linhas_analisadas == 0
+
+    # Um contato novo, um telefone alterado e um contato removido
+    contatos = contatos[1:] + [("Cliente Novo", "", "11988887777")]
+    contatos[0] = ("Cliente 1", "", "11999990000")
+    _escrever_planilha(caminho, contatos)
+    os.utime(caminho, ns=(0, os.stat(caminho).st_mtime_ns + 10**9))
+
+    extrator.linhas_analisadas = 0
+    diretorio = extrator.refresh_phone_directory(caminho, snapshot)
+    assert extrator.linhas_analisadas == 2
+    assert len(diretorio) == 20
+    assert diretorio.lookup("cliente novo") == "11988887777"
+    assert diretorio.lookup("cliente 1") == "11999990000"
+    assert diretorio.lookup("cliente 0") is None
+    assert diretorio.lookup("cliente 5") == "1133330005"
+
+
+def test_atualizacao_incremental_com_nomes_repetidos(extrator, tmp_path):
+    """Testa que nomes repetidos ficam com a última linha, como na extração completa"""
+    caminho = str(tmp_path / "telefones.xlsx")
+    snapshot = str(tmp_path / "cache" / "telefones.lteldir")
+
+    def atualizar(contatos):
+        _escrever_planilha(caminho, contatos)
+        os.utime(caminho, ns=(0, os.stat(caminho).st_mtime_ns + 10**9))
+        diretorio = extrator.refresh_phone_directory(caminho, snapshot)
+        assert diretorio.to_dict() == XMLExtractor().extract_phones_from_xlsx(caminho)
+        return diretorio
+
+    contatos = [
+        ("Ana", "", "11911110000"),
+        ("Bia", "", "0800 123 4567"),
+        ("Ana", "", "11922220000"),
+    ]
+    assert atualizar(contatos).lookup("ana") == "11922220000"
+
+    # Alterar a primeira linha não muda o telefone: a última continua valendo
+    contatos[0] = ("Ana", "", "11933330000")
+    assert atualizar(contatos).lookup("ana") == "11922220000"
+
+    # Sem a última linha, vale a linha anterior, que não foi alterada
+    assert atualizar(contatos[:2]).lookup("ana") == "11933330000"
+
+
+def test_extracao_pelo_cabecalho(tmp_path):
+    """Testa colunas identificadas pelo cabeçalho, textos compartilhados e falhas"""
+    caminho = str(tmp_path / "telefones.xlsx")
+    cabecalho = (
+        '<row r="1"><c r="B1" t="s"><v>0</v></c><c r="C1" t="s"><v>1</v></c>'
+        '<c r="F1" t="inlineStr"><is><t>Nome do Cliente</t></is></c></row>'
+    )
+    linhas = (
+        '<row r="2"><c r="B2"><v>1133334444</v></c><c r="C2"><v>11987654321</v></c>'
+        '<c r="F2" t="s"><v>2</v></c></row>'
+        '<row r="3"><c r="B3"><v>1122223333</v></c>'
+        '<c r="F3" t="inlineStr"><is><t>José</t></is></c></row>'
+        '<row r="4"><c r="F4" t="s"><v>99</v></c></row>'
+    )
+    _escrever_planilha(
+        caminho,
+        [],
+        linhas_extras=cabecalho + linhas,
+        textos=["Telefone Fixo", "Celular", "Maria Silva"],
+    )
+
+    extrator = XMLExtractor()
+    telefones = extrator.extract_phones_from_xlsx(caminho)
+    assert telefones == {"maria silva": "11987654321", "josé": "1122223333"}
+    assert [linha for linha, _ in extrator.phone_row_failures] == [4]
+    assert extrair_telefones(caminho) == telefones
+
+
+def test_extracao_tipada_de_dados(tmp_path):
+    """Testa colunas tipadas e textos compartilhados como categóricas"""
+    from src.core.keys import canonicalize_keys
+
+    caminho = str(tmp_path / "clientes.xlsx")
+    cabecalho = "".join(
+        f'<c r="{col}1" t="inlineStr"><is><t>{nome}</t></is></c>'
+        for col, nome in zip("ABCDE", ["Codigo", "Nome", "Valor", "Cadastro", "Ativo"])
+    )
+    linhas = (
+        '<row r="2"><c r="A2"><v>1</v></c><c r="B2" t="s"><v>0</v></c>'
+        '<c r="C2"><v>10.5</v></c><c r="D2" s="1"><v>45322</v></c>'
+        '<c r="E2" t="b"><v>1</v></c></row>'
+        '<row r="3"><c r="A3"><v>2</v></c><c r="B3" t="s"><v>1</v></c>'
+        '<c r="C3"><v>3</v></c><c r="D3" s="1"><v>45261</v></c>'
+        '<c r="E3" t="b"><v>0</v></c></row>'
+        '<row r="4"><c r="A4"><v>3</v></c><c r="B4" t="s"><v>0</v></c>'
+        '<c r="E4" t="b"><v>1</v></c></row>'
+    )
+    estilos = (
+        '<styleSheet><cellXfs count="2"><xf numFmtId="0"/><xf numFmtId="14"/>'
+        "</cellXfs></styleSheet>"
+    )
+    with zipfile.ZipFile(caminho, "w") as zip_ref:
+        zip_ref.writestr(
+            "xl/worksheets/sheet1.xml",
+            f'<worksheet><sheetData><row r="1">{cabecalho}</row>{linhas}'
+            "</sheetData></worksheet>",
+        )
+        zip_ref.writestr(
+            "xl/sharedStrings.xml",
+            "<sst><si><t>Maria</t></si><si><t>João</t></si></sst>",
+        )
+        zip_ref.writestr("xl/styles.xml", estilos)
+
+    df = XMLExtractor().extract_data_from_xlsx(caminho)
+    assert df.columns.tolist() == ["Codigo", "Nome", "Valor", "Cadastro", "Ativo"]
+    assert df["Codigo"].dtype == "int64"
+    assert isinstance(df["Nome"].dtype, pd.CategoricalDtype)
+    assert df["Nome"].tolist() == ["Maria", "João", "Maria"]
+    assert df["Valor"].iloc[0] == 10.5 and pd.isna(df["Valor"].iloc[2])
+    assert df["Cadastro"].iloc[0] == pd.Timestamp("2024-01-31")
+    assert pd.isna(df["Cadastro"].iloc[2])
+    assert df["Ativo"].tolist() == [True, False, True]
+    assert canonicalize_keys(df["Nome"]).tolist() == ["maria", "joão", "maria"]
+
+
+def test_leitura_paralela_igual_a_sequencial(tmp_path):
+    """Testa que a leitura em faixas paralelas reproduz a leitura sequencial"""
+    from src.utils.file_handlers.column_builders import read_sheet_frame
+    from src.utils.file_handlers.parallel_reader import read_sheet_parallel
+    from src.utils.file_handlers.sheet_stream import index_row_offsets
+
+    caminho = str(tmp_path / "grande.xlsx")
+    linhas = ['<row r="1" x14ac:dyDescent="0.25">' + _celula("Nome") + "</row>"]
+    for i in range(2, 202):
+        codigo = f'<c r="B{i}"><v>{i}</v></c>' if i % 50 else ""
+        # Inteiros (com vazios) no início e decimais no fim da coluna C
+        valor = f'<c r="C{i}"><v>{i if i < 100 else i + 0.5}</v></c>' if i % 40 else ""
+        linhas.append(
+            f'<row r="{i}" x14ac:dyDescent="0.25"><c r="A{i}" t="s"><v>{i % 3}</v></c>'
+            f"{codigo}{valor}</row>"
+        )
+    with zipfile.ZipFile(caminho, "w") as zip_ref:
+        zip_ref.writestr(
+            "xl/worksheets/sheet1.xml",
+            '<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"'
+            ' xmlns:x14ac="http://schemas.microsoft.com/office/spreadsheetml/2009/9/ac">'
+            f'<dimension ref="A1:C201"/><sheetData>{"".join(linhas)}</sheetData>'
+            "</worksheet>",
+        )
+        zip_ref.writestr(
+            "xl/sharedStrings.xml",
+            "<sst><si><t>a</t></si><si><t>b</t></si><si><t>c</t></si></sst>",
+        )
+
+    assert len(index_row_offsets(caminho, chunk_size=64)) == 202
+
+    esperado = read_sheet_frame(caminho)
+    paralelo = read_sheet_parallel(caminho, max_workers=2, min_rows_per_chunk=20)
+    pd.testing.assert_frame_equal(paralelo, esperado)
+    assert isinstance(paralelo["Nome"].dtype, pd.CategoricalDtype)
+    assert paralelo["B"].dtype == "Int64"
+    assert paralelo["C"].dtype == "float64"
+
+
+def test_atualizacao_incremental_com_textos_compartilhados(extrator, tmp_path):
+    """Testa que regravar a tabela de textos compartilhados não reconstrói tudo"""
+    caminho = str(tmp_path / "telefones.xlsx")
+    snapshot = str(tmp_path / "cache" / "telefones.lteldir")
+
+    def escrever(nomes):
+        # O Excel regrava a tabela ao incluir um contato; aqui o novo nome entra
+        # no início, deslocando o índice de todos os outros
+        textos = sorted(nomes)
+        linhas = "".join(
+            f'<row><c t="s"><v>{textos.index(nome)}</v></c>'
+            + "".join(_celula(v) for v in ("x", "y", "", f"119{i:08d}"))
+            + "</row>"
+            for i, nome in enumerate(nomes)
+        )
+        with zipfile.ZipFile(caminho, "w") as zip_ref:
+            zip_ref.writestr(
+                "xl/worksheets/sheet1.xml",
+                f"<worksheet><sheetData>{linhas}</sheetData></worksheet>",
+            )
+            itens = "".join(f"<si><t>{t}</t></si>" for t in textos)
+            zip_ref.writestr("xl/sharedStrings.xml", f"<sst>{itens}</sst>")
+
+    nomes = [f"Cliente {i:03d}" for i in range(500)]
+    escrever(nomes)
+    assert len(extrator.refresh_phone_directory(caminho, snapshot)) == 500
+
+    escrever(nomes + ["Ana Nova"])
+    os.utime(caminho, ns=(0, os.stat(caminho).st_mtime_ns + 10**9))
+    extrator.linhas_analisadas = 0
+    diretorio = extrator.refresh_phone_directory(caminho, snapshot)
+    assert extrator.linhas_analisadas == 1
+    assert len(diretorio) == 501
+    assert diretorio.lookup("ana nova") == "11900000500"
+    assert diretorio.lookup("cliente 042") == "11900000042"